@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Any, Callable
+
+import llama_index.core.instrumentation as instrument
+from llama_index.core.instrumentation.span_handlers import SimpleSpanHandler
+
+dispatcher = instrument.get_dispatcher("bench_dispatcher_span")
+
+
+def plain_func(a: int, b: int = 1) -> int:
+    return a + b
+
+
+@dispatcher.span
+def spanned_func(a: int, b: int = 1) -> int:
+    return a + b
+
+
+@dispatcher.span
+async def async_spanned_func(a: int, b: int = 1) -> int:
+    return a + b
+
+
+async def async_plain_func(a: int, b: int = 1) -> int:
+    return a + b
+
+
+def time_per_call(func: Callable[[], Any], num_calls: int) -> float:
+    """Return the average time of a call in microseconds."""
+    time1 = time.perf_counter()
+    for _ in range(num_calls):
+        func()
+    time2 = time.perf_counter()
+    return (time2 - time1) / num_calls * 1e6
+
+
+async def async_time_per_call(func: Callable[[], Any], num_calls: int) -> float:
+    """Return the average time of an awaited call in microseconds."""
+    time1 = time.perf_counter()
+    for _ in range(num_calls):
+        await func()
+    time2 = time.perf_counter()
+    return (time2 - time1) / num_calls * 1e6
+
+
+def bench_dispatcher_span(num_calls: int = 100000) -> None:
+    """Benchmark per-span overhead of @dispatcher.span."""
+    print("Benchmarking Dispatcher.span\n---------------------------")
+    plain = time_per_call(lambda: plain_func(1), num_calls)
+    async_plain = asyncio.run(
+        async_time_per_call(lambda: async_plain_func(1), num_calls)
+    )
+
+    for label in ["null handlers only", "SimpleSpanHandler attached"]:
+        if label == "SimpleSpanHandler attached":
+            span_handler = SimpleSpanHandler()
+            dispatcher.add_span_handler(span_handler)
+
+        spanned = time_per_call(lambda: spanned_func(1), num_calls)
+        async_spanned = asyncio.run(
+            async_time_per_call(lambda: async_spanned_func(1), num_calls)
+        )
+        print(
+            f"[{label}] sync span overhead: {spanned - plain:.2f} us/call, "
+            f"async span overhead: {async_spanned - async_plain:.2f} us/call"
+        )
+
+    dispatcher.span_handlers.remove(span_handler)
+
+
+if __name__ == "__main__":
+    bench_dispatcher_span()
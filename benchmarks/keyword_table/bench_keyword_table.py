@@ -0,0 +1,87 @@
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from llama_index.core.data_structs.data_structs import KeywordTable
+from llama_index.core.schema import TextNode
+
+
+def build_table(
+    num_keywords: int, num_nodes: int, postings_per_keyword: int
+) -> KeywordTable:
+    random.seed(42)
+    node_ids = [f"node_{i}" for i in range(num_nodes)]
+    table: Dict[str, Set[str]] = {
+        f"keyword_{i}": set(random.sample(node_ids, postings_per_keyword))
+        for i in range(num_keywords)
+    }
+    return KeywordTable(table=table)
+
+
+def naive_top_nodes(
+    index_struct: KeywordTable, keywords: List[str], top_n: int
+) -> List[str]:
+    """Keyword matching as previously done by BaseKeywordTableRetriever."""
+    chunk_indices_count: Dict[str, int] = defaultdict(int)
+    keywords = [k for k in keywords if k in set(index_struct.table.keys())]
+    for k in keywords:
+        for node_id in index_struct.table[k]:
+            chunk_indices_count[node_id] += 1
+    sorted_chunk_indices = sorted(
+        chunk_indices_count.keys(),
+        key=lambda x: chunk_indices_count[x],
+        reverse=True,
+    )
+    return sorted_chunk_indices[:top_n]
+
+
+def bench_keyword_table(
+    num_keywords: int = 1000000,
+    num_nodes: int = 100000,
+    postings_per_keyword: int = 5,
+    num_queries: int = 20,
+    keywords_per_query: int = 10,
+) -> None:
+    """Benchmark keyword retrieval over a large keyword table."""
+    print("Benchmarking KeywordTable retrieval\n-----------------------------------")
+    index_struct = build_table(num_keywords, num_nodes, postings_per_keyword)
+    queries = [
+        [f"keyword_{random.randrange(num_keywords)}" for _ in range(keywords_per_query)]
+        + ["unknown_keyword"]
+        for _ in range(num_queries)
+    ]
+
+    time1 = time.perf_counter()
+    for query in queries:
+        naive_top_nodes(index_struct, query, 10)
+    time2 = time.perf_counter()
+    print(f"naive: {(time2 - time1) / num_queries * 1000:.2f} ms/query")
+
+    time1 = time.perf_counter()
+    index_struct.get_postings()
+    time2 = time.perf_counter()
+    print(f"building postings: {time2 - time1:.2f} s (once per many table changes)")
+
+    time1 = time.perf_counter()
+    for query in queries:
+        query = [k for k in query if k in index_struct.table]
+        index_struct.top_nodes(query, 10)
+    time2 = time.perf_counter()
+    print(f"postings: {(time2 - time1) / num_queries * 1000:.2f} ms/query")
+
+    # each query follows a change of the table
+    time1 = time.perf_counter()
+    for i, query in enumerate(queries):
+        index_struct.add_node(query[:2], TextNode(id_=f"new_node_{i}"))
+        query = [k for k in query if k in index_struct.table]
+        index_struct.top_nodes(query, 10)
+    time2 = time.perf_counter()
+    print(
+        "postings with changes: "
+        f"{(time2 - time1) / num_queries * 1000:.2f} ms/(change + query)"
+    )
+
+
+if __name__ == "__main__":
+    bench_keyword_table()
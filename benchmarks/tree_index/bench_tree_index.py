@@ -0,0 +1,60 @@
+import time
+from typing import Dict
+
+from llama_index.core import Settings
+from llama_index.core.data_structs.data_structs import IndexGraph
+from llama_index.core.embeddings.mock_embed_model import MockEmbedding
+from llama_index.core.indices.tree.base import TreeIndex
+from llama_index.core.indices.tree.select_leaf_embedding_retriever import (
+    TreeSelectLeafEmbeddingRetriever,
+)
+from llama_index.core.llms.mock import MockLLM
+from llama_index.core.schema import TextNode
+
+
+def naive_get_index(index_graph: IndexGraph, node_id: str) -> int:
+    """Reverse lookup as previously done by IndexGraph.get_index."""
+    node_id_to_index: Dict[str, int] = {
+        node_id: index for index, node_id in index_graph.all_nodes.items()
+    }
+    return node_id_to_index[node_id]
+
+
+def bench_tree_index(
+    num_leaves: int = 100000, num_children: int = 10, num_queries: int = 20
+) -> None:
+    """Benchmark building and querying a TreeIndex."""
+    print("Benchmarking TreeIndex\n----------------------")
+    Settings.llm = MockLLM(max_tokens=8)
+    Settings.embed_model = MockEmbedding(embed_dim=8)
+    nodes = [TextNode(text=f"leaf node number {i}") for i in range(num_leaves)]
+
+    time1 = time.perf_counter()
+    index = TreeIndex(nodes, num_children=num_children)
+    time2 = time.perf_counter()
+    index_graph = index.index_struct
+    print(f"build ({index_graph.size} nodes): {time2 - time1:.2f} s")
+
+    sample_ids = list(index_graph.all_nodes.values())[:: max(1, num_leaves // 100)]
+    time1 = time.perf_counter()
+    for node_id in sample_ids:
+        naive_get_index(index_graph, node_id)
+    time2 = time.perf_counter()
+    naive = (time2 - time1) / len(sample_ids) * 1e6
+    time1 = time.perf_counter()
+    for node_id in sample_ids:
+        index_graph.node_id_to_index[node_id]
+    time2 = time.perf_counter()
+    cached = (time2 - time1) / len(sample_ids) * 1e6
+    print(f"get_index: naive {naive:.2f} us/call, cached {cached:.2f} us/call")
+
+    retriever = TreeSelectLeafEmbeddingRetriever(index, child_branch_factor=2)
+    time1 = time.perf_counter()
+    for i in range(num_queries):
+        retriever.retrieve(f"query {i}")
+    time2 = time.perf_counter()
+    print(f"query: {(time2 - time1) / num_queries * 1000:.2f} ms/query")
+
+
+if __name__ == "__main__":
+    bench_tree_index()
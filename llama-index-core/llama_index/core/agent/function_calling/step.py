@@ -3,8 +3,8 @@
 import json
 import logging
 import uuid
-from typing import Any, List, Optional, cast
-import asyncio
+from functools import partial
+from typing import Any, List, Optional, Sequence, cast
 
 from llama_index.core.agent.types import (
     BaseAgentWorker,
@@ -13,6 +13,7 @@ from llama_index.core.agent.types import (
     TaskStepOutput,
 )
 from llama_index.core.agent.utils import add_user_step_to_memory
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS
 from llama_index.core.base.llms.types import MessageRole
 from llama_index.core.callbacks import (
     CallbackManager,
@@ -30,10 +31,11 @@ from llama_index.core.objects.base import ObjectRetriever
 from llama_index.core.settings import Settings
 from llama_index.core.tools import BaseTool, ToolOutput, adapt_to_async_tool
 from llama_index.core.tools.calling import (
-    call_tool_with_selection,
     acall_tool_with_selection,
+    arun_tool_calls,
+    call_tool_with_selection,
+    run_tool_calls,
 )
-from llama_index.core.tools import BaseTool, ToolOutput, adapt_to_async_tool
 from llama_index.core.tools.types import AsyncBaseTool
 
 logger = logging.getLogger(__name__)
@@ -42,7 +44,7 @@ logger.setLevel(logging.WARNING)
 DEFAULT_MAX_FUNCTION_CALLS = 5
 
 
-def get_function_by_name(tools: List[BaseTool], name: str) -> BaseTool:
+def get_function_by_name(tools: Sequence[BaseTool], name: str) -> BaseTool:
     """Get function by name."""
     name_to_tool = {tool.metadata.name: tool for tool in tools}
     if name not in name_to_tool:
@@ -51,7 +53,18 @@ def get_function_by_name(tools: List[BaseTool], name: str) -> BaseTool:
 
 
 class FunctionCallingAgentWorker(BaseAgentWorker):
-    """Function calling agent worker."""
+    """Function calling agent worker.
+
+    When the LLM makes several tool calls in one turn, they are run
+    concurrently: sync tools on a pool of `num_workers` threads, async tools
+    at most `num_workers` at a time. Tool outputs are written to memory in
+    call order.
+
+    `tool_call_timeout` only applies to async steps (`arun_step`), where a
+    tool call taking longer is cancelled and returns an error output. Sync
+    tool calls run in threads, which can't be cancelled, so they are not
+    timed out.
+    """
 
     def __init__(
         self,
@@ -63,6 +76,8 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
         callback_manager: Optional[CallbackManager] = None,
         tool_retriever: Optional[ObjectRetriever[BaseTool]] = None,
         allow_parallel_tool_calls: bool = True,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        tool_call_timeout: Optional[float] = None,
     ) -> None:
         """Init params."""
         if not llm.metadata.is_function_calling_model:
@@ -75,6 +90,8 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
         self.prefix_messages = prefix_messages
         self.callback_manager = callback_manager or self._llm.callback_manager
         self.allow_parallel_tool_calls = allow_parallel_tool_calls
+        self._num_workers = num_workers
+        self._tool_call_timeout = tool_call_timeout
 
         if len(tools) > 0 and tool_retriever is not None:
             raise ValueError("Cannot specify both tools and tool_retriever")
@@ -163,14 +180,12 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
             + task.extra_state["new_memory"].get_all()
         )
 
-    def _call_function(
+    def _run_tool_call(
         self,
-        tools: List[BaseTool],
+        tools: Sequence[BaseTool],
         tool_call: ToolSelection,
-        memory: BaseMemory,
-        sources: List[ToolOutput],
         verbose: bool = False,
-    ) -> bool:
+    ) -> ToolOutput:
         tool = get_function_by_name(tools, tool_call.tool_name)
 
         with self.callback_manager.event(
@@ -183,27 +198,14 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
             tool_output = call_tool_with_selection(tool_call, tools, verbose=verbose)
             event.on_end(payload={EventPayload.FUNCTION_OUTPUT: str(tool_output)})
 
-        function_message = ChatMessage(
-            content=str(tool_output),
-            role=MessageRole.TOOL,
-            additional_kwargs={
-                "name": tool_call.tool_name,
-                "tool_call_id": tool_call.tool_id,
-            },
-        )
-        sources.append(tool_output)
-        memory.put(function_message)
-
-        return tool.metadata.return_direct
+        return tool_output
 
-    async def _acall_function(
+    async def _arun_tool_call(
         self,
-        tools: List[BaseTool],
+        tools: Sequence[BaseTool],
         tool_call: ToolSelection,
-        memory: BaseMemory,
-        sources: List[ToolOutput],
         verbose: bool = False,
-    ) -> bool:
+    ) -> ToolOutput:
         tool = get_function_by_name(tools, tool_call.tool_name)
 
         with self.callback_manager.event(
@@ -218,6 +220,15 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
             )
             event.on_end(payload={EventPayload.FUNCTION_OUTPUT: str(tool_output)})
 
+        return tool_output
+
+    def _put_tool_output(
+        self,
+        tool_call: ToolSelection,
+        tool_output: ToolOutput,
+        memory: BaseMemory,
+        sources: List[ToolOutput],
+    ) -> None:
         function_message = ChatMessage(
             content=str(tool_output),
             role=MessageRole.TOOL,
@@ -229,7 +240,29 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
         sources.append(tool_output)
         memory.put(function_message)
 
-        return tool.metadata.return_direct
+    def _call_function(
+        self,
+        tools: Sequence[BaseTool],
+        tool_call: ToolSelection,
+        memory: BaseMemory,
+        sources: List[ToolOutput],
+        verbose: bool = False,
+    ) -> bool:
+        tool_output = self._run_tool_call(tools, tool_call, verbose=verbose)
+        self._put_tool_output(tool_call, tool_output, memory, sources)
+        return get_function_by_name(tools, tool_call.tool_name).metadata.return_direct
+
+    async def _acall_function(
+        self,
+        tools: Sequence[BaseTool],
+        tool_call: ToolSelection,
+        memory: BaseMemory,
+        sources: List[ToolOutput],
+        verbose: bool = False,
+    ) -> bool:
+        tool_output = await self._arun_tool_call(tools, tool_call, verbose=verbose)
+        self._put_tool_output(tool_call, tool_output, memory, sources)
+        return get_function_by_name(tools, tool_call.tool_name).metadata.return_direct
 
     @trace_method("run_step")
     def run_step(self, step: TaskStep, task: Task, **kwargs: Any) -> TaskStepOutput:
@@ -272,24 +305,28 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
             is_done = True
             new_steps = []
         else:
-            is_done = False
-            for i, tool_call in enumerate(tool_calls):
-                # TODO: maybe execute this with multi-threading
-                return_direct = self._call_function(
-                    tools,
+            # check if the first tool returns directly -- it is then called alone
+            first_tool = get_function_by_name(tools, tool_calls[0].tool_name)
+            is_done = first_tool.metadata.return_direct
+            if is_done:
+                tool_calls = tool_calls[:1]
+
+            tool_outputs = run_tool_calls(
+                tool_calls,
+                partial(self._run_tool_call, tools, verbose=self._verbose),
+                num_workers=self._num_workers,
+            )
+            for tool_call, tool_output in zip(tool_calls, tool_outputs):
+                self._put_tool_output(
                     tool_call,
+                    tool_output,
                     task.extra_state["new_memory"],
                     task.extra_state["sources"],
-                    verbose=self._verbose,
                 )
+            task.extra_state["n_function_calls"] += len(tool_calls)
 
-                task.extra_state["n_function_calls"] += 1
-
-                # check if any of the tools return directly -- only works if there is one tool call
-                if i == 0 and return_direct:
-                    is_done = True
-                    response = task.extra_state["sources"][-1].content
-                    break
+            if is_done:
+                response = task.extra_state["sources"][-1].content
 
             # put tool output in sources and memory
             new_steps = (
@@ -359,20 +396,27 @@ class FunctionCallingAgentWorker(BaseAgentWorker):
             new_steps = []
         else:
             is_done = False
-            tasks = [
-                self._acall_function(
-                    tools,
+            tool_outputs = await arun_tool_calls(
+                tool_calls,
+                partial(self._arun_tool_call, tools, verbose=self._verbose),
+                num_workers=self._num_workers,
+                timeout=self._tool_call_timeout,
+            )
+            for tool_call, tool_output in zip(tool_calls, tool_outputs):
+                self._put_tool_output(
                     tool_call,
+                    tool_output,
                     task.extra_state["new_memory"],
                     task.extra_state["sources"],
-                    verbose=self._verbose,
                 )
-                for tool_call in tool_calls
-            ]
-            return_directs = await asyncio.gather(*tasks)
 
             # check if any of the tools return directly -- only works if there is one tool call
-            if len(return_directs) == 1 and return_directs[0]:
+            if (
+                len(tool_calls) == 1
+                and get_function_by_name(
+                    tools, tool_calls[0].tool_name
+                ).metadata.return_direct
+            ):
                 is_done = True
                 response = task.extra_state["sources"][-1].content
 
@@ -1,6 +1,7 @@
 """Agent executor."""
 
 import asyncio
+import time
 from collections import deque
 from typing import Any, Deque, Dict, List, Optional, Union, cast
 
@@ -28,6 +29,17 @@ from llama_index.core.base.llms.types import ChatMessage
 from llama_index.core.llms.llm import LLM
 from llama_index.core.memory import BaseMemory, ChatMemoryBuffer
 from llama_index.core.memory.types import BaseMemory
+from llama_index.core.instrumentation.events.agent import (
+    AgentStepLatencyEvent,
+    AgentStepQueueEvent,
+)
+import llama_index.core.instrumentation as instrument
+
+dispatcher = instrument.get_dispatcher(__name__)
+
+# key of `TaskStep.step_state` naming the tool a step calls, set by workers
+# running one step per tool call (see `ParallelAgentRunner`)
+TOOL_NAME_KEY = "tool_name"
 
 
 class DAGTaskState(BaseModel):
@@ -73,6 +85,25 @@ class ParallelAgentRunner(BaseAgentRunner):
 
     Executes steps in queue in parallel. Requires async support.
 
+    When chatting, the steps of a task are run as a DAG: each step starts as
+    soon as it is ready, rather than once all steps of the previous round are
+    done, and steps still running are cancelled once a step output is last.
+
+    Args:
+        max_concurrent_steps (Optional[int]): Maximum number of steps of a task
+            running at once. Unbounded if None.
+        tool_concurrency_limits (Optional[Dict[str, int]]): Maximum number of
+            running steps per tool, for steps whose `step_state` names their
+            tool under `"tool_name"` (`TOOL_NAME_KEY`).
+
+    Per-tool limits are a contract with the agent worker: a worker running
+    one step per tool call sets `step_state["tool_name"]` on the steps it
+    returns. Workers choosing and calling tools within a step (e.g.
+    `FunctionCallingAgentWorker` or `ReActAgentWorker`) don't, as the tool is
+    only known once the step runs; their steps are only limited by
+    `max_concurrent_steps`. Step latency events are labelled with the tool
+    named in `step_state` too, and left unlabelled otherwise.
+
     """
 
     def __init__(
@@ -85,6 +116,8 @@ class ParallelAgentRunner(BaseAgentRunner):
         callback_manager: Optional[CallbackManager] = None,
         init_task_state_kwargs: Optional[dict] = None,
         delete_task_on_finish: bool = False,
+        max_concurrent_steps: Optional[int] = None,
+        tool_concurrency_limits: Optional[Dict[str, int]] = None,
     ) -> None:
         """Initialize."""
         self.memory = memory or ChatMemoryBuffer.from_defaults(chat_history, llm=llm)
@@ -93,6 +126,8 @@ class ParallelAgentRunner(BaseAgentRunner):
         self.init_task_state_kwargs = init_task_state_kwargs or {}
         self.agent_worker = agent_worker
         self.delete_task_on_finish = delete_task_on_finish
+        self.max_concurrent_steps = max_concurrent_steps
+        self.tool_concurrency_limits = tool_concurrency_limits or {}
 
     @property
     def chat_history(self) -> List[ChatMessage]:
@@ -191,6 +226,110 @@ class ParallelAgentRunner(BaseAgentRunner):
 
         return await asyncio.gather(*tasks)
 
+    async def _arun_limited_step(
+        self,
+        task_id: str,
+        step: TaskStep,
+        semaphores: List[asyncio.Semaphore],
+        mode: ChatResponseMode = ChatResponseMode.WAIT,
+        **kwargs: Any,
+    ) -> TaskStepOutput:
+        """Execute step once a slot is free in each of its semaphores."""
+        start_time = time.perf_counter()
+        acquired: List[asyncio.Semaphore] = []
+        try:
+            # always acquired in the same order (runner, then tool)
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            run_time = time.perf_counter()
+            output = await self._arun_step(task_id, step=step, mode=mode, **kwargs)
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
+
+        dispatcher.get_dispatch_event()(
+            AgentStepLatencyEvent(
+                task_id=task_id,
+                step_id=step.step_id,
+                tool_name=step.step_state.get(TOOL_NAME_KEY),
+                wait_time=run_time - start_time,
+                duration=time.perf_counter() - run_time,
+            )
+        )
+        return output
+
+    async def arun_task(
+        self,
+        task_id: str,
+        mode: ChatResponseMode = ChatResponseMode.WAIT,
+        **kwargs: Any,
+    ) -> TaskStepOutput:
+        """Run the steps of a task until a step output is last, and return it.
+
+        Steps are started as soon as they are ready, within the concurrency
+        limits. Once a last step output is returned, steps still running are
+        cancelled; if several finish together, the earliest started wins.
+
+        """
+        dispatch_event = dispatcher.get_dispatch_event()
+        step_queue = self.state.get_step_queue(task_id)
+        runner_semaphore = (
+            asyncio.Semaphore(self.max_concurrent_steps)
+            if self.max_concurrent_steps
+            else None
+        )
+        tool_semaphores = {
+            tool_name: asyncio.Semaphore(limit)
+            for tool_name, limit in self.tool_concurrency_limits.items()
+        }
+
+        # insertion-ordered, i.e. by start
+        running: Dict["asyncio.Task[TaskStepOutput]", None] = {}
+        try:
+            while True:
+                dispatch_event(
+                    AgentStepQueueEvent(
+                        task_id=task_id,
+                        num_queued=len(step_queue),
+                        num_running=len(running),
+                    )
+                )
+                while step_queue:
+                    step = step_queue.popleft()
+                    semaphores = [runner_semaphore] if runner_semaphore else []
+                    tool_name = step.step_state.get(TOOL_NAME_KEY)
+                    if tool_name in tool_semaphores:
+                        semaphores.append(tool_semaphores[tool_name])
+                    running[
+                        asyncio.ensure_future(
+                            self._arun_limited_step(
+                                task_id, step, semaphores, mode=mode, **kwargs
+                            )
+                        )
+                    ] = None
+                if not running:
+                    raise ValueError(
+                        f"Task {task_id} has no steps left, and no last step output."
+                    )
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                last_output = None
+                for future in [future for future in running if future in done]:
+                    del running[future]
+                    output = future.result()
+                    if output.is_last and last_output is None:
+                        last_output = output
+                if last_output is not None:
+                    return last_output
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
     def _run_step(
         self,
         task_id: str,
@@ -342,25 +481,7 @@ class ParallelAgentRunner(BaseAgentRunner):
         if chat_history is not None:
             self.memory.set(chat_history)
         task = self.create_task(message)
-
-        result_output = None
-        while True:
-            # pass step queue in as argument, assume step executor is stateless
-            cur_step_outputs = self.run_steps_in_queue(task.task_id, mode=mode)
-
-            # check if a step output is_last
-            is_last = any(
-                cur_step_output.is_last for cur_step_output in cur_step_outputs
-            )
-            if is_last:
-                if len(cur_step_outputs) > 1:
-                    raise ValueError(
-                        "More than one step output returned in final step."
-                    )
-                cur_step_output = cur_step_outputs[0]
-                result_output = cur_step_output
-                break
-
+        result_output = asyncio.run(self.arun_task(task.task_id, mode=mode))
         return self.finalize_response(
             task.task_id,
             result_output,
@@ -377,25 +498,7 @@ class ParallelAgentRunner(BaseAgentRunner):
         if chat_history is not None:
             self.memory.set(chat_history)
         task = self.create_task(message)
-
-        result_output = None
-        while True:
-            # pass step queue in as argument, assume step executor is stateless
-            cur_step_outputs = await self.arun_steps_in_queue(task.task_id, mode=mode)
-
-            # check if a step output is_last
-            is_last = any(
-                cur_step_output.is_last for cur_step_output in cur_step_outputs
-            )
-            if is_last:
-                if len(cur_step_outputs) > 1:
-                    raise ValueError(
-                        "More than one step output returned in final step."
-                    )
-                cur_step_output = cur_step_outputs[0]
-                result_output = cur_step_output
-                break
-
+        result_output = await self.arun_task(task.task_id, mode=mode)
         return self.finalize_response(
             task.task_id,
             result_output,
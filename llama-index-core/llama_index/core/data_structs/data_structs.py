@@ -7,8 +7,9 @@ Nodes are decoupled from the indices.
 import uuid
 from abc import abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Sequence, Set
+from typing import Any, AbstractSet, Dict, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 from dataclasses_json import DataClassJsonMixin
 from llama_index.core.data_structs.struct_type import IndexStructType
 from llama_index.core.schema import BaseNode, TextNode
@@ -16,6 +17,81 @@ from llama_index.core.schema import BaseNode, TextNode
 # TODO: legacy backport of old Node class
 Node = TextNode
 
+# pending keyword changes are merged into the posting lists of a keyword table
+# once they exceed this fraction of its keywords (and the minimum below)
+POSTINGS_MERGE_RATIO = 0.05
+MIN_POSTINGS_MERGE_KEYWORDS = 1000
+
+
+class TrackedDict(dict):
+    """Dict recording the keys whose entries may have changed.
+
+    Keys are recorded, in each set returned by `add_tracker`, when set or
+    deleted, and when a mutable value (e.g. the set of node ids of a keyword)
+    is read by key, since it may then be changed in place. Values changed in
+    place while iterating over `items()` or `values()` are not recorded.
+    """
+
+    @property
+    def _trackers(self) -> List[Set[Any]]:
+        # NOTE: not set in __init__, as unpickling sets items before attributes
+        return self.__dict__.setdefault("_tracker_sets", [])
+
+    def add_tracker(self) -> Set[Any]:
+        """Get a new set recording the keys changed from now on."""
+        tracker: Set[Any] = set()
+        self._trackers.append(tracker)
+        return tracker
+
+    def remove_tracker(self, tracker: Set[Any]) -> None:
+        """Stop recording changed keys in a set returned by `add_tracker`."""
+        self.__dict__["_tracker_sets"] = [t for t in self._trackers if t is not tracker]
+
+    def _add_keys(self, keys: Any) -> None:
+        for tracker in self._trackers:
+            tracker.update(keys)
+
+    def _mark(self, key: Any, value: Any) -> Any:
+        if isinstance(value, (set, list, dict)):
+            self._add_keys((key,))
+        return value
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._mark(key, super().__getitem__(key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._mark(key, super().get(key, default))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._add_keys((key,))
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self._add_keys((key,))
+        super().__delitem__(key)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self._add_keys((key,))
+        return super().setdefault(key, default)
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        self._add_keys((key,))
+        return super().pop(key, *args)
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, value = super().popitem()
+        self._add_keys((key,))
+        return key, value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        other = dict(*args, **kwargs)
+        self._add_keys(other)
+        super().update(other)
+
+    def clear(self) -> None:
+        self._add_keys(self)
+        super().clear()
+
 
 @dataclass
 class IndexStruct(DataClassJsonMixin):
@@ -45,10 +121,19 @@ class IndexGraph(IndexStruct):
     root_nodes: Dict[int, str] = field(default_factory=dict)
     node_id_to_children_ids: Dict[str, List[str]] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # reverse map of all_nodes, kept in sync by insert/insert_under_parent
+        self._node_id_to_index: Dict[str, int] = {
+            node_id: index for index, node_id in self.all_nodes.items()
+        }
+
     @property
     def node_id_to_index(self) -> Dict[str, int]:
-        """Map from node id to index."""
-        return {node_id: index for index, node_id in self.all_nodes.items()}
+        """Map from node id to index (read-only)."""
+        if len(self._node_id_to_index) != len(self.all_nodes):
+            # all_nodes was modified directly, rebuild the reverse map
+            self.__post_init__()
+        return self._node_id_to_index
 
     @property
     def size(self) -> int:
@@ -59,6 +144,19 @@ class IndexGraph(IndexStruct):
         """Get index of node."""
         return self.node_id_to_index[node.node_id]
 
+    def _set_node_index(self, index: int, node_id: str) -> None:
+        """Set the node id at an index of all_nodes, updating the reverse map."""
+        node_id_to_index = self.node_id_to_index
+        prev_node_id = self.all_nodes.get(index)
+        self.all_nodes[index] = node_id
+        if (prev_node_id is not None and prev_node_id != node_id) or (
+            node_id_to_index.get(node_id, index) != index
+        ):
+            # an entry was overwritten, or the node id is listed twice
+            self.__post_init__()
+        else:
+            node_id_to_index[node_id] = index
+
     def insert(
         self,
         node: BaseNode,
@@ -69,7 +167,7 @@ class IndexGraph(IndexStruct):
         index = index or self.size
         node_id = node.node_id
 
-        self.all_nodes[index] = node_id
+        self._set_node_index(index, node_id)
 
         if children_nodes is None:
             children_nodes = []
@@ -103,7 +201,7 @@ class IndexGraph(IndexStruct):
                 self.node_id_to_children_ids[parent_node.node_id] = []
             self.node_id_to_children_ids[parent_node.node_id].append(node.node_id)
 
-        self.all_nodes[new_index] = node.node_id
+        self._set_node_index(new_index, node.node_id)
 
     @classmethod
     def get_type(cls) -> IndexStructType:
@@ -111,12 +209,105 @@ class IndexGraph(IndexStruct):
         return IndexStructType.TREE
 
 
+class KeywordPostings:
+    """Read-only posting lists of a keyword table, for fast keyword matching.
+
+    Node ids are numbered in sorted order, and the posting list of each
+    keyword is stored as a sorted slice of one flat integer array (CSR
+    layout), so counting keyword matches is a single `np.bincount`.
+    """
+
+    def __init__(self, table: Dict[str, Set[str]]) -> None:
+        self.node_ids: List[str] = sorted(set().union(*table.values()))
+        self.node_id_to_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        node_id_to_index = self.node_id_to_index
+
+        self.keyword_to_row: Dict[str, int] = {}
+        offsets = [0]
+        postings = []
+        for keyword, keyword_node_ids in table.items():
+            if not keyword_node_ids:
+                continue
+            self.keyword_to_row[keyword] = len(offsets) - 1
+            postings.extend(sorted(node_id_to_index[n] for n in keyword_node_ids))
+            offsets.append(len(postings))
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.postings = np.array(postings, dtype=np.int64)
+
+    def get_postings(self, keyword: str) -> np.ndarray:
+        """Get the sorted node indices of a keyword."""
+        row = self.keyword_to_row.get(keyword)
+        if row is None:
+            return self.postings[:0]
+        return self.postings[self.offsets[row] : self.offsets[row + 1]]
+
+    def top_nodes(
+        self,
+        keywords: Sequence[str],
+        top_n: int,
+        extra_node_ids: Sequence[str] = (),
+    ) -> List[Tuple[str, int]]:
+        """Get the `top_n` node ids matching the most keywords, with their counts.
+
+        `extra_node_ids` are counted as matches too, e.g. the node ids of
+        keywords changed since the posting lists were built, and may include
+        node ids unknown to them. Ties are broken by node id.
+        """
+        if top_n <= 0:
+            return []
+        matches = [self.get_postings(k) for k in keywords if k in self.keyword_to_row]
+        extra_indices = []
+        new_counts: Dict[str, int] = {}
+        for node_id in extra_node_ids:
+            index = self.node_id_to_index.get(node_id)
+            if index is None:
+                new_counts[node_id] = new_counts.get(node_id, 0) + 1
+            else:
+                extra_indices.append(index)
+        if extra_indices:
+            matches.append(np.array(extra_indices, dtype=np.int64))
+
+        top: List[Tuple[str, int]] = []
+        if matches:
+            num_nodes = len(self.node_ids)
+            counts = np.bincount(np.concatenate(matches), minlength=num_nodes)
+            candidates = np.flatnonzero(counts)
+            # unique sort key: higher counts first, then lower node indices
+            keys = counts[candidates] * num_nodes + (num_nodes - 1 - candidates)
+            if len(candidates) > top_n:
+                selected = np.argpartition(keys, len(keys) - top_n)[-top_n:]
+                candidates, keys = candidates[selected], keys[selected]
+            order = np.argsort(-keys)
+            top = [(self.node_ids[i], int(counts[i])) for i in candidates[order]]
+        if new_counts:
+            top.extend(new_counts.items())
+            top = sorted(top, key=lambda item: (-item[1], item[0]))[:top_n]
+        return top
+
+
 @dataclass
 class KeywordTable(IndexStruct):
-    """A table of keywords mapping keywords to text chunks."""
+    """A table of keywords mapping keywords to text chunks.
+
+    The table records the keywords changed through it (see `TrackedDict`), so
+    retrieval can use the cached posting lists for the other keywords, and
+    only rebuilds them once many keywords changed. Changes to the node ids of
+    keywords made in place while iterating over the table are not recorded.
+    """
 
     table: Dict[str, Set[str]] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self._postings: Optional[KeywordPostings] = None
+        self._track_table()
+
+    def _track_table(self) -> None:
+        if not isinstance(self.table, TrackedDict):
+            self.table = TrackedDict(self.table)
+        self._tracked_table = self.table
+        self._changed_keywords = self.table.add_tracker()
+        self._postings = None
+
     def add_node(self, keywords: List[str], node: BaseNode) -> None:
         """Add text to table."""
         for keyword in keywords:
@@ -124,15 +315,76 @@ class KeywordTable(IndexStruct):
                 self.table[keyword] = set()
             self.table[keyword].add(node.node_id)
 
+    def delete_node(self, node_id: str) -> None:
+        """Delete a node from the table, and keywords left without nodes."""
+        keywords = [
+            keyword
+            for keyword, existing_node_ids in self.table.items()
+            if node_id in existing_node_ids
+        ]
+        # change the node ids of keywords by key, so changes are tracked
+        for keyword in keywords:
+            existing_node_ids = self.table[keyword]
+            existing_node_ids.remove(node_id)
+            if len(existing_node_ids) == 0:
+                del self.table[keyword]
+
+    def _get_base_postings(self) -> Optional[KeywordPostings]:
+        """Get the cached posting lists, if pending changes can be applied to them."""
+        if self.table is not self._tracked_table:
+            # the table was replaced
+            self._tracked_table.remove_tracker(self._changed_keywords)
+            self._track_table()
+        if self._postings is None:
+            return None
+        max_changed = max(
+            MIN_POSTINGS_MERGE_KEYWORDS,
+            POSTINGS_MERGE_RATIO * len(self._postings.keyword_to_row),
+        )
+        if len(self._changed_keywords) > max_changed:
+            return None
+        return self._postings
+
+    def get_postings(self) -> KeywordPostings:
+        """Get the posting lists of the table, merging pending changes."""
+        if self._get_base_postings() is None or self._changed_keywords:
+            self._changed_keywords.clear()
+            self._postings = KeywordPostings(self.table)
+        assert self._postings is not None
+        return self._postings
+
+    def top_nodes(self, keywords: Sequence[str], top_n: int) -> List[Tuple[str, int]]:
+        """Get the `top_n` node ids matching the most keywords, with their counts.
+
+        Keywords changed since the posting lists were built are matched
+        against the table.
+        """
+        postings = self._get_base_postings()
+        if postings is None:
+            postings = self.get_postings()
+        changed = self._changed_keywords
+        # read the table as a plain dict, so reads are not recorded as changes
+        changed_node_ids = [
+            node_id
+            for keyword in keywords
+            if keyword in changed
+            for node_id in dict.get(self.table, keyword, ())
+        ]
+        return postings.top_nodes(
+            [keyword for keyword in keywords if keyword not in changed],
+            top_n,
+            extra_node_ids=changed_node_ids,
+        )
+
     @property
     def node_ids(self) -> Set[str]:
         """Get all node ids."""
-        return set.union(*self.table.values())
+        return set(self.get_postings().node_ids)
 
     @property
-    def keywords(self) -> Set[str]:
-        """Get all keywords in the table."""
-        return set(self.table.keys())
+    def keywords(self) -> AbstractSet[str]:
+        """Get all keywords in the table (a live, read-only view)."""
+        return self.table.keys()
 
     @property
     def size(self) -> int:
@@ -227,6 +479,11 @@ class KG(IndexStruct):
     # maybe chainable abstractions for *_stores could be designed
     embedding_dict: Dict[str, List[float]] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # unit-normalized rows of embedding_dict, built on first similarity search
+        self._embedding_ids: List[str] = []
+        self._embedding_matrix: Optional[np.ndarray] = None
+
     @property
     def node_ids(self) -> Set[str]:
         """Get all node ids."""
@@ -235,6 +492,41 @@ class KG(IndexStruct):
     def add_to_embedding_dict(self, triplet_str: str, embedding: List[float]) -> None:
         """Add embedding to dict."""
         self.embedding_dict[triplet_str] = embedding
+        self._embedding_matrix = None
+
+    def get_embedding_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Get the triplet strings and their unit-normalized embeddings."""
+        if self._embedding_matrix is None or len(self._embedding_ids) != len(
+            self.embedding_dict
+        ):
+            self._embedding_ids = list(self.embedding_dict.keys())
+            matrix = np.array(
+                [self.embedding_dict[_id] for _id in self._embedding_ids],
+                dtype=np.float64,
+            )
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._embedding_matrix = matrix / norms
+        return self._embedding_ids, self._embedding_matrix
+
+    def get_top_k_embeddings(
+        self, query_embedding: List[float], similarity_top_k: int
+    ) -> Tuple[List[float], List[str]]:
+        """Get the triplet strings most similar to the query (cosine similarity)."""
+        embedding_ids, matrix = self.get_embedding_matrix()
+        if not embedding_ids or similarity_top_k <= 0:
+            return [], []
+        query = np.asarray(query_embedding, dtype=np.float64)
+        query_norm = np.linalg.norm(query)
+        similarities = matrix @ (query / query_norm if query_norm else query)
+
+        if similarity_top_k < len(embedding_ids):
+            top = np.argpartition(-similarities, similarity_top_k - 1)
+            top = top[:similarity_top_k]
+        else:
+            top = np.arange(len(embedding_ids))
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return similarities[top].tolist(), [embedding_ids[i] for i in top]
 
     def add_node(self, keywords: List[str], node: BaseNode) -> None:
         """Add text to table."""
@@ -4,7 +4,7 @@ import json
 import logging
 import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import fsspec
 from dataclasses_json import DataClassJsonMixin
@@ -21,49 +21,124 @@ logger = logging.getLogger(__name__)
 class SimpleGraphStoreData(DataClassJsonMixin):
     """Simple Graph Store Data container.
 
+    `graph_dict` holds the `[rel, obj]` edges of each subject, and is kept
+    up to date on writes. Edges are indexed by their position in it, and
+    subjects by the objects they point to, so upserts, deletes and lookups
+    take constant time. A delete moves the subject's last edge into the
+    freed position.
+
     Args:
         graph_dict (Optional[dict]): dict mapping subject to
     """
 
     graph_dict: Dict[str, List[List[str]]] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        # subject -> (rel, obj) -> position of the edge in graph_dict[subject]
+        self._edges: Dict[str, Dict[Tuple[str, str], int]] = {}
+        # object -> subject -> number of edges from the subject to the object
+        self._subjects: Dict[str, Dict[str, int]] = {}
+        graph_dict, self.graph_dict = self.graph_dict, {}
+        for subj, rels in graph_dict.items():
+            self._edges.setdefault(subj, {})
+            self.graph_dict.setdefault(subj, [])
+            for rel, obj in rels:
+                self.add(subj, rel, obj)
+
+    def add(self, subj: str, rel: str, obj: str) -> None:
+        """Add a triplet, if not present."""
+        edges = self._edges.setdefault(subj, {})
+        if (rel, obj) in edges:
+            return
+        rels = self.graph_dict.setdefault(subj, [])
+        edges[(rel, obj)] = len(rels)
+        rels.append([rel, obj])
+        subjects = self._subjects.setdefault(obj, {})
+        subjects[subj] = subjects.get(subj, 0) + 1
+
+    def remove(self, subj: str, rel: str, obj: str) -> None:
+        """Remove a triplet, if present."""
+        edges = self._edges.get(subj)
+        if edges is None or (rel, obj) not in edges:
+            return
+        position = edges.pop((rel, obj))
+        rels = self.graph_dict[subj]
+        last_rel, last_obj = rels.pop()
+        if position < len(rels):
+            rels[position] = [last_rel, last_obj]
+            edges[(last_rel, last_obj)] = position
+        if not edges:
+            del self._edges[subj]
+            del self.graph_dict[subj]
+        subjects = self._subjects[obj]
+        subjects[subj] -= 1
+        if subjects[subj] == 0:
+            del subjects[subj]
+            if not subjects:
+                del self._subjects[obj]
+
+    def get(self, subj: str) -> List[List[str]]:
+        """Get the `[rel, obj]` edges of a subject."""
+        return [[rel, obj] for rel, obj in self.graph_dict.get(subj, [])]
+
+    def get_subjects(self, obj: str) -> List[str]:
+        """Get the subjects with an edge to an object."""
+        return list(self._subjects.get(obj, {}))
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
     def get_rel_map(
         self, subjs: Optional[List[str]] = None, depth: int = 2, limit: int = 30
     ) -> Dict[str, List[List[str]]]:
-        """Get subjects' rel map in max depth."""
+        """Get subjects' rel map in max depth.
+
+        At most `limit` triplets are returned in total. The budget is shared
+        evenly between subjects, and what a subject with few triplets does not
+        use goes to the others, so one hub subject cannot crowd out the rest.
+        """
         if subjs is None:
-            subjs = list(self.graph_dict.keys())
-        rel_map = {}
-        for subj in subjs:
-            rel_map[subj] = self._get_rel_map(subj, depth=depth, limit=limit)
-        # TBD, truncate the rel_map in a spread way, now just truncate based
-        # on iteration order
-        rel_count = 0
+            subjs = list(self._edges.keys())
+        # no subject can use more than the whole budget
+        subj_rels = {
+            subj: self._get_rel_map(subj, depth=depth, limit=limit) for subj in subjs
+        }
+        # fill subjects from the fewest triplets up, so unused shares carry over
+        remaining = limit
+        num_left = len(subj_rels)
         return_map = {}
-        for subj in rel_map:
-            if rel_count + len(rel_map[subj]) > limit:
-                return_map[subj] = rel_map[subj][: limit - rel_count]
-                break
-            else:
-                return_map[subj] = rel_map[subj]
-                rel_count += len(rel_map[subj])
-        return return_map
+        for subj in sorted(subj_rels, key=lambda subj: len(subj_rels[subj])):
+            share = min(len(subj_rels[subj]), remaining // num_left)
+            return_map[subj] = subj_rels[subj][:share]
+            remaining -= share
+            num_left -= 1
+        # keep the order subjects were asked for
+        return {subj: return_map[subj] for subj in subj_rels}
 
     def _get_rel_map(
         self, subj: str, depth: int = 2, limit: int = 30
     ) -> List[List[str]]:
-        """Get one subect's rel map in max depth."""
-        if depth == 0:
-            return []
-        rel_map = []
-        rel_count = 0
-        if subj in self.graph_dict:
-            for rel, obj in self.graph_dict[subj]:
-                if rel_count >= limit:
-                    break
-                rel_map.append([subj, rel, obj])
-                rel_map += self._get_rel_map(obj, depth=depth - 1)
-                rel_count += 1
+        """Get one subject's rel map in max depth.
+
+        Breadth-first, so nearer triplets come first, and each entity is
+        expanded once, so cycles and shared neighbours are not revisited.
+        """
+        rel_map: List[List[str]] = []
+        visited = {subj}
+        frontier = [subj]
+        for _ in range(depth):
+            next_frontier = []
+            for cur_subj in frontier:
+                for rel, obj in self.graph_dict.get(cur_subj, []):
+                    if len(rel_map) >= limit:
+                        return rel_map
+                    rel_map.append([cur_subj, rel, obj])
+                    if obj not in visited:
+                        visited.add(obj)
+                        next_frontier.append(obj)
+            if not next_frontier:
+                break
+            frontier = next_frontier
         return rel_map
 
 
@@ -107,7 +182,7 @@ class SimpleGraphStore(GraphStore):
 
     def get(self, subj: str) -> List[List[str]]:
         """Get triplets."""
-        return self._data.graph_dict.get(subj, [])
+        return self._data.get(subj)
 
     def get_rel_map(
         self, subjs: Optional[List[str]] = None, depth: int = 2, limit: int = 30
@@ -117,18 +192,16 @@ class SimpleGraphStore(GraphStore):
 
     def upsert_triplet(self, subj: str, rel: str, obj: str) -> None:
         """Add triplet."""
-        if subj not in self._data.graph_dict:
-            self._data.graph_dict[subj] = []
-        if (rel, obj) not in self._data.graph_dict[subj]:
-            self._data.graph_dict[subj].append([rel, obj])
+        self._data.add(subj, rel, obj)
+
+    def upsert_triplets(self, triplets: Sequence[Tuple[str, str, str]]) -> None:
+        """Add triplets."""
+        for subj, rel, obj in triplets:
+            self._data.add(subj, rel, obj)
 
     def delete(self, subj: str, rel: str, obj: str) -> None:
         """Delete triplet."""
-        if subj in self._data.graph_dict:
-            if (rel, obj) in self._data.graph_dict[subj]:
-                self._data.graph_dict[subj].remove([rel, obj])
-                if len(self._data.graph_dict[subj]) == 0:
-                    del self._data.graph_dict[subj]
+        self._data.remove(subj, rel, obj)
 
     def persist(
         self,
@@ -142,7 +215,7 @@ class SimpleGraphStore(GraphStore):
             fs.makedirs(dirpath)
 
         with fs.open(persist_path, "w") as f:
-            json.dump(self._data.to_dict(), f)
+            json.dump(self._data.to_dict(), f, separators=(",", ":"))
 
     def get_schema(self, refresh: bool = False) -> str:
         """Get the schema of the Simple Graph store."""
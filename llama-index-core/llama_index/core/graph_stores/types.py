@@ -1,4 +1,13 @@
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    runtime_checkable,
+)
 
 import fsspec
 
@@ -63,3 +72,20 @@ class GraphStore(Protocol):
     def query(self, query: str, param_map: Optional[Dict[str, Any]] = {}) -> Any:
         """Query the graph store with statement and parameters."""
         ...
+
+
+def upsert_triplets(
+    graph_store: GraphStore, triplets: Sequence[Tuple[str, str, str]]
+) -> None:
+    """Add triplets to a graph store.
+
+    Graph stores that support bulk writes can define an
+    `upsert_triplets(triplets)` method, which is then used instead of calling
+    `upsert_triplet` for each triplet.
+    """
+    bulk_upsert = getattr(graph_store, "upsert_triplets", None)
+    if bulk_upsert is not None:
+        bulk_upsert(triplets)
+        return
+    for subj, rel, obj in triplets:
+        graph_store.upsert_triplet(subj, rel, obj)
@@ -1,10 +1,16 @@
 """Common classes/functions for tree index operations."""
 
-import asyncio
+import hashlib
+import json
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Sequence, Tuple
 
-from llama_index.core.async_utils import run_async_tasks
+from tenacity import AsyncRetrying, Retrying, stop_after_attempt, wait_exponential
+
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS, run_async_tasks, run_jobs
+from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.callbacks.schema import CBEventType, EventPayload
 from llama_index.core.data_structs.data_structs import IndexGraph
 from llama_index.core.indices.prompt_helper import PromptHelper
@@ -24,6 +30,14 @@ from llama_index.core.utils import get_tqdm_iterable
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_CHECKPOINT_BATCH_SIZE = 16
+CHECKPOINT_SUMMARIES_KEY = "summaries"
+CHECKPOINT_EMBEDDINGS_KEY = "embeddings"
+CHECKPOINT_LEVEL_KEY = "level"
+CHECKPOINT_LEAVES_HASH_KEY = "leaves_hash"
+CHECKPOINT_LEVEL_ID_KEY = "level_id"
+
 
 class GPTTreeIndexBuilder:
     """GPT tree index builder.
@@ -31,6 +45,18 @@ class GPTTreeIndexBuilder:
     Helper class to build the tree-structured index,
     or to synthesize an answer.
 
+    The chunks of each level are summarized concurrently by up to `num_workers`
+    threads (or async jobs if `use_async`), retrying failed LLM calls up to
+    `max_retries` times. If `embed_model` is set, the summaries of each level
+    are embedded in one batch.
+
+    If `checkpoint_id` is set, the index graph is saved to the docstore (as a
+    node with that id) at the start of each level, and chunks are summarized
+    (and embedded) in batches of `checkpoint_batch_size`, each saved as its
+    own node. A build over the same nodes then resumes from the last
+    completed batch. Batch nodes are deleted once their level is built, and
+    the checkpoint once the build finishes.
+
     """
 
     def __init__(
@@ -42,6 +68,11 @@ class GPTTreeIndexBuilder:
         docstore: Optional[BaseDocumentStore] = None,
         show_progress: bool = False,
         use_async: bool = False,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        embed_model: Optional[BaseEmbedding] = None,
+        checkpoint_id: Optional[str] = None,
+        checkpoint_batch_size: int = DEFAULT_CHECKPOINT_BATCH_SIZE,
     ) -> None:
         """Initialize with params."""
         if num_children < 2:
@@ -58,6 +89,19 @@ class GPTTreeIndexBuilder:
         self._use_async = use_async
         self._show_progress = show_progress
         self._docstore = docstore or get_default_docstore()
+        self._num_workers = num_workers
+        self._max_retries = max_retries
+        self._embed_model = embed_model
+        self._checkpoint_id = checkpoint_id
+        self._checkpoint_batch_size = checkpoint_batch_size
+        self._leaves_hash: Optional[str] = None
+        # id of the level being built, to match batches to it, and its batches
+        self._level_id: Optional[str] = None
+        self._num_batches = 0
+        # level, summaries and embeddings of a partly built level to resume
+        self._resumed_level: Optional[
+            Tuple[int, List[str], Optional[List[List[float]]]]
+        ] = None
 
     @property
     def docstore(self) -> BaseDocumentStore:
@@ -79,13 +123,229 @@ class GPTTreeIndexBuilder:
         for node in nodes:
             index_graph.insert(node)
 
-        if build_tree:
-            return self.build_index_from_nodes(
-                index_graph, index_graph.all_nodes, index_graph.all_nodes, level=0
-            )
-        else:
+        if not build_tree:
             return index_graph
 
+        cur_node_ids, level = index_graph.all_nodes, 0
+        if self._checkpoint_id is not None:
+            self._leaves_hash = self._get_leaves_hash(nodes)
+        checkpoint = self._load_checkpoint(nodes)
+        if checkpoint is not None:
+            index_graph, level, summaries, embeddings = checkpoint
+            cur_node_ids = index_graph.root_nodes
+            self._resumed_level = (level, summaries, embeddings)
+            logger.info(
+                f"> Resuming tree build from level {level}, "
+                f"{len(summaries)} summaries done"
+            )
+        elif len(cur_node_ids) > self.num_children:
+            self._save_checkpoint(index_graph, cur_node_ids, level)
+
+        index_graph = self.build_index_from_nodes(
+            index_graph, cur_node_ids, index_graph.all_nodes, level=level
+        )
+        self._delete_checkpoint()
+        return index_graph
+
+    def _get_leaves_hash(self, nodes: Sequence[BaseNode]) -> str:
+        """Hash the contents of the leaf nodes, to match checkpoints to builds."""
+        leaves_hash = hashlib.sha256()
+        for node in nodes:
+            leaves_hash.update(node.hash.encode("utf-8"))
+        return leaves_hash.hexdigest()
+
+    def _get_batch_id(self, level: int, batch_num: int) -> str:
+        return f"{self._checkpoint_id}_{level}_{batch_num}"
+
+    def _save_checkpoint(
+        self, index_graph: IndexGraph, cur_node_ids: Dict[int, str], level: int
+    ) -> None:
+        """Save the index graph, with the nodes of the level to build as roots."""
+        if self._checkpoint_id is None or self._leaves_hash is None:
+            return
+        self._level_id = str(uuid.uuid4())
+        graph_dict = index_graph.to_dict()
+        graph_dict["root_nodes"] = cur_node_ids
+        checkpoint = TextNode(
+            id_=self._checkpoint_id,
+            text=json.dumps(graph_dict),
+            metadata={
+                CHECKPOINT_LEVEL_KEY: level,
+                CHECKPOINT_LEAVES_HASH_KEY: self._leaves_hash,
+                CHECKPOINT_LEVEL_ID_KEY: self._level_id,
+            },
+        )
+        self._docstore.add_documents([checkpoint], allow_update=True)
+
+    def _save_checkpoint_batch(
+        self,
+        level: int,
+        summaries: List[str],
+        embeddings: Optional[List[List[float]]],
+    ) -> None:
+        """Save the summaries and embeddings of one batch of a level."""
+        if self._checkpoint_id is None or self._level_id is None:
+            return
+        batch = TextNode(
+            id_=self._get_batch_id(level, self._num_batches),
+            text=json.dumps(
+                {
+                    CHECKPOINT_SUMMARIES_KEY: summaries,
+                    CHECKPOINT_EMBEDDINGS_KEY: embeddings,
+                }
+            ),
+            metadata={CHECKPOINT_LEVEL_ID_KEY: self._level_id},
+        )
+        self._docstore.add_documents([batch], allow_update=True)
+        self._num_batches += 1
+
+    def _load_checkpoint(
+        self, nodes: Sequence[BaseNode]
+    ) -> Optional[Tuple[IndexGraph, int, List[str], Optional[List[List[float]]]]]:
+        """Load the index graph, level to build and its summaries done."""
+        if self._checkpoint_id is None:
+            return None
+        checkpoint = self._docstore.get_document(self._checkpoint_id, raise_error=False)
+        if checkpoint is None:
+            return None
+        if checkpoint.metadata.get(CHECKPOINT_LEAVES_HASH_KEY) != self._leaves_hash:
+            logger.warning(
+                f"Ignoring checkpoint {self._checkpoint_id}, "
+                "it was saved while building from different nodes."
+            )
+            return None
+
+        saved_graph = IndexGraph.from_dict(json.loads(checkpoint.get_content()))
+        # leaf nodes can have new ids on each run, map them by position
+        id_map = {
+            saved_graph.all_nodes[index]: node.node_id
+            for index, node in enumerate(nodes)
+        }
+        index_graph = IndexGraph(
+            index_id=saved_graph.index_id,
+            summary=saved_graph.summary,
+            all_nodes={
+                index: id_map.get(node_id, node_id)
+                for index, node_id in saved_graph.all_nodes.items()
+            },
+            root_nodes={
+                index: id_map.get(node_id, node_id)
+                for index, node_id in saved_graph.root_nodes.items()
+            },
+            node_id_to_children_ids={
+                id_map.get(node_id, node_id): [id_map.get(c, c) for c in children]
+                for node_id, children in saved_graph.node_id_to_children_ids.items()
+            },
+        )
+
+        # the batches saved for the level, up to the first missing one
+        level = checkpoint.metadata[CHECKPOINT_LEVEL_KEY]
+        self._level_id = checkpoint.metadata[CHECKPOINT_LEVEL_ID_KEY]
+        self._num_batches = 0
+        summaries: List[str] = []
+        embeddings: Optional[List[List[float]]] = []
+        while True:
+            batch = self._docstore.get_document(
+                self._get_batch_id(level, self._num_batches), raise_error=False
+            )
+            if batch is None or (
+                batch.metadata.get(CHECKPOINT_LEVEL_ID_KEY) != self._level_id
+            ):
+                break
+            batch_dict = json.loads(batch.get_content())
+            summaries.extend(batch_dict[CHECKPOINT_SUMMARIES_KEY])
+            if embeddings is not None and batch_dict[CHECKPOINT_EMBEDDINGS_KEY]:
+                embeddings.extend(batch_dict[CHECKPOINT_EMBEDDINGS_KEY])
+            else:
+                embeddings = None
+            self._num_batches += 1
+        return index_graph, level, summaries, embeddings
+
+    def _delete_checkpoint_batches(self, level: int) -> None:
+        if self._checkpoint_id is None:
+            return
+        for batch_num in range(self._num_batches):
+            self._docstore.delete_document(
+                self._get_batch_id(level, batch_num), raise_error=False
+            )
+        self._num_batches = 0
+
+    def _delete_checkpoint(self) -> None:
+        if self._checkpoint_id is not None:
+            self._docstore.delete_document(self._checkpoint_id, raise_error=False)
+
+    def _start_level(
+        self, level: int, num_chunks: int
+    ) -> Tuple[List[str], Optional[List[List[float]]], int]:
+        """Get the summaries and embeddings done for a level, and the batch size."""
+        summaries: List[str] = []
+        embeddings: Optional[List[List[float]]] = (
+            [] if self._embed_model is not None else None
+        )
+        if self._resumed_level is not None and self._resumed_level[0] == level:
+            _, summaries, resumed_embeddings = self._resumed_level
+            if embeddings is not None and resumed_embeddings is not None:
+                embeddings = resumed_embeddings
+            elif embeddings is not None:
+                # saved without embed_model, summarize the level again
+                summaries = []
+                self._delete_checkpoint_batches(level)
+        self._resumed_level = None
+
+        batch_size = num_chunks
+        if self._checkpoint_id is not None:
+            batch_size = max(1, self._checkpoint_batch_size)
+        return summaries, embeddings, batch_size
+
+    def _get_retry_kwargs(self) -> dict:
+        return {
+            "reraise": True,
+            "stop": stop_after_attempt(self._max_retries + 1),
+            "wait": wait_exponential(multiplier=0.5, max=10),
+        }
+
+    def _summarize(self, text_chunk: str) -> str:
+        """Summarize a text chunk, retrying on errors."""
+        retrying = Retrying(**self._get_retry_kwargs())
+        return retrying(self._llm.predict, self.summary_prompt, context_str=text_chunk)
+
+    async def _asummarize(self, text_chunk: str) -> str:
+        """Summarize a text chunk, retrying on errors."""
+        retrying = AsyncRetrying(**self._get_retry_kwargs())
+        return await retrying(
+            self._llm.apredict, self.summary_prompt, context_str=text_chunk
+        )
+
+    def _summarize_chunks(self, text_chunks: List[str]) -> List[str]:
+        """Summarize the text chunks of a level concurrently."""
+        if self._use_async:
+            jobs = [self._asummarize(text_chunk) for text_chunk in text_chunks]
+            return run_async_tasks(
+                [
+                    run_jobs(
+                        jobs,
+                        show_progress=self._show_progress,
+                        workers=self._num_workers,
+                    )
+                ]
+            )[0]
+
+        if self._num_workers <= 1:
+            text_chunks_progress = get_tqdm_iterable(
+                text_chunks,
+                show_progress=self._show_progress,
+                desc="Generating summaries",
+            )
+            return [self._summarize(text_chunk) for text_chunk in text_chunks_progress]
+
+        with ThreadPoolExecutor(max_workers=self._num_workers) as executor:
+            summaries_progress = get_tqdm_iterable(
+                executor.map(self._summarize, text_chunks),
+                show_progress=self._show_progress,
+                desc="Generating summaries",
+            )
+            return list(summaries_progress)
+
     def _prepare_node_and_text_chunks(
         self, cur_node_ids: Dict[int, str]
     ) -> Tuple[List[int], List[List[BaseNode]], List[str]]:
@@ -120,13 +380,15 @@ class GPTTreeIndexBuilder:
         indices: List[int],
         cur_nodes_chunks: List[List[BaseNode]],
         summaries: List[str],
+        embeddings: Optional[List[List[float]]] = None,
     ) -> Dict[int, str]:
         """Construct parent nodes.
 
         Save nodes to docstore.
 
         """
-        new_node_dict = {}
+        new_node_dict: Dict[int, str] = {}
+        new_nodes: List[TextNode] = []
         for i, cur_nodes_chunk, new_summary in zip(
             indices, cur_nodes_chunks, summaries
         ):
@@ -135,10 +397,13 @@ class GPTTreeIndexBuilder:
                 f"summary: {truncate_text(new_summary, 50)}"
             )
             new_node = TextNode(text=new_summary)
+            if embeddings is not None:
+                new_node.embedding = embeddings[len(new_nodes)]
             index_graph.insert(new_node, children_nodes=cur_nodes_chunk)
             index = index_graph.get_index(new_node)
             new_node_dict[index] = new_node.node_id
-            self._docstore.add_documents([new_node], allow_update=False)
+            new_nodes.append(new_node)
+        self._docstore.add_documents(new_nodes, allow_update=False)
         return new_node_dict
 
     def build_index_from_nodes(
@@ -157,39 +422,35 @@ class GPTTreeIndexBuilder:
             cur_node_ids
         )
 
+        summaries, embeddings, batch_size = self._start_level(level, len(text_chunks))
         with self._callback_manager.event(
             CBEventType.TREE, payload={EventPayload.CHUNKS: text_chunks}
         ) as event:
-            if self._use_async:
-                tasks = [
-                    self._llm.apredict(self.summary_prompt, context_str=text_chunk)
-                    for text_chunk in text_chunks
-                ]
-                outputs: List[Tuple[str, str]] = run_async_tasks(
-                    tasks,
-                    show_progress=self._show_progress,
-                    progress_bar_desc="Generating summaries",
-                )
-                summaries = [output[0] for output in outputs]
-            else:
-                text_chunks_progress = get_tqdm_iterable(
-                    text_chunks,
-                    show_progress=self._show_progress,
-                    desc="Generating summaries",
+            while len(summaries) < len(text_chunks):
+                batch = text_chunks[len(summaries) : len(summaries) + batch_size]
+                batch_summaries = self._summarize_chunks(batch)
+                if self._embed_model is not None and embeddings is not None:
+                    embeddings.extend(
+                        self._embed_model.get_text_embedding_batch(batch_summaries)
+                    )
+                self._save_checkpoint_batch(
+                    level,
+                    batch_summaries,
+                    embeddings[len(summaries) :] if embeddings is not None else None,
                 )
-                summaries = [
-                    self._llm.predict(self.summary_prompt, context_str=text_chunk)
-                    for text_chunk in text_chunks_progress
-                ]
+                summaries.extend(batch_summaries)
 
             event.on_end(payload={"summaries": summaries, "level": level})
 
         new_node_dict = self._construct_parent_nodes(
-            index_graph, indices, cur_nodes_chunks, summaries
+            index_graph, indices, cur_nodes_chunks, summaries, embeddings
         )
         all_node_ids.update(new_node_dict)
 
         index_graph.root_nodes = new_node_dict
+        if len(new_node_dict) > self.num_children:
+            self._save_checkpoint(index_graph, new_node_dict, level + 1)
+        self._delete_checkpoint_batches(level)
 
         if len(new_node_dict) <= self.num_children:
             return index_graph
@@ -214,29 +475,40 @@ class GPTTreeIndexBuilder:
             cur_node_ids
         )
 
+        summaries, embeddings, batch_size = self._start_level(level, len(text_chunks))
         with self._callback_manager.event(
             CBEventType.TREE, payload={EventPayload.CHUNKS: text_chunks}
         ) as event:
-            text_chunks_progress = get_tqdm_iterable(
-                text_chunks,
-                show_progress=self._show_progress,
-                desc="Generating summaries",
-            )
-            tasks = [
-                self._llm.apredict(self.summary_prompt, context_str=text_chunk)
-                for text_chunk in text_chunks_progress
-            ]
-            outputs: List[Tuple[str, str]] = await asyncio.gather(*tasks)
-            summaries = [output[0] for output in outputs]
+            while len(summaries) < len(text_chunks):
+                batch = text_chunks[len(summaries) : len(summaries) + batch_size]
+                jobs = [self._asummarize(text_chunk) for text_chunk in batch]
+                batch_summaries = await run_jobs(
+                    jobs, show_progress=self._show_progress, workers=self._num_workers
+                )
+                if self._embed_model is not None and embeddings is not None:
+                    embeddings.extend(
+                        await self._embed_model.aget_text_embedding_batch(
+                            batch_summaries
+                        )
+                    )
+                self._save_checkpoint_batch(
+                    level,
+                    batch_summaries,
+                    embeddings[len(summaries) :] if embeddings is not None else None,
+                )
+                summaries.extend(batch_summaries)
 
             event.on_end(payload={"summaries": summaries, "level": level})
 
         new_node_dict = self._construct_parent_nodes(
-            index_graph, indices, cur_nodes_chunks, summaries
+            index_graph, indices, cur_nodes_chunks, summaries, embeddings
         )
         all_node_ids.update(new_node_dict)
 
         index_graph.root_nodes = new_node_dict
+        if len(new_node_dict) > self.num_children:
+            self._save_checkpoint(index_graph, new_node_dict, level + 1)
+        self._delete_checkpoint_batches(level)
 
         if len(new_node_dict) <= self.num_children:
             return index_graph
@@ -8,11 +8,13 @@ existing keywords in the table.
 
 """
 
+import hashlib
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
-from typing import Any, Dict, Optional, Sequence, Set, Union
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 
-from llama_index.core.async_utils import run_async_tasks
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS, run_async_tasks, run_jobs
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.data_structs.data_structs import KeywordTable
 from llama_index.core.indices.base import BaseIndex
@@ -32,6 +34,7 @@ from llama_index.core.storage.docstore.types import RefDocInfo
 from llama_index.core.utils import get_tqdm_iterable
 
 DQKET = DEFAULT_QUERY_KEYWORD_EXTRACT_TEMPLATE
+KEYWORD_CACHE_SIZE = 10000
 
 
 class KeywordTableRetrieverMode(str, Enum):
@@ -58,6 +61,8 @@ class BaseKeywordTableIndex(BaseIndex[KeywordTable]):
             (see :ref:`Prompt-Templates`).
         use_async (bool): Whether to use asynchronous calls. Defaults to False.
         show_progress (bool): Whether to show tqdm progress bars. Defaults to False.
+        num_workers (int): Number of keyword extractions to run concurrently
+            (threads, or async jobs if `use_async`). Defaults to 4.
 
     """
 
@@ -74,6 +79,7 @@ class BaseKeywordTableIndex(BaseIndex[KeywordTable]):
         max_keywords_per_chunk: int = 10,
         use_async: bool = False,
         show_progress: bool = False,
+        num_workers: int = DEFAULT_NUM_WORKERS,
         **kwargs: Any,
     ) -> None:
         """Initialize params."""
@@ -89,6 +95,10 @@ class BaseKeywordTableIndex(BaseIndex[KeywordTable]):
             max_keywords=self.max_keywords_per_chunk
         )
         self._use_async = use_async
+        self._num_workers = num_workers
+        # cache key (extractor, prompt and text hash) -> extracted keywords,
+        # cleared once it holds KEYWORD_CACHE_SIZE texts
+        self._keyword_cache: Dict[str, Set[str]] = {}
         super().__init__(
             nodes=nodes,
             index_struct=index_struct,
@@ -136,21 +146,85 @@ class BaseKeywordTableIndex(BaseIndex[KeywordTable]):
         # by default just call sync version
         return self._extract_keywords(text)
 
+    def _get_keyword_cache_key(self, text: str) -> str:
+        """Get the keyword cache key of a text, given the extractor and prompt."""
+        prompt = self.keyword_extract_template.get_template()
+        key = "\n".join(
+            [type(self).__name__, str(self.max_keywords_per_chunk), prompt, text]
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _group_nodes_by_text(
+        self, nodes: Sequence[BaseNode]
+    ) -> Dict[str, Tuple[str, List[BaseNode]]]:
+        """Group nodes by keyword cache key, so each text is only extracted once."""
+        groups: Dict[str, Tuple[str, List[BaseNode]]] = {}
+        for n in nodes:
+            text = n.get_content(metadata_mode=MetadataMode.LLM)
+            key = self._get_keyword_cache_key(text)
+            if key not in groups:
+                groups[key] = (text, [])
+            groups[key][1].append(n)
+        return groups
+
+    def _add_keywords_to_index(
+        self,
+        index_struct: KeywordTable,
+        cache_key: str,
+        keywords: Set[str],
+        nodes: Sequence[BaseNode],
+    ) -> None:
+        """Cache the keywords of a text and add its nodes to the index."""
+        if len(self._keyword_cache) >= KEYWORD_CACHE_SIZE:
+            self._keyword_cache.clear()
+        self._keyword_cache[cache_key] = keywords
+        for n in nodes:
+            index_struct.add_node(list(keywords), n)
+
     def _add_nodes_to_index(
         self,
         index_struct: KeywordTable,
         nodes: Sequence[BaseNode],
         show_progress: bool = False,
     ) -> None:
-        """Add document to index."""
-        nodes_with_progress = get_tqdm_iterable(
-            nodes, show_progress, "Extracting keywords from nodes"
-        )
-        for n in nodes_with_progress:
-            keywords = self._extract_keywords(
-                n.get_content(metadata_mode=MetadataMode.LLM)
+        """Add document to index.
+
+        Keywords are extracted by up to `num_workers` threads, and added to
+        the index as each extraction completes.
+        """
+        groups = self._group_nodes_by_text(nodes)
+        pending = []
+        for key, (text, group_nodes) in groups.items():
+            if key in self._keyword_cache:
+                self._add_keywords_to_index(
+                    index_struct, key, self._keyword_cache[key], group_nodes
+                )
+            else:
+                pending.append(key)
+
+        if self._num_workers <= 1 or len(pending) <= 1:
+            pending_with_progress = get_tqdm_iterable(
+                pending, show_progress, "Extracting keywords from nodes"
             )
-            index_struct.add_node(list(keywords), n)
+            for key in pending_with_progress:
+                text, group_nodes = groups[key]
+                keywords = self._extract_keywords(text)
+                self._add_keywords_to_index(index_struct, key, keywords, group_nodes)
+            return
+
+        with ThreadPoolExecutor(max_workers=self._num_workers) as executor:
+            futures = {
+                executor.submit(self._extract_keywords, groups[key][0]): key
+                for key in pending
+            }
+            futures_with_progress = get_tqdm_iterable(
+                as_completed(futures), show_progress, "Extracting keywords from nodes"
+            )
+            for future in futures_with_progress:
+                key = futures[future]
+                self._add_keywords_to_index(
+                    index_struct, key, future.result(), groups[key][1]
+                )
 
     async def _async_add_nodes_to_index(
         self,
@@ -158,15 +232,28 @@ class BaseKeywordTableIndex(BaseIndex[KeywordTable]):
         nodes: Sequence[BaseNode],
         show_progress: bool = False,
     ) -> None:
-        """Add document to index."""
-        nodes_with_progress = get_tqdm_iterable(
-            nodes, show_progress, "Extracting keywords from nodes"
-        )
-        for n in nodes_with_progress:
-            keywords = await self._async_extract_keywords(
-                n.get_content(metadata_mode=MetadataMode.LLM)
-            )
-            index_struct.add_node(list(keywords), n)
+        """Add document to index.
+
+        Keywords are extracted by up to `num_workers` concurrent jobs, and
+        added to the index as each extraction completes.
+        """
+        groups = self._group_nodes_by_text(nodes)
+
+        async def _extract_and_add(
+            key: str, text: str, group_nodes: List[BaseNode]
+        ) -> None:
+            keywords = await self._async_extract_keywords(text)
+            self._add_keywords_to_index(index_struct, key, keywords, group_nodes)
+
+        jobs = []
+        for key, (text, group_nodes) in groups.items():
+            if key in self._keyword_cache:
+                self._add_keywords_to_index(
+                    index_struct, key, self._keyword_cache[key], group_nodes
+                )
+            else:
+                jobs.append(_extract_and_add(key, text, group_nodes))
+        await run_jobs(jobs, show_progress=show_progress, workers=self._num_workers)
 
     def _build_index_from_nodes(self, nodes: Sequence[BaseNode]) -> KeywordTable:
         """Build the index from nodes."""
@@ -184,25 +271,11 @@ class BaseKeywordTableIndex(BaseIndex[KeywordTable]):
 
     def _insert(self, nodes: Sequence[BaseNode], **insert_kwargs: Any) -> None:
         """Insert nodes."""
-        for n in nodes:
-            keywords = self._extract_keywords(
-                n.get_content(metadata_mode=MetadataMode.LLM)
-            )
-            self._index_struct.add_node(list(keywords), n)
+        self._add_nodes_to_index(self._index_struct, nodes)
 
     def _delete_node(self, node_id: str, **delete_kwargs: Any) -> None:
         """Delete a node."""
-        # delete node from the keyword table
-        keywords_to_delete = set()
-        for keyword, existing_node_ids in self._index_struct.table.items():
-            if node_id in existing_node_ids:
-                existing_node_ids.remove(node_id)
-                if len(existing_node_ids) == 0:
-                    keywords_to_delete.add(keyword)
-
-        # delete keywords that have zero nodes
-        for keyword in keywords_to_delete:
-            del self._index_struct.table[keyword]
+        self._index_struct.delete_node(node_id)
 
     @property
     def ref_doc_info(self) -> Dict[str, RefDocInfo]:
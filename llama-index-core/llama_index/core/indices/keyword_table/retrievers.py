@@ -1,8 +1,7 @@
 """Query for KeywordTableIndex."""
 import logging
 from abc import abstractmethod
-from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Optional
 
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.callbacks.base import CallbackManager
@@ -91,18 +90,10 @@ class BaseKeywordTableRetriever(BaseRetriever):
         logger.info(f"query keywords: {keywords}")
 
         # go through text chunks in order of most matching keywords
-        chunk_indices_count: Dict[str, int] = defaultdict(int)
-        keywords = [k for k in keywords if k in self._index_struct.keywords]
+        keywords = [k for k in keywords if k in self._index_struct.table]
         logger.info(f"> Extracted keywords: {keywords}")
-        for k in keywords:
-            for node_id in self._index_struct.table[k]:
-                chunk_indices_count[node_id] += 1
-        sorted_chunk_indices = sorted(
-            chunk_indices_count.keys(),
-            key=lambda x: chunk_indices_count[x],
-            reverse=True,
-        )
-        sorted_chunk_indices = sorted_chunk_indices[: self.num_chunks_per_query]
+        top_nodes = self._index_struct.top_nodes(keywords, self.num_chunks_per_query)
+        sorted_chunk_indices = [node_id for node_id, _ in top_nodes]
         sorted_nodes = self._docstore.get_nodes(sorted_chunk_indices)
 
         if logging.getLogger(__name__).getEffectiveLevel() == logging.DEBUG:
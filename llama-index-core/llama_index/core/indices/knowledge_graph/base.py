@@ -4,15 +4,20 @@ Build a KG by extracting triplets, and leveraging the KG during query-time.
 
 """
 
+import asyncio
 import logging
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS, run_async_tasks, run_jobs
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.constants import GRAPH_STORE_KEY
 from llama_index.core.data_structs.data_structs import KG
-from llama_index.core.graph_stores.simple import SimpleGraphStore
-from llama_index.core.graph_stores.types import GraphStore
+from llama_index.core.graph_stores.simple import (
+    SimpleGraphStore,
+    SimpleGraphStoreData,
+)
+from llama_index.core.graph_stores.types import GraphStore, upsert_triplets
 from llama_index.core.indices.base import BaseIndex
 from llama_index.core.llms.llm import LLM
 from llama_index.core.prompts import BasePromptTemplate
@@ -52,6 +57,10 @@ class KnowledgeGraphIndex(BaseIndex[KG]):
             Defaults to 128.
         kg_triplet_extract_fn (Optional[Callable]): The function to use for
             extracting triplets. Defaults to None.
+        use_async (bool): Whether to extract triplets from nodes concurrently
+            with async LLM calls. Defaults to False.
+        num_workers (int): The maximum number of concurrent extractions when
+            `use_async` is set. Defaults to 4.
 
     """
 
@@ -71,6 +80,8 @@ class KnowledgeGraphIndex(BaseIndex[KG]):
         show_progress: bool = False,
         max_object_length: int = 128,
         kg_triplet_extract_fn: Optional[Callable] = None,
+        use_async: bool = False,
+        num_workers: int = DEFAULT_NUM_WORKERS,
         # deprecated
         service_context: Optional[ServiceContext] = None,
         **kwargs: Any,
@@ -90,6 +101,8 @@ class KnowledgeGraphIndex(BaseIndex[KG]):
         )
         self._max_object_length = max_object_length
         self._kg_triplet_extract_fn = kg_triplet_extract_fn
+        self._use_async = use_async
+        self._num_workers = num_workers
 
         self._llm = llm or llm_from_settings_or_context(Settings, service_context)
         self._embed_model = embed_model or embed_model_from_settings_or_context(
@@ -110,10 +123,12 @@ class KnowledgeGraphIndex(BaseIndex[KG]):
         if (
             len(self.index_struct.table) > 0
             and isinstance(self.graph_store, SimpleGraphStore)
-            and len(self.graph_store._data.graph_dict) == 0
+            and len(self.graph_store._data) == 0
         ):
             logger.warning("Upgrading previously saved KG index to new storage format.")
-            self.graph_store._data.graph_dict = self.index_struct.rel_map
+            self.graph_store._data = SimpleGraphStoreData(
+                graph_dict=self.index_struct.rel_map
+            )
 
     @property
     def graph_store(self) -> GraphStore:
@@ -158,6 +173,24 @@ class KnowledgeGraphIndex(BaseIndex[KG]):
             response, max_length=self._max_object_length
         )
 
+    async def _aextract_triplets(self, text: str) -> List[Tuple[str, str, str]]:
+        if self._kg_triplet_extract_fn is not None:
+            # run the sync extraction function off the event loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._kg_triplet_extract_fn, text)
+        else:
+            return await self._allm_extract_triplets(text)
+
+    async def _allm_extract_triplets(self, text: str) -> List[Tuple[str, str, str]]:
+        """Extract keywords from text."""
+        response = await self._llm.apredict(
+            self.kg_triple_extract_template,
+            text=text,
+        )
+        return self._parse_triplet_response(
+            response, max_length=self._max_object_length
+        )
+
     @staticmethod
     def _parse_triplet_response(
         response: str, max_length: int = 128
@@ -194,56 +227,99 @@ class KnowledgeGraphIndex(BaseIndex[KG]):
             results.append((subj, pred, obj))
         return results
 
-    def _build_index_from_nodes(self, nodes: Sequence[BaseNode]) -> KG:
-        """Build the index from nodes."""
-        # do simple concatenation
-        index_struct = self.index_struct_cls()
-        nodes_with_progress = get_tqdm_iterable(
-            nodes, self._show_progress, "Processing nodes"
+    def _extract_triplets_from_nodes(
+        self, nodes: Sequence[BaseNode]
+    ) -> List[List[Tuple[str, str, str]]]:
+        """Extract the triplets of each node, concurrently if `use_async`."""
+        texts = [n.get_content(metadata_mode=MetadataMode.LLM) for n in nodes]
+        if self._use_async:
+            jobs = [self._aextract_triplets(text) for text in texts]
+            return run_async_tasks(
+                [
+                    run_jobs(
+                        jobs,
+                        show_progress=self._show_progress,
+                        workers=self._num_workers,
+                    )
+                ]
+            )[0]
+
+        texts_with_progress = get_tqdm_iterable(
+            texts, self._show_progress, "Processing nodes"
         )
-        for n in nodes_with_progress:
-            triplets = self._extract_triplets(
-                n.get_content(metadata_mode=MetadataMode.LLM)
+        return [self._extract_triplets(text) for text in texts_with_progress]
+
+    def _embed_triplets(
+        self, index_struct: KG, triplets: Sequence[Tuple[str, str, str]]
+    ) -> None:
+        """Embed the triplets missing from the index struct in one batch."""
+        triplet_texts = list(
+            dict.fromkeys(
+                str(triplet)
+                for triplet in triplets
+                if str(triplet) not in index_struct.embedding_dict
             )
+        )
+        if not triplet_texts:
+            return
+        embed_outputs = self._embed_model.get_text_embedding_batch(
+            triplet_texts, show_progress=self._show_progress
+        )
+        for rel_text, rel_embed in zip(triplet_texts, embed_outputs):
+            index_struct.add_to_embedding_dict(rel_text, rel_embed)
+
+    def _add_nodes_to_index(self, index_struct: KG, nodes: Sequence[BaseNode]) -> None:
+        """Extract triplets from nodes and add them to the graph store and index."""
+        all_triplets: List[Tuple[str, str, str]] = []
+        for n, triplets in zip(nodes, self._extract_triplets_from_nodes(nodes)):
             logger.debug(f"> Extracted triplets: {triplets}")
             for triplet in triplets:
                 subj, _, obj = triplet
-                self.upsert_triplet(triplet)
                 index_struct.add_node([subj, obj], n)
+            all_triplets.extend(triplets)
 
-            if self.include_embeddings:
-                triplet_texts = [str(t) for t in triplets]
-
-                embed_outputs = self._embed_model.get_text_embedding_batch(
-                    triplet_texts, show_progress=self._show_progress
-                )
-                for rel_text, rel_embed in zip(triplet_texts, embed_outputs):
-                    index_struct.add_to_embedding_dict(rel_text, rel_embed)
+        # deduplicate, keeping the extraction order
+        all_triplets = list(
+            dict.fromkeys((subj, rel, obj) for subj, rel, obj in all_triplets)
+        )
+        upsert_triplets(self._graph_store, all_triplets)
+        if self.include_embeddings:
+            self._embed_triplets(index_struct, all_triplets)
 
+    def _build_index_from_nodes(self, nodes: Sequence[BaseNode]) -> KG:
+        """Build the index from nodes."""
+        index_struct = self.index_struct_cls()
+        self._add_nodes_to_index(index_struct, nodes)
         return index_struct
 
     def _insert(self, nodes: Sequence[BaseNode], **insert_kwargs: Any) -> None:
         """Insert a document."""
-        for n in nodes:
-            triplets = self._extract_triplets(
-                n.get_content(metadata_mode=MetadataMode.LLM)
-            )
-            logger.debug(f"Extracted triplets: {triplets}")
-            for triplet in triplets:
-                subj, _, obj = triplet
-                triplet_str = str(triplet)
-                self.upsert_triplet(triplet)
-                self._index_struct.add_node([subj, obj], n)
-                if (
-                    self.include_embeddings
-                    and triplet_str not in self._index_struct.embedding_dict
-                ):
-                    rel_embedding = self._embed_model.get_text_embedding(triplet_str)
-                    self._index_struct.add_to_embedding_dict(triplet_str, rel_embedding)
+        self._add_nodes_to_index(self._index_struct, nodes)
 
         # Update the storage context's index_store
         self._storage_context.index_store.add_index_struct(self._index_struct)
 
+    def upsert_triplets(
+        self,
+        triplets: Sequence[Tuple[str, str, str]],
+        include_embeddings: bool = False,
+    ) -> None:
+        """Insert triplets in bulk, and optionally embeddings.
+
+        Triplets are written to the graph store in bulk if it supports it
+        (see `llama_index.core.graph_stores.types.upsert_triplets`), and
+        embedded in one batch.
+
+        Args:
+            triplets (Sequence[tuple]): Knowledge triplets
+            include_embeddings (bool): Option to add embeddings for triplets.
+                Defaults to False.
+        """
+        upsert_triplets(self._graph_store, triplets)
+        if include_embeddings:
+            self._embed_triplets(self._index_struct, triplets)
+            self._storage_context.index_store.add_index_struct(self._index_struct)
+
     def upsert_triplet(
         self, triplet: Tuple[str, str, str], include_embeddings: bool = False
     ) -> None:
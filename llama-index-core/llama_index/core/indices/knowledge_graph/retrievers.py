@@ -1,7 +1,7 @@
 """KG Retrievers."""
 
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
@@ -12,7 +12,6 @@ from llama_index.core.indices.keyword_table.utils import (
     extract_keywords_given_response,
 )
 from llama_index.core.indices.knowledge_graph.base import KnowledgeGraphIndex
-from llama_index.core.indices.query.embedding_utils import get_top_k_embeddings
 from llama_index.core.llms.llm import LLM
 from llama_index.core.prompts import BasePromptTemplate, PromptTemplate, PromptType
 from llama_index.core.prompts.default_prompts import (
@@ -43,6 +42,63 @@ REL_TEXT_LIMIT = 30
 logger = logging.getLogger(__name__)
 
 
+def _remove_substrings(texts: List[str]) -> List[str]:
+    """Remove duplicates and texts contained in other texts, longest first.
+
+    All texts are matched at once with an Aho-Corasick automaton, so this is
+    linear in the total length of the texts rather than quadratic in their
+    number.
+    """
+    unique_texts = sorted(dict.fromkeys(t for t in texts if t), key=len, reverse=True)
+
+    # trie of all texts; `ends[node]` is the text ending at node, or -1
+    goto: List[Dict[str, int]] = [{}]
+    ends = [-1]
+    for i, text in enumerate(unique_texts):
+        node = 0
+        for char in text:
+            child = goto[node].get(char)
+            if child is None:
+                child = len(goto)
+                goto[node][char] = child
+                goto.append({})
+                ends.append(-1)
+            node = child
+        ends[node] = i
+
+    # failure links, and links to the longest proper suffix ending a text
+    fail = [0] * len(goto)
+    suffix_end = [-1] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            state = fail[node]
+            while state and char not in goto[state]:
+                state = fail[state]
+            fail[child] = goto[state].get(char, 0)
+            suffix_end[child] = (
+                fail[child] if ends[fail[child]] >= 0 else suffix_end[fail[child]]
+            )
+            queue.append(child)
+
+    contained = [False] * len(unique_texts)
+    for i, text in enumerate(unique_texts):
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if ends[node] >= 0 else suffix_end[node]
+            if match >= 0 and ends[match] == i:
+                match = suffix_end[match]
+            # shorter texts ending here are substrings of the match, and are
+            # marked when the match itself is scanned
+            if match >= 0:
+                contained[ends[match]] = True
+    return [t for t, is_contained in zip(unique_texts, contained) if not is_contained]
+
+
 class KGRetrieverMode(str, Enum):
     """Query mode enum for Knowledge Graphs.
 
@@ -200,8 +256,10 @@ class KGTableRetriever(BaseRetriever):
         cur_rel_map = {}
         chunk_indices_count: Dict[str, int] = defaultdict(int)
         if self._retriever_mode != KGRetrieverMode.EMBEDDING:
+            # insertion-ordered set of subjects, queried together below
+            subjs: Dict[str, None] = {}
             for keyword in keywords:
-                subjs = {keyword}
+                subjs[keyword] = None
                 node_ids = self._index_struct.search_node_by_keyword(keyword)
                 for node_id in node_ids[:GLOBAL_EXPLORE_NODE_LIMIT]:
                     if node_id in node_visited:
@@ -225,24 +283,28 @@ class KGTableRetriever(BaseRetriever):
                                 metadata_mode=MetadataMode.LLM
                             )
                         )
-                        subjs.update(extended_subjs)
+                        subjs.update(dict.fromkeys(extended_subjs))
 
+            if subjs:
+                # one query for all keywords, with the budget of one per keyword;
+                # the store shares it between subjects
                 rel_map = self._graph_store.get_rel_map(
-                    list(subjs), self.graph_store_query_depth
+                    list(subjs),
+                    self.graph_store_query_depth,
+                    limit=self.max_knowledge_sequence * len(keywords),
                 )
 
                 logger.debug(f"rel_map: {rel_map}")
 
-                if not rel_map:
-                    continue
-                rel_texts.extend(
-                    [
-                        str(rel_obj)
-                        for rel_objs in rel_map.values()
-                        for rel_obj in rel_objs
-                    ]
-                )
-                cur_rel_map.update(rel_map)
+                if rel_map:
+                    rel_texts.extend(
+                        [
+                            str(rel_obj)
+                            for rel_objs in rel_map.values()
+                            for rel_obj in rel_objs
+                        ]
+                    )
+                    cur_rel_map.update(rel_map)
 
         if (
             self._retriever_mode != KGRetrieverMode.KEYWORD
@@ -251,16 +313,8 @@ class KGTableRetriever(BaseRetriever):
             query_embedding = self._embed_model.get_text_embedding(
                 query_bundle.query_str
             )
-            all_rel_texts = list(self._index_struct.embedding_dict.keys())
-
-            rel_text_embeddings = [
-                self._index_struct.embedding_dict[_id] for _id in all_rel_texts
-            ]
-            similarities, top_rel_texts = get_top_k_embeddings(
-                query_embedding,
-                rel_text_embeddings,
-                similarity_top_k=self.similarity_top_k,
-                embedding_ids=all_rel_texts,
+            similarities, top_rel_texts = self._index_struct.get_top_k_embeddings(
+                query_embedding, similarity_top_k=self.similarity_top_k
             )
             logger.debug(
                 f"Found the following rel_texts+query similarites: {similarities!s}"
@@ -275,15 +329,8 @@ class KGTableRetriever(BaseRetriever):
 
         # remove any duplicates from keyword + embedding queries
         if self._retriever_mode == KGRetrieverMode.HYBRID:
-            rel_texts = list(set(rel_texts))
-
-            # remove shorter rel_texts that are substrings of longer rel_texts
-            rel_texts.sort(key=len, reverse=True)
-            for i in range(len(rel_texts)):
-                for j in range(i + 1, len(rel_texts)):
-                    if rel_texts[j] in rel_texts[i]:
-                        rel_texts[j] = ""
-            rel_texts = [rel_text for rel_text in rel_texts if rel_text != ""]
+            # and shorter rel_texts that are substrings of longer rel_texts
+            rel_texts = _remove_substrings(rel_texts)
 
             # truncate rel_texts
             rel_texts = rel_texts[: self.max_knowledge_sequence]
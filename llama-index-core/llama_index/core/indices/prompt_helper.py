@@ -11,7 +11,7 @@ needed), or truncating them so that they fit in a single LLM call.
 import logging
 from copy import deepcopy
 from string import Formatter
-from typing import Callable, List, Optional, Sequence
+from typing import Callable, Dict, List, Optional, Sequence
 
 from llama_index.core.base.llms.types import ChatMessage, LLMMetadata
 from llama_index.core.bridge.pydantic import Field, PrivateAttr
@@ -30,6 +30,10 @@ from llama_index.core.utilities.token_counting import TokenCounter
 
 DEFAULT_PADDING = 5
 DEFAULT_CHUNK_OVERLAP_RATIO = 0.1
+# separator between text chunks packed together
+CHUNK_SEPARATOR = "\n\n"
+# number of texts whose token count is cached
+TOKEN_COUNT_CACHE_SIZE = 10000
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +79,7 @@ class PromptHelper(BaseComponent):
     )
 
     _token_counter: TokenCounter = PrivateAttr()
+    _token_counts: Dict[str, int] = PrivateAttr(default_factory=dict)
 
     def __init__(
         self,
@@ -134,6 +139,17 @@ class PromptHelper(BaseComponent):
     def class_name(cls) -> str:
         return "PromptHelper"
 
+    def _get_token_count(self, text: str) -> int:
+        """Get the number of tokens in a text, cached by text."""
+        num_tokens = self._token_counts.get(text)
+        if num_tokens is None:
+            num_tokens = self._token_counter.get_string_tokens(text)
+            if len(self._token_counts) >= TOKEN_COUNT_CACHE_SIZE:
+                # cheaper (and safer across threads) than evicting one by one
+                self._token_counts.clear()
+            self._token_counts[text] = num_tokens
+        return num_tokens
+
     def _get_available_context_size(self, num_prompt_tokens: int) -> int:
         """Get available context size.
 
@@ -213,7 +229,7 @@ class PromptHelper(BaseComponent):
             )
         else:
             prompt_str = get_empty_prompt_txt(prompt)
-            num_prompt_tokens = self._token_counter.get_string_tokens(prompt_str)
+            num_prompt_tokens = self._get_token_count(prompt_str)
 
         available_context_size = self._get_available_context_size(num_prompt_tokens)
         result = available_context_size // num_chunks - padding
@@ -234,6 +250,10 @@ class PromptHelper(BaseComponent):
         chunk_size = self._get_available_chunk_size(
             prompt, num_chunks, padding=padding, llm=llm
         )
+        return self._get_text_splitter(chunk_size)
+
+    def _get_text_splitter(self, chunk_size: int) -> TokenTextSplitter:
+        """Get text splitter for a given chunk size."""
         if chunk_size <= 0:
             raise ValueError(f"Chunk size {chunk_size} is not positive.")
         chunk_overlap = int(self.chunk_overlap_ratio * chunk_size)
@@ -272,9 +292,48 @@ class PromptHelper(BaseComponent):
         This will combine text chunks into consolidated chunks
         that more fully "pack" the prompt template given the context_window.
 
+        Chunks are packed whole and in order, greedily, using token counts
+        cached per chunk; only chunks too big on their own are split.
+
         """
-        text_splitter = self.get_text_splitter_given_prompt(
-            prompt, padding=padding, llm=llm
-        )
-        combined_str = "\n\n".join([c.strip() for c in text_chunks if c.strip()])
-        return text_splitter.split_text(combined_str)
+        chunk_size = self._get_available_chunk_size(prompt, padding=padding, llm=llm)
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size {chunk_size} is not positive.")
+        text_splitter: Optional[TokenTextSplitter] = None
+        separator_tokens = self._get_token_count(CHUNK_SEPARATOR)
+
+        packed_chunks: List[str] = []
+        cur_chunks: List[str] = []
+        cur_tokens = 0
+        for text_chunk in text_chunks:
+            text_chunk = text_chunk.strip()
+            if not text_chunk:
+                continue
+            num_tokens = self._get_token_count(text_chunk)
+            if num_tokens <= chunk_size:
+                pieces = [(text_chunk, num_tokens)]
+            else:
+                if text_splitter is None:
+                    text_splitter = self._get_text_splitter(chunk_size)
+                pieces = [
+                    (split, self._get_token_count(split))
+                    for split in text_splitter.split_text(text_chunk)
+                ]
+
+            for piece, piece_tokens in pieces:
+                if (
+                    cur_chunks
+                    and cur_tokens + separator_tokens + piece_tokens > chunk_size
+                ):
+                    packed_chunks.append(CHUNK_SEPARATOR.join(cur_chunks))
+                    cur_chunks = []
+                    cur_tokens = 0
+                if cur_chunks:
+                    cur_tokens += separator_tokens
+                cur_chunks.append(piece)
+                cur_tokens += piece_tokens
+
+        if cur_chunks:
+            packed_chunks.append(CHUNK_SEPARATOR.join(cur_chunks))
+        # like the text splitter, return one empty chunk if there is no text
+        return packed_chunks or [""]
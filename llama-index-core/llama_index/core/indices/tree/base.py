@@ -3,6 +3,7 @@
 from enum import Enum
 from typing import Any, Dict, Optional, Sequence, Union
 
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.base.embeddings.base import BaseEmbedding
 
@@ -60,6 +61,15 @@ class TreeIndex(BaseIndex[IndexGraph]):
         num_children (int): The number of children each node should have.
         build_tree (bool): Whether to build the tree during index construction.
         show_progress (bool): Whether to show progress bars. Defaults to False.
+        num_workers (int): Number of summaries to generate concurrently
+            when building the tree. Defaults to 4.
+        embed_model (Optional[BaseEmbedding]): If set, summaries are embedded
+            while building the tree (one batch per level), and the model is
+            used by the embedding retriever.
+        build_checkpoint_id (Optional[str]): If set, the tree is checkpointed to
+            the docstore under this id after each batch of summaries, so that
+            a failed build over the same nodes resumes from the last completed
+            batch.
 
     """
 
@@ -77,6 +87,9 @@ class TreeIndex(BaseIndex[IndexGraph]):
         build_tree: bool = True,
         use_async: bool = False,
         show_progress: bool = False,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        embed_model: Optional[BaseEmbedding] = None,
+        build_checkpoint_id: Optional[str] = None,
         # deprecated
         service_context: Optional[ServiceContext] = None,
         **kwargs: Any,
@@ -88,6 +101,9 @@ class TreeIndex(BaseIndex[IndexGraph]):
         self.insert_prompt: BasePromptTemplate = insert_prompt or DEFAULT_INSERT_PROMPT
         self.build_tree = build_tree
         self._use_async = use_async
+        self._num_workers = num_workers
+        self._embed_model = embed_model
+        self._build_checkpoint_id = build_checkpoint_id
         self._llm = llm or llm_from_settings_or_context(Settings, service_context)
         super().__init__(
             nodes=nodes,
@@ -123,8 +139,10 @@ class TreeIndex(BaseIndex[IndexGraph]):
         if retriever_mode == TreeRetrieverMode.SELECT_LEAF:
             return TreeSelectLeafRetriever(self, object_map=self._object_map, **kwargs)
         elif retriever_mode == TreeRetrieverMode.SELECT_LEAF_EMBEDDING:
-            embed_model = embed_model or embed_model_from_settings_or_context(
-                Settings, self._service_context
+            embed_model = (
+                embed_model
+                or self._embed_model
+                or embed_model_from_settings_or_context(Settings, self._service_context)
             )
             return TreeSelectLeafEmbeddingRetriever(
                 self, embed_model=embed_model, object_map=self._object_map, **kwargs
@@ -154,6 +172,9 @@ class TreeIndex(BaseIndex[IndexGraph]):
             use_async=self._use_async,
             show_progress=self._show_progress,
             docstore=self._docstore,
+            num_workers=self._num_workers,
+            embed_model=self._embed_model,
+            checkpoint_id=self._build_checkpoint_id,
         )
         return index_builder.build_from_nodes(nodes, build_tree=self.build_tree)
 
@@ -1,5 +1,6 @@
 """Query Tree using embedding similarity between query and node text."""
 
+import heapq
 import logging
 from typing import Any, Dict, List, Optional, Tuple, cast
 
@@ -136,17 +137,12 @@ class TreeSelectLeafEmbeddingRetriever(TreeSelectLeafRetriever):
         """Get the node with the highest similarity to the query."""
         similarities = self._get_query_text_embedding_similarities(query_bundle, nodes)
 
-        selected_nodes: List[BaseNode] = []
-        selected_indices: List[int] = []
-        for node, _ in sorted(
-            zip(nodes, similarities), key=lambda x: x[1], reverse=True
-        ):
-            if len(selected_nodes) < self.child_branch_factor:
-                selected_nodes.append(node)
-                selected_indices.append(nodes.index(node))
-            else:
-                break
-
+        selected_indices = heapq.nlargest(
+            self.child_branch_factor,
+            range(len(nodes)),
+            key=lambda i: similarities[i],
+        )
+        selected_nodes = [nodes[i] for i in selected_indices]
         return selected_nodes, selected_indices
 
     def _select_nodes(
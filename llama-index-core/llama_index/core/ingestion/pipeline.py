@@ -9,7 +9,7 @@ from functools import partial, reduce
 from hashlib import sha256
 from itertools import repeat
 from pathlib import Path
-from typing import Any, Generator, List, Optional, Sequence, Union, cast
+from typing import Any, Generator, List, Optional, Sequence, Set, Union, cast
 
 from fsspec import AbstractFileSystem
 from llama_index_client import (
@@ -586,11 +586,19 @@ class IngestionPipeline(BaseModel):
         self,
         nodes: List[BaseNode],
         store_doc_text: bool = True,
+        deleted_doc_ids: Optional[List[str]] = None,
     ) -> List[BaseNode]:
         """Handle docstore upserts by checking hashes and ids."""
         assert self.docstore is not None
 
-        existing_doc_ids_before = set(self.docstore.get_all_document_hashes().values())
+        existing_doc_ids_before: Set[str] = set()
+        if (
+            self.docstore_strategy == DocstoreStrategy.UPSERTS_AND_DELETE
+            and deleted_doc_ids is None
+        ):
+            existing_doc_ids_before = set(
+                self.docstore.get_all_document_hashes().values()
+            )
         doc_ids_from_nodes = set()
         deduped_nodes_to_run = {}
         for node in nodes:
@@ -615,9 +623,12 @@ class IngestionPipeline(BaseModel):
 
         if self.docstore_strategy == DocstoreStrategy.UPSERTS_AND_DELETE:
             # Identify missing docs and delete them from docstore and vector store
-            doc_ids_to_delete = existing_doc_ids_before - doc_ids_from_nodes
+            if deleted_doc_ids is not None:
+                doc_ids_to_delete = set(deleted_doc_ids) - doc_ids_from_nodes
+            else:
+                doc_ids_to_delete = existing_doc_ids_before - doc_ids_from_nodes
             for ref_doc_id in doc_ids_to_delete:
-                self.docstore.delete_document(ref_doc_id)
+                self.docstore.delete_document(ref_doc_id, raise_error=False)
 
                 if self.vector_store is not None:
                     self.vector_store.delete(ref_doc_id)
@@ -645,6 +656,7 @@ class IngestionPipeline(BaseModel):
         in_place: bool = True,
         store_doc_text: bool = True,
         num_workers: Optional[int] = None,
+        deleted_doc_ids: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> Sequence[BaseNode]:
         """
@@ -663,6 +675,10 @@ class IngestionPipeline(BaseModel):
                 array passed to `run_transformations`. Defaults to True.
             num_workers (Optional[int], optional): The number of parallel processes to use.
                 If set to None, then sequential compute is used. Defaults to None.
+            deleted_doc_ids (Optional[List[str]], optional): Ids of documents known to be deleted.
+                With the upserts_and_delete strategy, only these are deleted, instead of every
+                document missing from the input, so that only changed documents need to be
+                passed. Defaults to None.
 
         Returns:
             Sequence[BaseNode]: The set of transformed Nodes/Documents
@@ -676,7 +692,9 @@ class IngestionPipeline(BaseModel):
                 DocstoreStrategy.UPSERTS_AND_DELETE,
             ):
                 nodes_to_run = self._handle_upserts(
-                    input_nodes, store_doc_text=store_doc_text
+                    input_nodes,
+                    store_doc_text=store_doc_text,
+                    deleted_doc_ids=deleted_doc_ids,
                 )
             elif self.docstore_strategy == DocstoreStrategy.DUPLICATES_ONLY:
                 nodes_to_run = self._handle_duplicates(
@@ -769,13 +787,19 @@ class IngestionPipeline(BaseModel):
         self,
         nodes: List[BaseNode],
         store_doc_text: bool = True,
+        deleted_doc_ids: Optional[List[str]] = None,
     ) -> List[BaseNode]:
         """Handle docstore upserts by checking hashes and ids."""
         assert self.docstore is not None
 
-        existing_doc_ids_before = set(
-            (await self.docstore.aget_all_document_hashes()).values()
-        )
+        existing_doc_ids_before: Set[str] = set()
+        if (
+            self.docstore_strategy == DocstoreStrategy.UPSERTS_AND_DELETE
+            and deleted_doc_ids is None
+        ):
+            existing_doc_ids_before = set(
+                (await self.docstore.aget_all_document_hashes()).values()
+            )
         doc_ids_from_nodes = set()
         deduped_nodes_to_run = {}
         for node in nodes:
@@ -800,9 +824,12 @@ class IngestionPipeline(BaseModel):
 
         if self.docstore_strategy == DocstoreStrategy.UPSERTS_AND_DELETE:
             # Identify missing docs and delete them from docstore and vector store
-            doc_ids_to_delete = existing_doc_ids_before - doc_ids_from_nodes
+            if deleted_doc_ids is not None:
+                doc_ids_to_delete = set(deleted_doc_ids) - doc_ids_from_nodes
+            else:
+                doc_ids_to_delete = existing_doc_ids_before - doc_ids_from_nodes
             for ref_doc_id in doc_ids_to_delete:
-                await self.docstore.adelete_document(ref_doc_id)
+                await self.docstore.adelete_document(ref_doc_id, raise_error=False)
 
                 if self.vector_store is not None:
                     await self.vector_store.adelete(ref_doc_id)
@@ -821,6 +848,7 @@ class IngestionPipeline(BaseModel):
         in_place: bool = True,
         store_doc_text: bool = True,
         num_workers: Optional[int] = None,
+        deleted_doc_ids: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> Sequence[BaseNode]:
         """
@@ -839,6 +867,10 @@ class IngestionPipeline(BaseModel):
                 array passed to `run_transformations`. Defaults to True.
             num_workers (Optional[int], optional): The number of parallel processes to use.
                 If set to None, then sequential compute is used. Defaults to None.
+            deleted_doc_ids (Optional[List[str]], optional): Ids of documents known to be deleted.
+                With the upserts_and_delete strategy, only these are deleted, instead of every
+                document missing from the input, so that only changed documents need to be
+                passed. Defaults to None.
 
         Returns:
             Sequence[BaseNode]: The set of transformed Nodes/Documents
@@ -852,7 +884,9 @@ class IngestionPipeline(BaseModel):
                 DocstoreStrategy.UPSERTS_AND_DELETE,
             ):
                 nodes_to_run = await self._ahandle_upserts(
-                    input_nodes, store_doc_text=store_doc_text
+                    input_nodes,
+                    store_doc_text=store_doc_text,
+                    deleted_doc_ids=deleted_doc_ids,
                 )
             elif self.docstore_strategy == DocstoreStrategy.DUPLICATES_ONLY:
                 nodes_to_run = await self._ahandle_duplicates(
@@ -7,7 +7,10 @@ import threading
 import uuid
 from llama_index.core.bridge.pydantic import BaseModel, Field, PrivateAttr
 from llama_index.core.instrumentation.events import BaseEvent
-from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.event_handlers import (
+    BaseEventHandler,
+    NullEventHandler,
+)
 from llama_index.core.instrumentation.span_handlers import (
     BaseSpanHandler,
     NullSpanHandler,
@@ -30,6 +33,22 @@ class EventDispatcher(Protocol):
         ...
 
 
+def _bind_args(
+    signatures: Dict[bool, inspect.Signature], func: Any, args: Any, kwargs: Any
+) -> inspect.BoundArguments:
+    """Bind call arguments using a cached signature of the spanned function.
+
+    `func` is a bound method when the spanned function is called through an
+    instance, so signatures are cached separately for bound and unbound calls.
+    """
+    is_method = inspect.ismethod(func)
+    signature = signatures.get(is_method)
+    if signature is None:
+        signature = inspect.signature(func)
+        signatures[is_method] = signature
+    return signature.bind(*args, **kwargs)
+
+
 class Dispatcher(BaseModel):
     """Dispatcher class.
 
@@ -123,6 +142,24 @@ class Dispatcher(BaseModel):
     def root(self) -> "Dispatcher":
         return self.manager.dispatchers[self.root_name]
 
+    def _has_handlers(self) -> bool:
+        """Whether any non-null span or event handler will receive signals.
+
+        Spans skip argument binding, id generation and context bookkeeping
+        when this is False, since no handler would see them.
+        """
+        c = self
+        while c:
+            if any(not isinstance(h, NullSpanHandler) for h in c.span_handlers):
+                return True
+            if any(not isinstance(h, NullEventHandler) for h in c.event_handlers):
+                return True
+            if not c.propagate:
+                c = None
+            else:
+                c = c.parent
+        return False
+
     def add_event_handler(self, handler: BaseEventHandler) -> None:
         """Add handler to set of handlers."""
         self.event_handlers += [handler]
@@ -223,8 +260,7 @@ class Dispatcher(BaseModel):
         functions only. Otherwise, the span_id should not be trusted, as the
         span decorator sets the span_id.
         """
-        with self.lock:
-            span_id = self.current_span_id
+        span_id = self.current_span_id
         dispatch_event: EventDispatcher = partial(self.event, span_id=span_id)
         return dispatch_event
 
@@ -255,14 +291,18 @@ class Dispatcher(BaseModel):
         span_ctx_var.set(thread_span_ctx)
 
     def span(self, func):
+        signatures: Dict[bool, inspect.Signature] = {}
+
         @wrapt.decorator
         def wrapper(func, instance, args, kwargs):
-            bound_args = inspect.signature(func).bind(*args, **kwargs)
+            if not self._has_handlers():
+                return func(*args, **kwargs)
+
+            bound_args = _bind_args(signatures, func, args, kwargs)
             id_ = f"{func.__qualname__}-{uuid.uuid4()}"
-            with self.lock:
-                self.set_current_span_id(id_)
-            with self.root.lock:
-                self.root.set_current_span_id(id_)
+            # setting a per-thread key is atomic, so no locks are needed here
+            self.set_current_span_id(id_)
+            self.root.set_current_span_id(id_)
 
             # get parent_id (thread-safe)
             parent_id = self._get_parent_update_span_ctx_var(id_, DEFAULT_SYNC_KEY)
@@ -287,12 +327,13 @@ class Dispatcher(BaseModel):
 
         @wrapt.decorator
         async def async_wrapper(func, instance, args, kwargs):
-            bound_args = inspect.signature(func).bind(*args, **kwargs)
+            if not self._has_handlers():
+                return await func(*args, **kwargs)
+
+            bound_args = _bind_args(signatures, func, args, kwargs)
             id_ = f"{func.__qualname__}-{uuid.uuid4()}"
-            async with self.asyncio_lock:
-                self.set_current_span_id(id_)
-            async with self.root.asyncio_lock:
-                self.root.set_current_span_id(id_)
+            self.set_current_span_id(id_)
+            self.root.set_current_span_id(id_)
 
             # get parent_id (thread and async-task safe)
             # spans are managed in this hieararchy: thread > async task > async coros
@@ -333,14 +374,17 @@ class Dispatcher(BaseModel):
         """
 
         def outer(func):
+            signatures: Dict[bool, inspect.Signature] = {}
+
             @wrapt.decorator
             async def async_wrapper(func, instance, args, kwargs):
-                bound_args = inspect.signature(func).bind(*args, **kwargs)
+                if not self._has_handlers():
+                    return await func(*args, **kwargs)
+
+                bound_args = _bind_args(signatures, func, args, kwargs)
                 id_ = f"{func.__qualname__}-{uuid.uuid4()}"
-                async with self.asyncio_lock:
-                    self.set_current_span_id(id_)
-                async with self.root.asyncio_lock:
-                    self.root.set_current_span_id(id_)
+                self.set_current_span_id(id_)
+                self.root.set_current_span_id(id_)
 
                 # don't need parent_id but need to update span ctx var
                 current_task = asyncio.current_task()
@@ -1,5 +1,6 @@
 from llama_index.core.instrumentation.event_handlers.base import BaseEventHandler
+from llama_index.core.instrumentation.event_handlers.metrics import MetricsEventHandler
 from llama_index.core.instrumentation.event_handlers.null import NullEventHandler
 
 
-__all__ = ["BaseEventHandler", "NullEventHandler"]
+__all__ = ["BaseEventHandler", "MetricsEventHandler", "NullEventHandler"]
@@ -0,0 +1,167 @@
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.instrumentation.event_handlers.base import BaseEventHandler
+from llama_index.core.instrumentation.events.base import BaseEvent
+from llama_index.core.instrumentation.events.embedding import EmbeddingEndEvent
+from llama_index.core.instrumentation.events.llm import (
+    LLMChatEndEvent,
+    LLMChatStartEvent,
+    LLMCompletionEndEvent,
+    LLMCompletionStartEvent,
+)
+from llama_index.core.instrumentation.events.retrieval import RetrievalEndEvent
+from llama_index.core.instrumentation.metrics import MetricsRegistry
+
+EVENTS_METRIC = "llama_index_events_total"
+LLM_DURATION_METRIC = "llama_index_llm_duration_seconds"
+LLM_OUTPUT_TOKENS_METRIC = "llama_index_llm_output_tokens_total"
+LLM_TOKENS_PER_SECOND_METRIC = "llama_index_llm_output_tokens_per_second"
+EMBEDDING_BATCH_SIZE_METRIC = "llama_index_embedding_batch_size"
+RETRIEVED_NODES_METRIC = "llama_index_retrieved_nodes"
+AGENT_STEP_QUEUE_METRIC = "llama_index_agent_step_queue_depth"
+AGENT_STEP_WAIT_METRIC = "llama_index_agent_step_wait_seconds"
+AGENT_STEP_DURATION_METRIC = "llama_index_agent_step_duration_seconds"
+# LLM calls whose end event never arrives are forgotten past this many
+MAX_PENDING_LLM_CALLS = 10000
+
+
+def _get_output_tokens(response: Any) -> Optional[int]:
+    """Get the number of output tokens reported by the LLM provider, if any."""
+    raw = getattr(response, "raw", None)
+    usage = raw.get("usage") if isinstance(raw, dict) else getattr(raw, "usage", None)
+    if isinstance(usage, dict):
+        tokens = usage.get("completion_tokens") or usage.get("output_tokens")
+    else:
+        tokens = getattr(usage, "completion_tokens", None) or getattr(
+            usage, "output_tokens", None
+        )
+    return int(tokens) if tokens is not None else None
+
+
+class MetricsEventHandler(BaseEventHandler):
+    """Event handler that aggregates event metrics into a `MetricsRegistry`.
+
+    Counts events by type, and records:
+    - LLM call durations, output tokens and output tokens per second, from
+      the start and end events of chat and completion calls;
+    - the number of texts per embedding batch;
+    - the number of nodes per retrieval;
+    - the step queue depth, and the wait and run time of steps (by tool), of
+      DAG agent runners.
+
+    Output tokens are taken from the usage reported in the raw LLM response.
+    If the provider does not report it, tokens of the response text are
+    counted with `tokenizer` when set, and not recorded otherwise. Streamed
+    calls are recorded once, when the stream ends.
+    """
+
+    registry: MetricsRegistry = Field(
+        default_factory=MetricsRegistry,
+        description="Registry in which metrics are recorded.",
+        exclude=True,
+    )
+    tokenizer: Optional[Callable[[str], List]] = Field(
+        default=None,
+        description="Tokenizer counting output tokens not reported by the LLM.",
+        exclude=True,
+    )
+    _llm_starts: Dict[str, List[Tuple[datetime, str]]] = PrivateAttr(
+        default_factory=dict
+    )
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, **kwargs: Any):
+        registry = registry or MetricsRegistry()
+        registry.describe(EVENTS_METRIC, "Number of instrumentation events.")
+        registry.describe(LLM_DURATION_METRIC, "Duration of LLM calls in seconds.")
+        registry.describe(LLM_OUTPUT_TOKENS_METRIC, "Number of LLM output tokens.")
+        registry.describe(
+            LLM_TOKENS_PER_SECOND_METRIC, "LLM output tokens per second of a call."
+        )
+        registry.describe(
+            EMBEDDING_BATCH_SIZE_METRIC, "Number of texts per embedding batch."
+        )
+        registry.describe(RETRIEVED_NODES_METRIC, "Number of nodes per retrieval.")
+        registry.describe(
+            AGENT_STEP_QUEUE_METRIC, "Number of agent steps queued, when scheduling."
+        )
+        registry.describe(
+            AGENT_STEP_WAIT_METRIC, "Agent step wait for a concurrency slot."
+        )
+        registry.describe(AGENT_STEP_DURATION_METRIC, "Agent step duration in seconds.")
+        super().__init__(registry=registry, **kwargs)
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Class name."""
+        return "MetricsEventHandler"
+
+    def _llm_started(
+        self, event: Union[LLMChatStartEvent, LLMCompletionStartEvent]
+    ) -> None:
+        model_dict = event.model_dict
+        model = str(model_dict.get("model") or model_dict.get("class_name", ""))
+        with self._lock:
+            starts = self._llm_starts.setdefault(event.span_id, [])
+            starts.append((event.timestamp, model))
+            if len(self._llm_starts) > MAX_PENDING_LLM_CALLS:
+                del self._llm_starts[next(iter(self._llm_starts))]
+
+    def _llm_ended(self, event: BaseEvent, response: Any) -> None:
+        # calls are matched with their start event by span id, oldest first
+        with self._lock:
+            starts = self._llm_starts.get(event.span_id)
+            if not starts:
+                return
+            start_time, model = starts.pop(0)
+            if not starts:
+                del self._llm_starts[event.span_id]
+
+        labels = {"model": model}
+        duration = (event.timestamp - start_time).total_seconds()
+        self.registry.observe(LLM_DURATION_METRIC, duration, labels=labels)
+
+        tokens = _get_output_tokens(response)
+        if tokens is None:
+            if self.tokenizer is None:
+                return
+            text = getattr(response, "text", None)
+            if text is None:
+                text = getattr(getattr(response, "message", None), "content", None)
+            tokens = len(self.tokenizer(text or ""))
+        self.registry.increment(LLM_OUTPUT_TOKENS_METRIC, tokens, labels=labels)
+        if duration > 0:
+            self.registry.observe(
+                LLM_TOKENS_PER_SECOND_METRIC, tokens / duration, labels=labels
+            )
+
+    def handle(self, event: BaseEvent, **kwargs: Any) -> None:
+        """Record metrics for an event."""
+        event_name = event.class_name()
+        self.registry.increment(EVENTS_METRIC, labels={"event": event_name})
+        if isinstance(event, (LLMChatStartEvent, LLMCompletionStartEvent)):
+            self._llm_started(event)
+        elif isinstance(event, LLMChatEndEvent):
+            self._llm_ended(event, event.response)
+        elif isinstance(event, LLMCompletionEndEvent):
+            self._llm_ended(event, event.response)
+        elif isinstance(event, EmbeddingEndEvent):
+            self.registry.observe(EMBEDDING_BATCH_SIZE_METRIC, len(event.chunks))
+        elif isinstance(event, RetrievalEndEvent):
+            self.registry.observe(RETRIEVED_NODES_METRIC, len(event.nodes))
+        # agent events are matched by name, as importing them would be circular
+        elif event_name == "AgentStepQueueEvent":
+            queue_event = cast(Any, event)
+            self.registry.observe(AGENT_STEP_QUEUE_METRIC, queue_event.num_queued)
+        elif event_name == "AgentStepLatencyEvent":
+            latency_event = cast(Any, event)
+            labels = {"tool": latency_event.tool_name or ""}
+            self.registry.observe(
+                AGENT_STEP_WAIT_METRIC, latency_event.wait_time, labels
+            )
+            self.registry.observe(
+                AGENT_STEP_DURATION_METRIC, latency_event.duration, labels
+            )
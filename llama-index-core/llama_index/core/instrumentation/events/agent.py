@@ -1,3 +1,5 @@
+from typing import Optional
+
 from llama_index.core.instrumentation.events.base import BaseEvent
 from llama_index.core.tools.types import ToolMetadata
 
@@ -38,3 +40,31 @@ class AgentToolCallEvent(BaseEvent):
     def class_name(cls):
         """Class name."""
         return "AgentToolCallEvent"
+
+
+class AgentStepQueueEvent(BaseEvent):
+    """Number of queued and running steps, each time a DAG runner schedules."""
+
+    task_id: str
+    num_queued: int
+    num_running: int
+
+    @classmethod
+    def class_name(cls):
+        """Class name."""
+        return "AgentStepQueueEvent"
+
+
+class AgentStepLatencyEvent(BaseEvent):
+    """Seconds a step waited for a concurrency slot, and ran."""
+
+    task_id: str
+    step_id: str
+    tool_name: Optional[str] = None
+    wait_time: float
+    duration: float
+
+    @classmethod
+    def class_name(cls):
+        """Class name."""
+        return "AgentStepLatencyEvent"
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from llama_index.core.base.llms.types import (
     ChatMessage,
@@ -47,6 +47,16 @@ class LLMCompletionStartEvent(BaseEvent):
         return "LLMCompletionStartEvent"
 
 
+class LLMCompletionInProgressEvent(BaseEvent):
+    prompt: str
+    response: CompletionResponse
+
+    @classmethod
+    def class_name(cls):
+        """Class name."""
+        return "LLMCompletionInProgressEvent"
+
+
 class LLMCompletionEndEvent(BaseEvent):
     prompt: str
     response: CompletionResponse
@@ -86,3 +96,22 @@ class LLMChatEndEvent(BaseEvent):
     def class_name(cls):
         """Class name."""
         return "LLMChatEndEvent"
+
+
+class LLMCacheHitEvent(BaseEvent):
+    cache_key: str
+    similarity: Optional[float] = None
+
+    @classmethod
+    def class_name(cls):
+        """Class name."""
+        return "LLMCacheHitEvent"
+
+
+class LLMCacheMissEvent(BaseEvent):
+    cache_key: str
+
+    @classmethod
+    def class_name(cls):
+        """Class name."""
+        return "LLMCacheMissEvent"
@@ -0,0 +1,234 @@
+"""Pre-aggregated metrics for instrumentation handlers.
+
+Metrics are kept in memory as counters and fixed-size streaming histograms, so
+latency percentiles and throughput can be read without exporting every span.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+DEFAULT_LOWEST_VALUE = 1e-6
+DEFAULT_HIGHEST_VALUE = 1e9
+DEFAULT_SUB_BUCKETS = 16
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+
+class StreamingHistogram:
+    """Log-linear histogram with fixed memory, in the style of HdrHistogram.
+
+    Values are counted in buckets: each power of two between `lowest_value`
+    and `highest_value` is split into `sub_buckets` linear buckets, so
+    quantiles are accurate to within a relative error of `1 / sub_buckets`.
+    Values outside the range are clamped into the first or last bucket.
+    """
+
+    def __init__(
+        self,
+        lowest_value: float = DEFAULT_LOWEST_VALUE,
+        highest_value: float = DEFAULT_HIGHEST_VALUE,
+        sub_buckets: int = DEFAULT_SUB_BUCKETS,
+    ) -> None:
+        if lowest_value <= 0 or highest_value <= lowest_value:
+            raise ValueError("Expected 0 < lowest_value < highest_value.")
+        self.lowest_value = lowest_value
+        self.highest_value = highest_value
+        self.sub_buckets = sub_buckets
+        num_powers = math.ceil(math.log2(highest_value / lowest_value)) + 1
+        self.counts = [0] * (num_powers * sub_buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket_index(self, value: float) -> int:
+        if value <= self.lowest_value:
+            return 0
+        # value / lowest_value = mantissa * 2 ** exponent, 0.5 <= mantissa < 1
+        mantissa, exponent = math.frexp(value / self.lowest_value)
+        sub_bucket = int((mantissa * 2 - 1) * self.sub_buckets)
+        index = (exponent - 1) * self.sub_buckets + sub_bucket
+        return min(index, len(self.counts) - 1)
+
+    def _bucket_upper_bound(self, index: int) -> float:
+        exponent, sub_bucket = divmod(index, self.sub_buckets)
+        return (
+            self.lowest_value
+            * 2**exponent
+            * (1 + (sub_bucket + 1) / self.sub_buckets)
+        )
+
+    def record(self, value: float) -> None:
+        """Record a value."""
+        self.counts[self._bucket_index(value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Get the value at quantile `q` (between 0 and 1)."""
+        if self.count == 0:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index == len(self.counts) - 1:
+                    # values above highest_value all land in the last bucket
+                    return self.max
+                # report the bucket bound, but never outside the observed range
+                return max(self.min, min(self._bucket_upper_bound(index), self.max))
+        return self.max
+
+    def snapshot(
+        self, quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Any]:
+        """Get a summary of the recorded values."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "quantiles": {q: self.quantile(q) for q in quantiles},
+        }
+
+
+def _format_labels(labels: LabelsKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in items
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: Optional[float]) -> str:
+    return "NaN" if value is None else repr(float(value))
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and streaming histograms.
+
+    Shared by `MetricsSpanHandler` and `MetricsEventHandler`, and read with
+    `snapshot` or `render_prometheus`.
+    """
+
+    def __init__(
+        self,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        lowest_value: float = DEFAULT_LOWEST_VALUE,
+        highest_value: float = DEFAULT_HIGHEST_VALUE,
+        sub_buckets: int = DEFAULT_SUB_BUCKETS,
+    ) -> None:
+        self.quantiles = tuple(quantiles)
+        self._lowest_value = lowest_value
+        self._highest_value = highest_value
+        self._sub_buckets = sub_buckets
+        self._counters: Dict[str, Dict[LabelsKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelsKey, StreamingHistogram]] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._start_time = time.monotonic()
+
+    def describe(self, name: str, description: str) -> None:
+        """Set the help text of a metric."""
+        self._descriptions[name] = description
+
+    def increment(
+        self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Increment a counter."""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            counters = self._counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0.0) + value
+
+    def observe(
+        self, name: str, value: float, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Record a value in a histogram."""
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            histograms = self._histograms.setdefault(name, {})
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = StreamingHistogram(
+                    self._lowest_value, self._highest_value, self._sub_buckets
+                )
+                histograms[key] = histogram
+            histogram.record(value)
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+            self._start_time = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current value of all metrics.
+
+        Counters also report their average rate per second since the registry
+        was created (or last reset).
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._start_time
+            counters: Dict[str, List[Dict[str, Any]]] = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "value": value,
+                        "rate": value / elapsed if elapsed > 0 else None,
+                    }
+                    for key, value in series.items()
+                ]
+                for name, series in self._counters.items()
+            }
+            histograms: Dict[str, List[Dict[str, Any]]] = {
+                name: [
+                    {"labels": dict(key), **histogram.snapshot(self.quantiles)}
+                    for key, histogram in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        return {
+            "elapsed_seconds": elapsed,
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Counters are rendered as `counter`s and histograms as `summary`s with
+        the configured quantiles.
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in self._descriptions:
+                    lines.append(f"# HELP {name} {self._descriptions[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+            for name, histograms in sorted(self._histograms.items()):
+                if name in self._descriptions:
+                    lines.append(f"# HELP {name} {self._descriptions[name]}")
+                lines.append(f"# TYPE {name} summary")
+                for key, histogram in histograms.items():
+                    for q in self.quantiles:
+                        labels = _format_labels(key, ("quantile", str(q)))
+                        quantile = _format_value(histogram.quantile(q))
+                        lines.append(f"{name}{labels} {quantile}")
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_sum{labels} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{labels} {histogram.count}")
+        return "\n".join(lines) + "\n"
@@ -1,10 +1,12 @@
 from llama_index.core.instrumentation.span_handlers.base import BaseSpanHandler
+from llama_index.core.instrumentation.span_handlers.metrics import MetricsSpanHandler
 from llama_index.core.instrumentation.span_handlers.null import NullSpanHandler
 from llama_index.core.instrumentation.span_handlers.simple import SimpleSpanHandler
 
 
 __all__ = [
     "BaseSpanHandler",
+    "MetricsSpanHandler",
     "NullSpanHandler",
     "SimpleSpanHandler",
 ]
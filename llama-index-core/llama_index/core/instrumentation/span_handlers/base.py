@@ -1,7 +1,7 @@
 import inspect
 import threading
 from abc import abstractmethod
-from typing import Any, Dict, List, Generic, Optional, TypeVar
+from typing import Any, Dict, List, Generic, Optional, Sequence, TypeVar
 
 from llama_index.core.bridge.pydantic import BaseModel, Field, PrivateAttr
 from llama_index.core.instrumentation.span.base import BaseSpan
@@ -13,10 +13,10 @@ class BaseSpanHandler(BaseModel, Generic[T]):
     open_spans: Dict[str, T] = Field(
         default_factory=dict, description="Dictionary of open spans."
     )
-    completed_spans: List[T] = Field(
+    completed_spans: Sequence[T] = Field(
         default_factory=list, description="List of completed spans."
     )
-    dropped_spans: List[T] = Field(
+    dropped_spans: Sequence[T] = Field(
         default_factory=list, description="List of completed spans."
     )
     current_span_ids: Dict[Any, Optional[str]] = Field(
@@ -33,6 +33,7 @@ class BaseSpanHandler(BaseModel, Generic[T]):
         completed_spans: List[T] = [],
         dropped_spans: List[T] = [],
         current_span_ids: Dict[Any, str] = {},
+        **kwargs: Any,
     ):
         self._lock = None
         super().__init__(
@@ -40,6 +41,7 @@ class BaseSpanHandler(BaseModel, Generic[T]):
             completed_spans=completed_spans,
             dropped_spans=dropped_spans,
             current_span_ids=current_span_ids,
+            **kwargs,
         )
 
     def class_name(cls) -> str:
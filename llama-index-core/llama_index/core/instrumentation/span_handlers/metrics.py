@@ -0,0 +1,89 @@
+import inspect
+from datetime import datetime
+from typing import Any, Optional
+
+from llama_index.core.bridge.pydantic import Field
+from llama_index.core.instrumentation.metrics import MetricsRegistry
+from llama_index.core.instrumentation.span.simple import SimpleSpan
+from llama_index.core.instrumentation.span_handlers.base import BaseSpanHandler
+
+SPAN_DURATION_METRIC = "llama_index_span_duration_seconds"
+SPANS_METRIC = "llama_index_spans_total"
+
+
+def get_span_name(id_: str) -> str:
+    """Get the qualname of the spanned function from a span id.
+
+    Span ids are built as `f"{func.__qualname__}-{uuid4()}"`.
+    """
+    parts = id_.rsplit("-", 5)
+    return parts[0] if len(parts) == 6 else id_
+
+
+class MetricsSpanHandler(BaseSpanHandler[SimpleSpan]):
+    """Span handler that aggregates span latencies into a `MetricsRegistry`.
+
+    Durations are recorded in a histogram, and span counts in a counter,
+    labelled by the qualname of the spanned function (e.g.
+    `BaseRetriever.retrieve`). Spans themselves are not kept once exited.
+    """
+
+    registry: MetricsRegistry = Field(
+        default_factory=MetricsRegistry,
+        description="Registry in which metrics are recorded.",
+        exclude=True,
+    )
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, **kwargs: Any):
+        registry = registry or MetricsRegistry()
+        registry.describe(SPAN_DURATION_METRIC, "Duration of spans in seconds.")
+        registry.describe(SPANS_METRIC, "Number of exited or dropped spans.")
+        super().__init__(registry=registry, **kwargs)
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Class name."""
+        return "MetricsSpanHandler"
+
+    def new_span(
+        self,
+        id_: str,
+        bound_args: inspect.BoundArguments,
+        instance: Optional[Any] = None,
+        parent_span_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> SimpleSpan:
+        """Create a span."""
+        return SimpleSpan(id_=id_, parent_id=parent_span_id)
+
+    def _record(self, id_: str, status: str) -> Optional[SimpleSpan]:
+        span = self.open_spans.get(id_)
+        if span is None:
+            return None
+        duration = (datetime.now() - span.start_time).total_seconds()
+        labels = {"span": get_span_name(id_)}
+        self.registry.observe(SPAN_DURATION_METRIC, duration, labels=labels)
+        self.registry.increment(SPANS_METRIC, labels={**labels, "status": status})
+        return span
+
+    def prepare_to_exit_span(
+        self,
+        id_: str,
+        bound_args: inspect.BoundArguments,
+        instance: Optional[Any] = None,
+        result: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Optional[SimpleSpan]:
+        """Record the span as completed."""
+        return self._record(id_, "completed")
+
+    def prepare_to_drop_span(
+        self,
+        id_: str,
+        bound_args: inspect.BoundArguments,
+        instance: Optional[Any] = None,
+        err: Optional[BaseException] = None,
+        **kwargs: Any,
+    ) -> Optional[SimpleSpan]:
+        """Record the span as dropped."""
+        return self._record(id_, "dropped")
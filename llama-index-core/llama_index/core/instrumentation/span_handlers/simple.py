@@ -1,17 +1,86 @@
 import inspect
-from typing import Any, cast, List, Optional, TYPE_CHECKING
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, TYPE_CHECKING
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
 from llama_index.core.instrumentation.span.simple import SimpleSpan
 from llama_index.core.instrumentation.span_handlers.base import BaseSpanHandler
 from datetime import datetime
-from functools import reduce
 import warnings
 
 if TYPE_CHECKING:
     from treelib import Tree
 
+DEFAULT_EXPORT_BATCH_SIZE = 100
+
+
+@dataclass
+class _TraceBuffer:
+    """Spans of a trace that is still in progress."""
+
+    sampled: bool
+    num_open_spans: int = 0
+    completed_spans: List[SimpleSpan] = field(default_factory=list)
+    dropped_spans: List[SimpleSpan] = field(default_factory=list)
+
 
 class SimpleSpanHandler(BaseSpanHandler[SimpleSpan]):
-    """Span Handler that managest SimpleSpan's."""
+    """Span Handler that managest SimpleSpan's.
+
+    Spans are grouped into traces (a root span and all of its descendants),
+    and a trace is recorded once all of its spans have exited. This allows
+    sampling whole traces:
+
+    - head sampling keeps a trace with probability `sample_rate`, decided
+      when its root span is entered; spans of other traces are never created.
+    - tail sampling keeps a finished trace only if `tail_sampler` returns
+      True for its spans (e.g. to keep slow or failed traces).
+
+    Recorded spans are kept in `completed_spans` and `dropped_spans`, each
+    holding at most `capacity` spans, evicting the oldest first. If an
+    `exporter` is set, recorded traces are also handed to it in batches of
+    `export_batch_size` traces. Use `flush` to export a partial batch.
+    """
+
+    completed_spans: Deque[SimpleSpan] = Field(
+        default_factory=deque, description="Completed spans."
+    )
+    dropped_spans: Deque[SimpleSpan] = Field(
+        default_factory=deque, description="Dropped spans."
+    )
+    capacity: Optional[int] = Field(
+        default=None,
+        description=(
+            "Maximum number of completed (and dropped) spans to keep. "
+            "Unbounded if None."
+        ),
+    )
+    sample_rate: float = Field(
+        default=1.0, description="Fraction of traces to record (head sampling)."
+    )
+    tail_sampler: Optional[Callable[[List[SimpleSpan]], bool]] = Field(
+        default=None,
+        description="Decides whether to record a finished trace given its spans.",
+        exclude=True,
+    )
+    exporter: Optional[Callable[[List[List[SimpleSpan]]], None]] = Field(
+        default=None,
+        description="Called with batches of recorded traces.",
+        exclude=True,
+    )
+    export_batch_size: int = Field(
+        default=DEFAULT_EXPORT_BATCH_SIZE,
+        description="Number of traces passed to `exporter` at a time.",
+    )
+    _trace_ids: Dict[str, str] = PrivateAttr(default_factory=dict)
+    _traces: Dict[str, _TraceBuffer] = PrivateAttr(default_factory=dict)
+    _export_queue: List[List[SimpleSpan]] = PrivateAttr(default_factory=list)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.completed_spans = deque(self.completed_spans, maxlen=self.capacity)
+        self.dropped_spans = deque(self.dropped_spans, maxlen=self.capacity)
 
     def class_name(cls) -> str:
         """Class name."""
@@ -24,8 +93,22 @@ class SimpleSpanHandler(BaseSpanHandler[SimpleSpan]):
         instance: Optional[Any] = None,
         parent_span_id: Optional[str] = None,
         **kwargs: Any,
-    ) -> SimpleSpan:
-        """Create a span."""
+    ) -> Optional[SimpleSpan]:
+        """Create a span, unless its trace is not sampled."""
+        with self.lock:
+            trace_id = self._trace_ids.get(parent_span_id) if parent_span_id else None
+            if trace_id is None:
+                # root of a new trace, or parent already exited
+                trace_id = id_
+                self._traces[trace_id] = _TraceBuffer(
+                    sampled=random.random() < self.sample_rate
+                )
+            trace = self._traces[trace_id]
+            trace.num_open_spans += 1
+            self._trace_ids[id_] = trace_id
+
+        if not trace.sampled:
+            return None
         return SimpleSpan(id_=id_, parent_id=parent_span_id)
 
     def prepare_to_exit_span(
@@ -35,14 +118,13 @@ class SimpleSpanHandler(BaseSpanHandler[SimpleSpan]):
         instance: Optional[Any] = None,
         result: Optional[Any] = None,
         **kwargs: Any,
-    ) -> SimpleSpan:
-        """Logic for preparing to drop a span."""
-        span = self.open_spans[id_]
-        span = cast(SimpleSpan, span)
-        span.end_time = datetime.now()
-        span.duration = (span.end_time - span.start_time).total_seconds()
-        with self.lock:
-            self.completed_spans += [span]
+    ) -> Optional[SimpleSpan]:
+        """Logic for preparing to exit a span."""
+        span = self.open_spans.get(id_)
+        if span is not None:
+            span.end_time = datetime.now()
+            span.duration = (span.end_time - span.start_time).total_seconds()
+        self._close_span(id_, span, dropped=False)
         return span
 
     def prepare_to_drop_span(
@@ -52,42 +134,74 @@ class SimpleSpanHandler(BaseSpanHandler[SimpleSpan]):
         instance: Optional[Any] = None,
         err: Optional[BaseException] = None,
         **kwargs: Any,
-    ) -> SimpleSpan:
+    ) -> Optional[SimpleSpan]:
         """Logic for droppping a span."""
-        if id_ in self.open_spans:
-            with self.lock:
-                span = self.open_spans[id_]
-                span.metadata = {"error": str(err)}
-                self.dropped_spans += [span]
-            return span
+        span = self.open_spans.get(id_)
+        if span is not None:
+            span.metadata = {"error": str(err)}
+        self._close_span(id_, span, dropped=True)
+        return span
 
-        return None
+    def _close_span(self, id_: str, span: Optional[SimpleSpan], dropped: bool) -> None:
+        """Add a closed span to its trace, recording the trace once finished."""
+        with self.lock:
+            trace_id = self._trace_ids.pop(id_, None)
+            if trace_id is None:
+                return
+            trace = self._traces[trace_id]
+            trace.num_open_spans -= 1
+            if span is not None:
+                if dropped:
+                    trace.dropped_spans.append(span)
+                else:
+                    trace.completed_spans.append(span)
+            if trace.num_open_spans > 0:
+                return
+            del self._traces[trace_id]
+
+        trace_spans = trace.completed_spans + trace.dropped_spans
+        if not trace.sampled or (
+            self.tail_sampler is not None and not self.tail_sampler(trace_spans)
+        ):
+            return
+
+        batch = None
+        with self.lock:
+            self.completed_spans.extend(trace.completed_spans)
+            self.dropped_spans.extend(trace.dropped_spans)
+            exporter = self.exporter
+            if exporter is not None:
+                self._export_queue.append(trace_spans)
+                if len(self._export_queue) >= self.export_batch_size:
+                    batch = self._export_queue
+                    self._export_queue = []
+        if batch and exporter is not None:
+            exporter(batch)
+
+    def flush(self) -> None:
+        """Pass all recorded traces that have not been exported to `exporter`."""
+        with self.lock:
+            batch = self._export_queue
+            self._export_queue = []
+        if batch and self.exporter is not None:
+            self.exporter(batch)
 
     def _get_parents(self) -> List[SimpleSpan]:
         """Helper method to get all parent/root spans."""
-        all_spans = self.completed_spans + self.dropped_spans
+        all_spans = list(self.completed_spans) + list(self.dropped_spans)
         return [s for s in all_spans if s.parent_id is None]
 
     def _build_tree_by_parent(
-        self, parent: SimpleSpan, acc: List[SimpleSpan], spans: List[SimpleSpan]
+        self, parent: SimpleSpan, children: Dict[str, List[SimpleSpan]]
     ) -> List[SimpleSpan]:
-        """Builds the tree by parent root."""
-        if not spans:
-            return acc
-
-        children = [s for s in spans if s.parent_id == parent.id_]
-        if not children:
-            return acc
-        updated_spans = [s for s in spans if s not in children]
-
-        children_trees = [
-            self._build_tree_by_parent(
-                parent=c, acc=[c], spans=[s for s in updated_spans if c != s]
-            )
-            for c in children
-        ]
-
-        return acc + reduce(lambda x, y: x + y, children_trees)
+        """Builds the tree by parent root, listing parents before children."""
+        acc = []
+        stack = [parent]
+        while stack:
+            span = stack.pop()
+            acc.append(span)
+            stack.extend(reversed(children.get(span.id_, [])))
+        return acc
 
     def _get_trace_trees(self) -> List["Tree"]:
         """Method for getting trace trees."""
@@ -99,43 +213,38 @@ class SimpleSpanHandler(BaseSpanHandler[SimpleSpan]):
                 "`pip install treelib`."
             )
 
-        all_spans = self.completed_spans + self.dropped_spans
+        all_spans = list(self.completed_spans) + list(self.dropped_spans)
+        span_ids = {s.id_ for s in all_spans}
+        parent_ids: Dict[str, Optional[str]] = {}
+        roots: List[SimpleSpan] = []
+        children: Dict[str, List[SimpleSpan]] = {}
         for s in all_spans:
-            if s.parent_id is None:
-                continue
-            if not any(ns.id_ == s.parent_id for ns in all_spans):
-                warnings.warn("Parent with id {span.parent_id} missing from spans")
-                s.parent_id += "-MISSING"
-                all_spans.append(SimpleSpan(id_=s.parent_id, parent_id=None))
-
-        parents = self._get_parents()
-        span_groups = []
-        for p in parents:
-            this_span_group = self._build_tree_by_parent(
-                parent=p, acc=[p], spans=[s for s in all_spans if s != p]
-            )
-            sorted_span_group = sorted(this_span_group, key=lambda x: x.start_time)
-            span_groups.append(sorted_span_group)
+            parent_id = s.parent_id
+            if parent_id is not None and parent_id not in span_ids:
+                warnings.warn(f"Parent with id {parent_id} missing from spans")
+                parent_id += "-MISSING"
+                if parent_id not in span_ids:
+                    span_ids.add(parent_id)
+                    placeholder = SimpleSpan(id_=parent_id, parent_id=None)
+                    parent_ids[placeholder.id_] = None
+                    roots.append(placeholder)
+            parent_ids[s.id_] = parent_id
+            if parent_id is None:
+                roots.append(s)
+            else:
+                children.setdefault(parent_id, []).append(s)
 
         trees = []
-        tree = Tree()
-        for grp in span_groups:
-            for span in grp:
-                if span.parent_id is None:
-                    # complete old tree unless its empty (i.e., start of loop)
-                    if tree.all_nodes():
-                        trees.append(tree)
-                        # start new tree
-                        tree = Tree()
-
+        for root in roots:
+            tree = Tree()
+            for span in self._build_tree_by_parent(root, children):
                 tree.create_node(
                     tag=f"{span.id_} ({span.duration})",
                     identifier=span.id_,
-                    parent=span.parent_id,
+                    parent=parent_ids[span.id_],
                     data=span.start_time,
                 )
-
-        trees.append(tree)
+            trees.append(tree)
         return trees
 
     def print_trace_trees(self) -> None:
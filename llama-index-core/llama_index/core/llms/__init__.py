@@ -9,6 +9,7 @@ from llama_index.core.base.llms.types import (
     LLMMetadata,
     MessageRole,
 )
+from llama_index.core.llms.cache import LLMCache
 from llama_index.core.llms.custom import CustomLLM
 from llama_index.core.llms.llm import LLM
 from llama_index.core.llms.mock import MockLLM
@@ -16,6 +17,7 @@ from llama_index.core.llms.mock import MockLLM
 __all__ = [
     "CustomLLM",
     "LLM",
+    "LLMCache",
     "ChatMessage",
     "ChatResponse",
     "ChatResponseAsyncGen",
@@ -0,0 +1,563 @@
+"""Cache of LLM responses.
+
+Responses of `chat`, `complete` and their async and streaming variants are
+stored in a key-value store, keyed by a hash of the model, its parameters and
+the call arguments (messages or prompt, and keyword arguments such as tools).
+Streamed responses are recorded delta by delta, and replayed as a stream.
+
+With an embedding model, the cache also works in semantic mode: a call that
+misses the exact key reuses the response of a previous call with the same
+model, parameters and chat history, whose last message (or prompt) has an
+embedding similar enough to the new one.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    ChatResponseAsyncGen,
+    ChatResponseGen,
+    CompletionResponse,
+    CompletionResponseAsyncGen,
+    CompletionResponseGen,
+)
+from llama_index.core.bridge.pydantic import BaseModel
+from llama_index.core.instrumentation import get_dispatcher
+from llama_index.core.instrumentation.events.llm import (
+    LLMCacheHitEvent,
+    LLMCacheMissEvent,
+)
+from llama_index.core.storage.kvstore.simple_kvstore import SimpleKVStore
+from llama_index.core.storage.kvstore.types import BaseKVStore
+
+if TYPE_CHECKING:
+    from llama_index.core.base.embeddings.base import BaseEmbedding
+
+dispatcher = get_dispatcher(__name__)
+
+DEFAULT_CACHE_COLLECTION = "llm_cache"
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+
+# fields of LLMs which do not change their responses
+DEFAULT_IGNORED_FIELDS = (
+    "api_key",
+    "api_base",
+    "api_version",
+    "timeout",
+    "max_retries",
+    "reuse_client",
+    "callback_manager",
+)
+
+CHAT_ENDPOINT = "chat"
+COMPLETE_ENDPOINT = "complete"
+
+Response = Union[ChatResponse, CompletionResponse]
+
+
+def _normalize(value: Any) -> Any:
+    """Convert a value to plain JSON types, with a stable order."""
+    if isinstance(value, BaseModel):
+        value = value.dict()
+    elif hasattr(value, "model_dump"):
+        # pydantic v2 objects, e.g. tool calls of some clients
+        value = value.model_dump()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {
+            str(key): _normalize(val)
+            for key, val in sorted(value.items(), key=lambda item: str(item[0]))
+            if val is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(val) for val in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # NOTE: the repr of arbitrary objects may not be stable across runs, which
+    # only causes cache misses
+    return repr(value)
+
+
+def _is_plain_json(value: Any) -> bool:
+    """Whether a value only holds JSON types, so it is cached as is."""
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and _is_plain_json(val) for key, val in value.items()
+        )
+    if isinstance(value, list):
+        return all(_is_plain_json(val) for val in value)
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _is_cacheable(response: Response) -> bool:
+    """Whether a response is restored as it was from its cached dict.
+
+    Objects of clients in `additional_kwargs` (e.g. tool calls) would be
+    restored as dicts, which the LLM could no longer read.
+    """
+    additional_kwargs = [response.additional_kwargs]
+    if isinstance(response, ChatResponse):
+        additional_kwargs.append(response.message.additional_kwargs)
+    return all(_is_plain_json(kwargs) for kwargs in additional_kwargs)
+
+
+def _hash(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+@dataclass
+class _CacheRequest:
+    """Keys of a call in the cache."""
+
+    key: str
+    scope: str
+    query: str
+    embedding: Optional[List[float]] = None
+    similarity: Optional[float] = None
+
+
+class LLMCache:
+    """Cache of LLM responses, backed by a key-value store.
+
+    Set it as the `cache` of an LLM to use it:
+
+    ```python
+    llm = OpenAI()
+    llm.cache = LLMCache(ttl=3600)
+    ```
+
+    Args:
+        kvstore (Optional[BaseKVStore]): Store of the responses. Defaults to an
+            in-memory `SimpleKVStore`.
+        collection (str): Collection of the store to use.
+        ttl (Optional[float]): Seconds after which responses expire. Responses
+            never expire if None.
+        max_entries (Optional[int]): Maximum number of responses kept, least
+            recently used ones being evicted first. Unbounded if None.
+        embed_model (Optional[BaseEmbedding]): Embedding model of the last
+            message (or prompt) of calls, for the semantic mode. The semantic
+            mode is disabled if None.
+        similarity_threshold (float): Minimum cosine similarity for a cached
+            response to be reused in semantic mode.
+        ignored_fields (Sequence[str]): Fields of LLMs left out of the keys,
+            as they do not change responses.
+
+    Raw responses of the underlying clients are not cached, and responses
+    whose `additional_kwargs` hold objects of the clients (e.g. tool calls)
+    are not cached at all. Since functions
+    are not serialized, LLMs that only differ by their `messages_to_prompt`
+    or `completion_to_prompt` functions share cached responses.
+    """
+
+    def __init__(
+        self,
+        kvstore: Optional[BaseKVStore] = None,
+        collection: str = DEFAULT_CACHE_COLLECTION,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+        embed_model: Optional["BaseEmbedding"] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        ignored_fields: Sequence[str] = DEFAULT_IGNORED_FIELDS,
+    ) -> None:
+        self.kvstore = kvstore or SimpleKVStore()
+        self.collection = collection
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.embed_model = embed_model
+        self.similarity_threshold = similarity_threshold
+        self.ignored_fields = set(ignored_fields)
+
+        self._lock = threading.Lock()
+        # keys of the cached responses and their scope, least recently used first
+        self._keys: Optional["OrderedDict[str, Optional[str]]"] = None
+        # query embeddings of the cached responses, by scope
+        self._embeddings: Dict[str, Dict[str, List[float]]] = {}
+
+    @classmethod
+    def __modify_schema__(cls, schema: Dict[str, Any]) -> None:
+        """Avoids serialization errors."""
+        schema.update(type="object", default={})
+
+    # -- Keys --
+
+    def _get_request(
+        self, llm: Any, endpoint: str, args: Sequence[Any], kwargs: Dict[str, Any]
+    ) -> _CacheRequest:
+        model_dict = {
+            key: val
+            for key, val in llm.to_dict().items()
+            if key not in self.ignored_fields
+        }
+        inputs, *other_args = args
+        last_input: Any
+        if endpoint == CHAT_ENDPOINT:
+            messages: Sequence[ChatMessage] = inputs
+            history = list(messages[:-1])
+            last_input = messages[-1] if messages else None
+            query = (last_input.content or "") if last_input else ""
+        else:
+            history = []
+            query = str(inputs)
+            last_input = query
+
+        scope = _hash(
+            _normalize(
+                {
+                    "model": model_dict,
+                    "endpoint": endpoint,
+                    "args": other_args,
+                    "kwargs": kwargs,
+                    "history": history,
+                }
+            )
+        )
+        key = _hash([scope, _normalize(last_input)])
+        return _CacheRequest(key=key, scope=scope, query=query)
+
+    # -- Index --
+
+    def _index_entries(self, entries: Dict[str, dict]) -> List[str]:
+        """Index the cached responses, oldest first, returning the keys to evict.
+
+        Must be called with the lock held.
+        """
+        self._keys = OrderedDict()
+        self._embeddings = {}
+        evicted = []
+        for key, entry in sorted(
+            entries.items(), key=lambda item: item[1].get("created_at", 0)
+        ):
+            evicted.extend(self._add_key(key, entry))
+        return evicted
+
+    def _add_key(self, key: str, entry: dict) -> List[str]:
+        """Index a response, returning the keys to evict.
+
+        Must be called with the lock held.
+        """
+        assert self._keys is not None
+        scope = entry.get("scope")
+        self._keys[key] = scope
+        self._keys.move_to_end(key)
+        if scope is not None and entry.get("embedding") is not None:
+            self._embeddings.setdefault(scope, {})[key] = entry["embedding"]
+
+        evicted = []
+        while self.max_entries is not None and len(self._keys) > self.max_entries:
+            evicted_key = next(iter(self._keys))
+            self._remove_key(evicted_key)
+            evicted.append(evicted_key)
+        return evicted
+
+    def _remove_key(self, key: str) -> None:
+        """Remove a response from the index.
+
+        Must be called with the lock held.
+        """
+        assert self._keys is not None
+        scope = self._keys.pop(key, None)
+        if scope is not None and scope in self._embeddings:
+            self._embeddings[scope].pop(key, None)
+            if not self._embeddings[scope]:
+                del self._embeddings[scope]
+
+    def _ensure_index(self) -> None:
+        if self._keys is None:
+            entries = self.kvstore.get_all(collection=self.collection)
+            with self._lock:
+                evicted = self._index_entries(entries) if self._keys is None else []
+            for key in evicted:
+                self.kvstore.delete(key, self.collection)
+
+    async def _aensure_index(self) -> None:
+        if self._keys is None:
+            entries = await self.kvstore.aget_all(collection=self.collection)
+            with self._lock:
+                evicted = self._index_entries(entries) if self._keys is None else []
+            for key in evicted:
+                await self.kvstore.adelete(key, self.collection)
+
+    def _find_similar(self, request: _CacheRequest) -> Optional[str]:
+        """Find the key of the response with the most similar query."""
+        assert request.embedding is not None
+        with self._lock:
+            candidates = dict(self._embeddings.get(request.scope, {}))
+        if not candidates:
+            return None
+
+        keys = list(candidates)
+        matrix = np.array([candidates[key] for key in keys])
+        query = np.array(request.embedding)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        similarities = matrix @ query / np.where(norms == 0, 1, norms)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        request.similarity = float(similarities[best])
+        return keys[best]
+
+    def _is_expired(self, entry: dict) -> bool:
+        return self.ttl is not None and time.time() - entry["created_at"] > self.ttl
+
+    def _check_entry(self, key: str, entry: Optional[dict]) -> Optional[dict]:
+        """Drop a response from the index if it is missing.
+
+        Returns the response if it can be used.
+        """
+        with self._lock:
+            if entry is None:
+                self._remove_key(key)
+                return None
+            if self._keys is not None and key in self._keys:
+                self._keys.move_to_end(key)
+        return entry
+
+    def _get_entry(self, key: str) -> Optional[dict]:
+        entry = self.kvstore.get(key, self.collection)
+        if entry is not None and self._is_expired(entry):
+            self.kvstore.delete(key, self.collection)
+            entry = None
+        return self._check_entry(key, entry)
+
+    async def _aget_entry(self, key: str) -> Optional[dict]:
+        entry = await self.kvstore.aget(key, self.collection)
+        if entry is not None and self._is_expired(entry):
+            await self.kvstore.adelete(key, self.collection)
+            entry = None
+        return self._check_entry(key, entry)
+
+    def _dispatch(self, request: _CacheRequest, entry: Optional[dict]) -> None:
+        span_id = dispatcher.root.current_span_id or ""
+        if entry is None:
+            dispatcher.event(LLMCacheMissEvent(cache_key=request.key, span_id=span_id))
+        else:
+            dispatcher.event(
+                LLMCacheHitEvent(
+                    cache_key=request.key,
+                    similarity=request.similarity,
+                    span_id=span_id,
+                )
+            )
+
+    # -- Lookups --
+
+    def _lookup(self, request: _CacheRequest) -> Optional[dict]:
+        self._ensure_index()
+        entry = self._get_entry(request.key)
+        if entry is None and self.embed_model is not None and request.query:
+            request.embedding = self.embed_model.get_query_embedding(request.query)
+            similar_key = self._find_similar(request)
+            if similar_key is not None:
+                entry = self._get_entry(similar_key)
+
+        self._dispatch(request, entry)
+        return entry
+
+    async def _alookup(self, request: _CacheRequest) -> Optional[dict]:
+        await self._aensure_index()
+        entry = await self._aget_entry(request.key)
+        if entry is None and self.embed_model is not None and request.query:
+            request.embedding = await self.embed_model.aget_query_embedding(
+                request.query
+            )
+            similar_key = self._find_similar(request)
+            if similar_key is not None:
+                entry = await self._aget_entry(similar_key)
+
+        self._dispatch(request, entry)
+        return entry
+
+    def _make_entry(
+        self, request: _CacheRequest, response: Response, deltas: Optional[List[str]]
+    ) -> Tuple[dict, List[str]]:
+        entry = {
+            "response": response.dict(exclude={"raw"}),
+            "deltas": deltas,
+            "created_at": time.time(),
+            "scope": request.scope,
+            "embedding": request.embedding,
+        }
+        with self._lock:
+            evicted = self._add_key(request.key, entry)
+        return entry, evicted
+
+    def _store(
+        self, request: _CacheRequest, response: Response, deltas: Optional[List[str]]
+    ) -> None:
+        if not _is_cacheable(response):
+            return
+        if self.embed_model is not None and request.embedding is None and request.query:
+            request.embedding = self.embed_model.get_query_embedding(request.query)
+        entry, evicted = self._make_entry(request, response, deltas)
+        self.kvstore.put(request.key, entry, self.collection)
+        for key in evicted:
+            self.kvstore.delete(key, self.collection)
+
+    async def _astore(
+        self, request: _CacheRequest, response: Response, deltas: Optional[List[str]]
+    ) -> None:
+        if not _is_cacheable(response):
+            return
+        if self.embed_model is not None and request.embedding is None and request.query:
+            request.embedding = await self.embed_model.aget_query_embedding(
+                request.query
+            )
+        entry, evicted = self._make_entry(request, response, deltas)
+        await self.kvstore.aput(request.key, entry, self.collection)
+        for key in evicted:
+            await self.kvstore.adelete(key, self.collection)
+
+    def clear(self) -> None:
+        """Delete all cached responses."""
+        for key in self.kvstore.get_all(collection=self.collection):
+            self.kvstore.delete(key, self.collection)
+        with self._lock:
+            self._keys = OrderedDict()
+            self._embeddings = {}
+
+    # -- Responses --
+
+    def _get_response(self, endpoint: str, entry: dict) -> Response:
+        response_cls = ChatResponse if endpoint == CHAT_ENDPOINT else CompletionResponse
+        return response_cls.parse_obj(entry["response"])
+
+    def _get_responses(self, endpoint: str, entry: dict) -> List[Response]:
+        """Get the responses to replay for a cached entry, as a stream."""
+        final = self._get_response(endpoint, entry)
+        deltas = entry.get("deltas")
+        if deltas is None:
+            # cached from a call without streaming, replayed as a single delta
+            if isinstance(final, ChatResponse):
+                deltas = [final.message.content or ""]
+            else:
+                deltas = [final.text]
+
+        responses: List[Response] = []
+        text = ""
+        for delta in deltas[:-1]:
+            text += delta
+            if isinstance(final, ChatResponse):
+                message = ChatMessage(role=final.message.role, content=text)
+                responses.append(ChatResponse(message=message, delta=delta))
+            else:
+                responses.append(CompletionResponse(text=text, delta=delta))
+        responses.append(final.copy(update={"delta": deltas[-1]}))
+        return responses
+
+    def _replay(
+        self, endpoint: str, entry: dict
+    ) -> Union[ChatResponseGen, CompletionResponseGen]:
+        def gen() -> Generator[Any, None, None]:
+            yield from self._get_responses(endpoint, entry)
+
+        return gen()
+
+    def _areplay(
+        self, endpoint: str, entry: dict
+    ) -> Union[ChatResponseAsyncGen, CompletionResponseAsyncGen]:
+        async def gen() -> AsyncGenerator[Any, None]:
+            for response in self._get_responses(endpoint, entry):
+                yield response
+
+        return gen()
+
+    def _record(
+        self, request: _CacheRequest, gen: Generator[Any, None, None]
+    ) -> Generator[Any, None, None]:
+        """Yield a stream of responses, caching it once fully consumed."""
+        deltas: List[str] = []
+        last_response = None
+        for response in gen:
+            deltas.append(response.delta or "")
+            last_response = response
+            yield response
+        if last_response is not None:
+            self._store(request, last_response, deltas)
+
+    async def _arecord(
+        self, request: _CacheRequest, gen: AsyncGenerator[Any, None]
+    ) -> AsyncGenerator[Any, None]:
+        """Yield a stream of responses, caching it once fully consumed."""
+        deltas: List[str] = []
+        last_response = None
+        async for response in gen:
+            deltas.append(response.delta or "")
+            last_response = response
+            yield response
+        if last_response is not None:
+            await self._astore(request, last_response, deltas)
+
+    # -- Calls --
+
+    def call(
+        self,
+        llm: Any,
+        f: Callable,
+        endpoint: str,
+        args: Sequence[Any],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """Call an LLM endpoint `f`, going through the cache.
+
+        Used by `llm_chat_callback` and `llm_completion_callback`.
+        """
+        request = self._get_request(llm, endpoint, args, kwargs)
+        is_stream = "stream" in f.__name__
+        entry = self._lookup(request)
+        if entry is not None:
+            if is_stream:
+                return self._replay(endpoint, entry)
+            return self._get_response(endpoint, entry)
+
+        response = f(llm, *args, **kwargs)
+        if isinstance(response, Generator):
+            return self._record(request, response)
+        self._store(request, response, None)
+        return response
+
+    async def acall(
+        self,
+        llm: Any,
+        f: Callable,
+        endpoint: str,
+        args: Sequence[Any],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """Call an async LLM endpoint `f`, going through the cache."""
+        request = self._get_request(llm, endpoint, args, kwargs)
+        is_stream = "stream" in f.__name__
+        entry = await self._alookup(request)
+        if entry is not None:
+            if is_stream:
+                return self._areplay(endpoint, entry)
+            return self._get_response(endpoint, entry)
+
+        response = await f(llm, *args, **kwargs)
+        if isinstance(response, AsyncGenerator):
+            return self._arecord(request, response)
+        await self._astore(request, response, None)
+        return response
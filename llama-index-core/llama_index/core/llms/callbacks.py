@@ -19,11 +19,13 @@ from llama_index.core.base.llms.types import (
     CompletionResponseGen,
 )
 from llama_index.core.callbacks import CallbackManager, CBEventType, EventPayload
+from llama_index.core.llms.cache import CHAT_ENDPOINT, COMPLETE_ENDPOINT
 
 # dispatcher setup
 from llama_index.core.instrumentation import get_dispatcher
 from llama_index.core.instrumentation.events.llm import (
     LLMCompletionEndEvent,
+    LLMCompletionInProgressEvent,
     LLMCompletionStartEvent,
     LLMChatEndEvent,
     LLMChatStartEvent,
@@ -68,7 +70,13 @@ def llm_chat_callback() -> Callable:
                     },
                 )
 
-                f_return_val = await f(_self, messages, **kwargs)
+                cache = getattr(_self, "cache", None)
+                if cache is not None:
+                    f_return_val = await cache.acall(
+                        _self, f, CHAT_ENDPOINT, (messages,), kwargs
+                    )
+                else:
+                    f_return_val = await f(_self, messages, **kwargs)
                 if isinstance(f_return_val, AsyncGenerator):
                     # intercept the generator and add a callback to the end
                     async def wrapped_gen() -> ChatResponseAsyncGen:
@@ -141,7 +149,13 @@ def llm_chat_callback() -> Callable:
                         EventPayload.SERIALIZED: _self.to_dict(),
                     },
                 )
-                f_return_val = f(_self, messages, **kwargs)
+                cache = getattr(_self, "cache", None)
+                if cache is not None:
+                    f_return_val = cache.call(
+                        _self, f, CHAT_ENDPOINT, (messages,), kwargs
+                    )
+                else:
+                    f_return_val = f(_self, messages, **kwargs)
 
                 if isinstance(f_return_val, Generator):
                     # intercept the generator and add a callback to the end
@@ -254,7 +268,13 @@ def llm_completion_callback() -> Callable:
                     },
                 )
 
-                f_return_val = await f(_self, *args, **kwargs)
+                cache = getattr(_self, "cache", None)
+                if cache is not None:
+                    f_return_val = await cache.acall(
+                        _self, f, COMPLETE_ENDPOINT, args, kwargs
+                    )
+                else:
+                    f_return_val = await f(_self, *args, **kwargs)
 
                 if isinstance(f_return_val, AsyncGenerator):
                     # intercept the generator and add a callback to the end
@@ -262,7 +282,7 @@ def llm_completion_callback() -> Callable:
                         last_response = None
                         async for x in f_return_val:
                             dispatcher.event(
-                                LLMCompletionEndEvent(
+                                LLMCompletionInProgressEvent(
                                     prompt=str(args[0]),
                                     response=x,
                                     span_id=span_id,
@@ -279,6 +299,14 @@ def llm_completion_callback() -> Callable:
                             },
                             event_id=event_id,
                         )
+                        if last_response is not None:
+                            dispatcher.event(
+                                LLMCompletionEndEvent(
+                                    prompt=str(args[0]),
+                                    response=last_response,
+                                    span_id=span_id,
+                                )
+                            )
 
                     return wrapped_gen()
                 else:
@@ -320,14 +348,18 @@ def llm_completion_callback() -> Callable:
                     },
                 )
 
-                f_return_val = f(_self, *args, **kwargs)
+                cache = getattr(_self, "cache", None)
+                if cache is not None:
+                    f_return_val = cache.call(_self, f, COMPLETE_ENDPOINT, args, kwargs)
+                else:
+                    f_return_val = f(_self, *args, **kwargs)
                 if isinstance(f_return_val, Generator):
                     # intercept the generator and add a callback to the end
                     def wrapped_gen() -> CompletionResponseGen:
                         last_response = None
                         for x in f_return_val:
                             dispatcher.event(
-                                LLMCompletionEndEvent(
+                                LLMCompletionInProgressEvent(
                                     prompt=str(args[0]), response=x, span_id=span_id
                                 )
                             )
@@ -342,6 +374,14 @@ def llm_completion_callback() -> Callable:
                             },
                             event_id=event_id,
                         )
+                        if last_response is not None:
+                            dispatcher.event(
+                                LLMCompletionEndEvent(
+                                    prompt=str(args[0]),
+                                    response=last_response,
+                                    span_id=span_id,
+                                )
+                            )
 
                     return wrapped_gen()
                 else:
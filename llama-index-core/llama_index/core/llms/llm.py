@@ -36,6 +36,7 @@ from llama_index.core.bridge.pydantic import (
 )
 from llama_index.core.callbacks import CBEventType, EventPayload
 from llama_index.core.base.llms.base import BaseLLM
+from llama_index.core.llms.cache import LLMCache
 from llama_index.core.base.llms.generic_utils import (
     messages_to_prompt as generic_messages_to_prompt,
 )
@@ -157,6 +158,8 @@ class LLM(BaseLLM):
             Output parser to parse, validate, and correct errors programmatically.
         pydantic_program_mode (PydanticProgramMode):
             Pydantic program mode to use for structured prediction.
+        cache (Optional[LLMCache]):
+            Cache of the responses of the LLM.
     """
 
     system_prompt: Optional[str] = Field(
@@ -178,6 +181,11 @@ class LLM(BaseLLM):
         exclude=True,
     )
     pydantic_program_mode: PydanticProgramMode = PydanticProgramMode.DEFAULT
+    cache: Optional[LLMCache] = Field(
+        description="Cache of the responses of the LLM.",
+        default=None,
+        exclude=True,
+    )
 
     # deprecated
     query_wrapper_prompt: Optional[BasePromptTemplate] = Field(
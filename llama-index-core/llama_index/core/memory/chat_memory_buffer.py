@@ -2,7 +2,7 @@ import json
 from typing import Any, Callable, Dict, List, Optional
 
 from llama_index.core.base.llms.types import ChatMessage, MessageRole
-from llama_index.core.bridge.pydantic import Field, root_validator
+from llama_index.core.bridge.pydantic import Field, PrivateAttr, root_validator
 from llama_index.core.llms.llm import LLM
 from llama_index.core.memory.types import DEFAULT_CHAT_STORE_KEY, BaseMemory
 from llama_index.core.storage.chat_store import BaseChatStore, SimpleChatStore
@@ -10,6 +10,8 @@ from llama_index.core.utils import get_tokenizer
 
 DEFAULT_TOKEN_LIMIT_RATIO = 0.75
 DEFAULT_TOKEN_LIMIT = 3000
+# number of message contents whose token count is cached
+TOKEN_COUNT_CACHE_SIZE = 10000
 
 
 class ChatMemoryBuffer(BaseMemory):
@@ -24,6 +26,8 @@ class ChatMemoryBuffer(BaseMemory):
     chat_store: BaseChatStore = Field(default_factory=SimpleChatStore)
     chat_store_key: str = Field(default=DEFAULT_CHAT_STORE_KEY)
 
+    _token_counts: Dict[str, int] = PrivateAttr(default_factory=dict)
+
     @classmethod
     def class_name(cls) -> str:
         """Get class name."""
@@ -108,34 +112,35 @@ class ChatMemoryBuffer(BaseMemory):
         if initial_token_count > self.token_limit:
             raise ValueError("Initial token count exceeds token limit")
 
-        message_count = len(chat_history)
-
-        cur_messages = chat_history[-message_count:]
-        token_count = self._token_count_for_messages(cur_messages) + initial_token_count
-
-        while token_count > self.token_limit and message_count > 1:
-            message_count -= 1
-            if chat_history[-message_count].role == MessageRole.TOOL:
-                # all tool messages should be preceded by an assistant message
-                # if we remove a tool message, we need to remove the assistant message too
-                message_count -= 1
-
-            if chat_history[-message_count].role == MessageRole.ASSISTANT:
-                # we cannot have an assistant message at the start of the chat history
-                # if after removal of the first, we have an assistant message,
-                # we need to remove the assistant message too
-                message_count -= 1
-
-            cur_messages = chat_history[-message_count:]
-            token_count = (
-                self._token_count_for_messages(cur_messages) + initial_token_count
-            )
-
-        # catch one message longer than token limit
-        if token_count > self.token_limit or message_count <= 0:
-            return []
-
-        return chat_history[-message_count:]
+        start = self._get_start_index(chat_history, initial_token_count)
+        return chat_history[start:]
+
+    def _get_start_index(
+        self, chat_history: List[ChatMessage], initial_token_count: int = 0
+    ) -> int:
+        """Get the index of the oldest message that fits in the token limit.
+
+        Messages are counted from the newest backward, in a single pass over
+        cached per-message token counts. Messages before the returned index
+        are dropped from the history (or, e.g., summarized by a subclass).
+        """
+        token_count = initial_token_count
+        start = len(chat_history)
+        for num_tokens in reversed(self._token_counts_for_messages(chat_history)):
+            if token_count + num_tokens > self.token_limit:
+                break
+            token_count += num_tokens
+            start -= 1
+
+        if start > 0:
+            # all tool messages should be preceded by an assistant message, and
+            # we cannot have an assistant message at the start of the chat history
+            while start < len(chat_history) and chat_history[start].role in (
+                MessageRole.TOOL,
+                MessageRole.ASSISTANT,
+            ):
+                start += 1
+        return start
 
     def get_all(self) -> List[ChatMessage]:
         """Get all chat history."""
@@ -154,9 +159,19 @@ class ChatMemoryBuffer(BaseMemory):
         """Reset chat history."""
         self.chat_store.delete_messages(self.chat_store_key)
 
-    def _token_count_for_messages(self, messages: List[ChatMessage]) -> int:
-        if len(messages) <= 0:
-            return 0
+    def _token_count_for_message(self, message: ChatMessage) -> int:
+        """Get the number of tokens in a message, cached by content."""
+        content = str(message.content)
+        num_tokens = self._token_counts.get(content)
+        if num_tokens is None:
+            num_tokens = len(self.tokenizer_fn(content))
+            if len(self._token_counts) >= TOKEN_COUNT_CACHE_SIZE:
+                self._token_counts.clear()
+            self._token_counts[content] = num_tokens
+        return num_tokens
 
-        msg_str = " ".join(str(m.content) for m in messages)
-        return len(self.tokenizer_fn(msg_str))
+    def _token_counts_for_messages(self, messages: List[ChatMessage]) -> List[int]:
+        return [self._token_count_for_message(m) for m in messages]
+
+    def _token_count_for_messages(self, messages: List[ChatMessage]) -> int:
+        return sum(self._token_counts_for_messages(messages))
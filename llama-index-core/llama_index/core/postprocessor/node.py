@@ -1,7 +1,7 @@
 """Node postprocessor."""
 
 import logging
-from typing import Dict, List, Optional, cast
+from typing import Dict, List, Optional, Set, Tuple, cast
 
 from llama_index.core.bridge.pydantic import Field, validator
 from llama_index.core.postprocessor.types import BaseNodePostprocessor
@@ -10,7 +10,12 @@ from llama_index.core.response_synthesizers import (
     ResponseMode,
     get_response_synthesizer,
 )
-from llama_index.core.schema import NodeRelationship, NodeWithScore, QueryBundle
+from llama_index.core.schema import (
+    BaseNode,
+    NodeRelationship,
+    NodeWithScore,
+    QueryBundle,
+)
 from llama_index.core.service_context import ServiceContext
 from llama_index.core.storage.docstore import BaseDocumentStore
 
@@ -94,50 +99,139 @@ class SimilarityPostprocessor(BaseNodePostprocessor):
         return new_nodes
 
 
-def get_forward_nodes(
-    node_with_score: NodeWithScore, num_nodes: int, docstore: BaseDocumentStore
+def _get_neighbor_id(node: BaseNode, relationship: NodeRelationship) -> Optional[str]:
+    """Get the id of the neighbor of a node in the given direction."""
+    if relationship == NodeRelationship.NEXT:
+        related_node_info = node.next_node
+    elif relationship == NodeRelationship.PREVIOUS:
+        related_node_info = node.prev_node
+    else:
+        raise ValueError(f"Invalid relationship: {relationship}")
+    return related_node_info.node_id if related_node_info is not None else None
+
+
+def _expand_neighbor_frontier(
+    frontier: List[Tuple[str, NodeRelationship]],
+    visited: Set[Tuple[str, NodeRelationship]],
+    fetched: Dict[str, BaseNode],
+) -> Tuple[List[Tuple[str, NodeRelationship]], List[str]]:
+    """Advance every walk in the frontier by one step.
+
+    Walks that reach a node already visited in the same direction are dropped,
+    since the earlier walk covers everything this one would still fetch.
+
+    Returns the next frontier and the node ids that still need to be fetched.
+    """
+    next_frontier: List[Tuple[str, NodeRelationship]] = []
+    missing_ids: Dict[str, None] = {}
+    for node_id, relationship in frontier:
+        neighbor_id = _get_neighbor_id(fetched[node_id], relationship)
+        if neighbor_id is None or (neighbor_id, relationship) in visited:
+            continue
+        visited.add((neighbor_id, relationship))
+        next_frontier.append((neighbor_id, relationship))
+        if neighbor_id not in fetched:
+            missing_ids[neighbor_id] = None
+    return next_frontier, list(missing_ids)
+
+
+def _init_neighbor_walk(
+    nodes: List[NodeWithScore], relationships: List[NodeRelationship]
+) -> Tuple[
+    Dict[str, BaseNode],
+    List[Tuple[str, NodeRelationship]],
+    Set[Tuple[str, NodeRelationship]],
+]:
+    """Initialize the fetched nodes, frontier and visited set of a walk."""
+    fetched = {node.node.node_id: node.node for node in nodes}
+    frontier = [
+        (node_id, relationship) for node_id in fetched for relationship in relationships
+    ]
+    return fetched, frontier, set(frontier)
+
+
+def _collect_neighbor_nodes(
+    nodes: List[NodeWithScore],
+    num_nodes: int,
+    relationships: List[NodeRelationship],
+    fetched: Dict[str, BaseNode],
 ) -> Dict[str, NodeWithScore]:
-    """Get forward nodes."""
-    node = node_with_score.node
-    nodes: Dict[str, NodeWithScore] = {node.node_id: node_with_score}
-    cur_count = 0
-    # get forward nodes in an iterative manner
-    while cur_count < num_nodes:
-        if NodeRelationship.NEXT not in node.relationships:
+    """Assemble the neighbor windows of each node from the fetched nodes.
+
+    Windows are laid out node by node (the node, then its neighbors in each
+    direction), and a node that was passed in keeps its score even if it is
+    also a neighbor of another node.
+    """
+    all_nodes: Dict[str, NodeWithScore] = {}
+    for node_with_score in nodes:
+        all_nodes[node_with_score.node.node_id] = node_with_score
+        for relationship in relationships:
+            node = node_with_score.node
+            for _ in range(num_nodes):
+                neighbor_id = _get_neighbor_id(node, relationship)
+                if neighbor_id is None:
+                    break
+                node = fetched[neighbor_id]
+                if node.node_id not in all_nodes:
+                    all_nodes[node.node_id] = NodeWithScore(node=node)
+    return all_nodes
+
+
+def get_neighbor_nodes(
+    nodes: List[NodeWithScore],
+    num_nodes: int,
+    docstore: BaseDocumentStore,
+    relationships: List[NodeRelationship],
+) -> Dict[str, NodeWithScore]:
+    """Get the neighbors of several nodes along the given relationships.
+
+    Neighbors are fetched level by level across all nodes, with one
+    ``docstore.get_nodes`` call per level, and overlapping windows are
+    only fetched once.
+    """
+    fetched, frontier, visited = _init_neighbor_walk(nodes, relationships)
+    for _ in range(num_nodes):
+        frontier, missing_ids = _expand_neighbor_frontier(frontier, visited, fetched)
+        if not frontier:
             break
+        if missing_ids:
+            fetched.update(zip(missing_ids, docstore.get_nodes(missing_ids)))
+    return _collect_neighbor_nodes(nodes, num_nodes, relationships, fetched)
+
 
-        next_node_info = node.next_node
-        if next_node_info is None:
+async def aget_neighbor_nodes(
+    nodes: List[NodeWithScore],
+    num_nodes: int,
+    docstore: BaseDocumentStore,
+    relationships: List[NodeRelationship],
+) -> Dict[str, NodeWithScore]:
+    """Get the neighbors of several nodes along the given relationships (async)."""
+    fetched, frontier, visited = _init_neighbor_walk(nodes, relationships)
+    for _ in range(num_nodes):
+        frontier, missing_ids = _expand_neighbor_frontier(frontier, visited, fetched)
+        if not frontier:
             break
+        if missing_ids:
+            fetched.update(zip(missing_ids, await docstore.aget_nodes(missing_ids)))
+    return _collect_neighbor_nodes(nodes, num_nodes, relationships, fetched)
+
 
-        next_node_id = next_node_info.node_id
-        next_node = docstore.get_node(next_node_id)
-        nodes[next_node.node_id] = NodeWithScore(node=next_node)
-        node = next_node
-        cur_count += 1
-    return nodes
+def get_forward_nodes(
+    node_with_score: NodeWithScore, num_nodes: int, docstore: BaseDocumentStore
+) -> Dict[str, NodeWithScore]:
+    """Get forward nodes."""
+    return get_neighbor_nodes(
+        [node_with_score], num_nodes, docstore, [NodeRelationship.NEXT]
+    )
 
 
 def get_backward_nodes(
     node_with_score: NodeWithScore, num_nodes: int, docstore: BaseDocumentStore
 ) -> Dict[str, NodeWithScore]:
     """Get backward nodes."""
-    node = node_with_score.node
-    # get backward nodes in an iterative manner
-    nodes: Dict[str, NodeWithScore] = {node.node_id: node_with_score}
-    cur_count = 0
-    while cur_count < num_nodes:
-        prev_node_info = node.prev_node
-        if prev_node_info is None:
-            break
-        prev_node_id = prev_node_info.node_id
-        prev_node = docstore.get_node(prev_node_id)
-        if prev_node is None:
-            break
-        nodes[prev_node.node_id] = NodeWithScore(node=prev_node)
-        node = prev_node
-        cur_count += 1
-    return nodes
+    return get_neighbor_nodes(
+        [node_with_score], num_nodes, docstore, [NodeRelationship.PREVIOUS]
+    )
 
 
 class PrevNextNodePostprocessor(BaseNodePostprocessor):
@@ -171,32 +265,21 @@ class PrevNextNodePostprocessor(BaseNodePostprocessor):
     def class_name(cls) -> str:
         return "PrevNextNodePostprocessor"
 
-    def _postprocess_nodes(
-        self,
-        nodes: List[NodeWithScore],
-        query_bundle: Optional[QueryBundle] = None,
-    ) -> List[NodeWithScore]:
-        """Postprocess nodes."""
-        all_nodes: Dict[str, NodeWithScore] = {}
-        for node in nodes:
-            all_nodes[node.node.node_id] = node
-            if self.mode == "next":
-                all_nodes.update(get_forward_nodes(node, self.num_nodes, self.docstore))
-            elif self.mode == "previous":
-                all_nodes.update(
-                    get_backward_nodes(node, self.num_nodes, self.docstore)
-                )
-            elif self.mode == "both":
-                all_nodes.update(get_forward_nodes(node, self.num_nodes, self.docstore))
-                all_nodes.update(
-                    get_backward_nodes(node, self.num_nodes, self.docstore)
-                )
-            else:
-                raise ValueError(f"Invalid mode: {self.mode}")
-
-        all_nodes_values: List[NodeWithScore] = list(all_nodes.values())
+    def _get_relationships(self) -> List[NodeRelationship]:
+        """Get the relationships to follow for the configured mode."""
+        if self.mode == "next":
+            return [NodeRelationship.NEXT]
+        elif self.mode == "previous":
+            return [NodeRelationship.PREVIOUS]
+        elif self.mode == "both":
+            return [NodeRelationship.NEXT, NodeRelationship.PREVIOUS]
+        else:
+            raise ValueError(f"Invalid mode: {self.mode}")
+
+    def _sort_nodes(self, all_nodes: Dict[str, NodeWithScore]) -> List[NodeWithScore]:
+        """Sort nodes so that neighbors are adjacent."""
         sorted_nodes: List[NodeWithScore] = []
-        for node in all_nodes_values:
+        for node in all_nodes.values():
             # variable to check if cand node is inserted
             node_inserted = False
             for i, cand in enumerate(sorted_nodes):
@@ -219,6 +302,43 @@ class PrevNextNodePostprocessor(BaseNodePostprocessor):
 
         return sorted_nodes
 
+    def _postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+    ) -> List[NodeWithScore]:
+        """Postprocess nodes."""
+        all_nodes = get_neighbor_nodes(
+            nodes, self.num_nodes, self.docstore, self._get_relationships()
+        )
+        return self._sort_nodes(all_nodes)
+
+    async def _apostprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+    ) -> List[NodeWithScore]:
+        """Postprocess nodes (async)."""
+        all_nodes = await aget_neighbor_nodes(
+            nodes, self.num_nodes, self.docstore, self._get_relationships()
+        )
+        return self._sort_nodes(all_nodes)
+
+    async def apostprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None,
+        query_str: Optional[str] = None,
+    ) -> List[NodeWithScore]:
+        """Postprocess nodes asynchronously."""
+        if query_str is not None and query_bundle is not None:
+            raise ValueError("Cannot specify both query_str and query_bundle")
+        elif query_str is not None:
+            query_bundle = QueryBundle(query_str)
+        else:
+            pass
+        return await self._apostprocess_nodes(nodes, query_bundle)
+
 
 DEFAULT_INFER_PREV_NEXT_TMPL = (
     "The current context information is provided. \n"
@@ -1,4 +1,10 @@
-from typing import Any, List, Optional
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
 
 from llama_index.core.bridge.pydantic import Field, PrivateAttr
 from llama_index.core.callbacks import CBEventType, EventPayload
@@ -7,6 +13,76 @@ from llama_index.core.schema import MetadataMode, NodeWithScore, QueryBundle
 from llama_index.core.utils import infer_torch_device
 
 DEFAULT_SENTENCE_TRANSFORMER_MAX_LENGTH = 512
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_BATCH_WAIT_MS = 5.0
+# upper bound on characters per token, used to cut passages before tokenization
+# so that the tokenizer never has to process text that would be truncated anyway
+MAX_CHARS_PER_TOKEN = 8
+
+
+class _CrossEncoderBatcher:
+    """Background worker that coalesces cross-encoder pairs into batches.
+
+    Pairs submitted by concurrent queries are queued and run together, once
+    either `batch_size` pairs are waiting or `max_wait_ms` has passed since
+    the first pair of the batch arrived.
+    """
+
+    def __init__(self, model: Any, batch_size: int, max_wait_ms: float) -> None:
+        self._model = model
+        self._batch_size = batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[List[Tuple[str, str]], Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, pairs: List[Tuple[str, str]]) -> "Future[List[float]]":
+        """Queue pairs for scoring, returning a future for their scores."""
+        future: Future = Future()
+        self._queue.put((pairs, future))
+        self._ensure_started()
+        return future
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _collect_batch(self) -> List[Tuple[List[Tuple[str, str]], Future]]:
+        """Block for the first request, then gather more until the batch fills."""
+        requests = [self._queue.get()]
+        num_pairs = len(requests[0][0])
+        deadline = time.monotonic() + self._max_wait
+        while num_pairs < self._batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            requests.append(request)
+            num_pairs += len(request[0])
+        return requests
+
+    def _run(self) -> None:
+        while True:
+            requests = self._collect_batch()
+            pairs = [pair for request_pairs, _ in requests for pair in request_pairs]
+            try:
+                scores = self._model.predict(pairs, batch_size=self._batch_size)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_pairs, future in requests:
+                future.set_result(
+                    [float(s) for s in scores[offset : offset + len(request_pairs)]]
+                )
+                offset += len(request_pairs)
 
 
 class SentenceTransformerRerank(BaseNodePostprocessor):
@@ -20,7 +96,39 @@ class SentenceTransformerRerank(BaseNodePostprocessor):
         default=False,
         description="Whether to keep the retrieval score in metadata.",
     )
+    batch_size: int = Field(
+        default=DEFAULT_BATCH_SIZE,
+        description="Number of (query, node) pairs per cross-encoder forward pass.",
+    )
+    service_mode: bool = Field(
+        default=False,
+        description=(
+            "Whether to score pairs on a shared background worker that "
+            "coalesces pairs from concurrent queries into batches."
+        ),
+    )
+    max_batch_wait_ms: float = Field(
+        default=DEFAULT_MAX_BATCH_WAIT_MS,
+        description=(
+            "In service mode, how long to wait for more pairs before running "
+            "a batch that is not full."
+        ),
+    )
+    cache_size: int = Field(
+        default=0,
+        description="Number of (query, node) scores to keep in an LRU cache.",
+    )
+    truncate_text: bool = Field(
+        default=False,
+        description=(
+            "Whether to cut node text to roughly the model's max length "
+            "before tokenization."
+        ),
+    )
     _model: Any = PrivateAttr()
+    _batcher: Optional[_CrossEncoderBatcher] = PrivateAttr()
+    _cache: "OrderedDict[Tuple[str, str], float]" = PrivateAttr()
+    _cache_lock: threading.Lock = PrivateAttr()
 
     def __init__(
         self,
@@ -28,6 +136,11 @@ class SentenceTransformerRerank(BaseNodePostprocessor):
         model: str = "cross-encoder/stsb-distilroberta-base",
         device: Optional[str] = None,
         keep_retrieval_score: Optional[bool] = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        service_mode: bool = False,
+        max_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+        cache_size: int = 0,
+        truncate_text: bool = False,
     ):
         try:
             from sentence_transformers import CrossEncoder  # pants: no-infer-dep
@@ -40,17 +153,79 @@ class SentenceTransformerRerank(BaseNodePostprocessor):
         self._model = CrossEncoder(
             model, max_length=DEFAULT_SENTENCE_TRANSFORMER_MAX_LENGTH, device=device
         )
+        self._batcher = (
+            _CrossEncoderBatcher(self._model, batch_size, max_batch_wait_ms)
+            if service_mode
+            else None
+        )
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         super().__init__(
             top_n=top_n,
             model=model,
             device=device,
             keep_retrieval_score=keep_retrieval_score,
+            batch_size=batch_size,
+            service_mode=service_mode,
+            max_batch_wait_ms=max_batch_wait_ms,
+            cache_size=cache_size,
+            truncate_text=truncate_text,
         )
 
     @classmethod
     def class_name(cls) -> str:
         return "SentenceTransformerRerank"
 
+    def _get_passage(self, node: NodeWithScore) -> str:
+        """Get the text of a node to pair with the query."""
+        text = node.node.get_content(metadata_mode=MetadataMode.EMBED)
+        if self.truncate_text:
+            max_length = (
+                getattr(self._model, "max_length", None)
+                or DEFAULT_SENTENCE_TRANSFORMER_MAX_LENGTH
+            )
+            text = text[: max_length * MAX_CHARS_PER_TOKEN]
+        return text
+
+    def _predict(self, query_and_nodes: List[Tuple[str, str]]) -> List[float]:
+        """Score (query, node) pairs with the cross-encoder."""
+        if self._batcher is not None:
+            return self._batcher.submit(query_and_nodes).result()
+        scores = self._model.predict(query_and_nodes, batch_size=self.batch_size)
+        return [float(score) for score in scores]
+
+    def _score(
+        self, query_str: str, nodes: List[NodeWithScore]
+    ) -> List[Optional[float]]:
+        """Score nodes against the query, only running uncached pairs."""
+        if self.cache_size <= 0:
+            return list(
+                self._predict([(query_str, self._get_passage(n)) for n in nodes])
+            )
+
+        query_hash = hashlib.sha256(query_str.encode("utf-8")).hexdigest()
+        keys = [(query_hash, node.node.hash) for node in nodes]
+        scores: List[Optional[float]] = []
+        with self._cache_lock:
+            for key in keys:
+                scores.append(self._cache.get(key))
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            new_scores = self._predict(
+                [(query_str, self._get_passage(nodes[i])) for i in missing]
+            )
+            with self._cache_lock:
+                for i, score in zip(missing, new_scores):
+                    scores[i] = score
+                    self._cache[keys[i]] = score
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return scores
+
     def _postprocess_nodes(
         self,
         nodes: List[NodeWithScore],
@@ -61,14 +236,6 @@ class SentenceTransformerRerank(BaseNodePostprocessor):
         if len(nodes) == 0:
             return []
 
-        query_and_nodes = [
-            (
-                query_bundle.query_str,
-                node.node.get_content(metadata_mode=MetadataMode.EMBED),
-            )
-            for node in nodes
-        ]
-
         with self.callback_manager.event(
             CBEventType.RERANKING,
             payload={
@@ -78,7 +245,7 @@ class SentenceTransformerRerank(BaseNodePostprocessor):
                 EventPayload.TOP_K: self.top_n,
             },
         ) as event:
-            scores = self._model.predict(query_and_nodes)
+            scores = self._score(query_bundle.query_str, nodes)
 
             assert len(scores) == len(nodes)
 
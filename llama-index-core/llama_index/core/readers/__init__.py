@@ -15,11 +15,14 @@ from llama_index.core.readers.download import download_loader
 
 # readers
 from llama_index.core.readers.file.base import SimpleDirectoryReader
+from llama_index.core.readers.file.manifest import FileManifest, FileSyncResult
 from llama_index.core.readers.string_iterable import StringIterableReader
 from llama_index.core.schema import Document
 
 __all__ = [
     "SimpleDirectoryReader",
+    "FileManifest",
+    "FileSyncResult",
     "ReaderConfig",
     "Document",
     "StringIterableReader",
@@ -1,6 +1,9 @@
 """Base reader class."""
 
+import asyncio
+import contextvars
 from abc import ABC
+from functools import partial
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -37,8 +40,16 @@ class BaseReader(ABC):
         return list(self.lazy_load_data(*args, **load_kwargs))
 
     async def aload_data(self, *args: Any, **load_kwargs: Any) -> List[Document]:
-        """Load data from the input directory."""
-        return self.load_data(*args, **load_kwargs)
+        """Load data from the input directory.
+
+        Runs `load_data` in the default executor of the event loop, so that
+        readers without a native async implementation do not block it.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            contextvars.copy_context().run,
+            partial(self.load_data, *args, **load_kwargs),
+        )
 
     def load_langchain_documents(self, **load_kwargs: Any) -> List["LCDocument"]:
         """Load data in LangChain document format."""
@@ -4,18 +4,43 @@ import os
 import logging
 import mimetypes
 import multiprocessing
+import pickle
 import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from functools import reduce
+from functools import partial
 import asyncio
-from itertools import repeat
+import contextvars
+from hashlib import sha256
+from itertools import chain, repeat
 from pathlib import Path, PurePosixPath
 import fsspec
 from fsspec.implementations.local import LocalFileSystem
-from typing import Any, Callable, Dict, Generator, List, Optional, Type
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+)
 
 from llama_index.core.readers.base import BaseReader
-from llama_index.core.async_utils import run_jobs, get_asyncio_module
+from llama_index.core.readers.file.manifest import (
+    FileManifest,
+    FileState,
+    FileSyncResult,
+    get_info_mtime,
+)
+from llama_index.core.async_utils import (
+    DEFAULT_NUM_WORKERS,
+    run_jobs,
+    get_asyncio_module,
+)
 from llama_index.core.schema import Document
 from tqdm import tqdm
 
@@ -59,6 +84,20 @@ def _try_loading_included_file_formats() -> Dict[str, Type[BaseReader]]:
     return default_file_reader_cls
 
 
+FILE_HASH_BLOCK_SIZE = 1024 * 1024
+
+# parsers of these file types are CPU bound, and run in processes in aload_data
+DEFAULT_CPU_BOUND_SUFFIXES = {
+    ".hwp",
+    ".pdf",
+    ".docx",
+    ".pptx",
+    ".ppt",
+    ".pptm",
+    ".epub",
+}
+
+
 def _format_file_timestamp(timestamp: float) -> Optional[str]:
     """Format file timestamp to a %Y-%m-%d string.
 
@@ -132,9 +171,54 @@ def is_default_fs(fs: fsspec.AbstractFileSystem) -> bool:
     return isinstance(fs, LocalFileSystem) and not fs.auto_mkdir
 
 
+def is_async_fs(fs: fsspec.AbstractFileSystem) -> bool:
+    """Whether fs has async methods that can be awaited in the running loop."""
+    return getattr(fs, "async_impl", False) and getattr(fs, "asynchronous", False)
+
+
+def _has_async_load_data(reader: BaseReader) -> bool:
+    """Whether a reader implements aload_data natively."""
+    return type(reader).aload_data is not BaseReader.aload_data
+
+
+def _is_picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+        return True
+    except Exception:
+        return False
+
+
 logger = logging.getLogger(__name__)
 
 
+class _PathTrie:
+    """Trie of path parts, to check if a path is under any of a set of dirs."""
+
+    _END = ""
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+
+    def add(self, parts: Sequence[str]) -> None:
+        node = self._root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[self._END] = {}
+
+    def has_prefix(self, parts: Sequence[str]) -> bool:
+        """Whether any added path is a prefix of (or equal to) `parts`."""
+        node = self._root
+        for part in parts:
+            if self._END in node:
+                return True
+            child: Optional[Dict[str, Any]] = node.get(part)
+            if child is None:
+                return False
+            node = child
+        return self._END in node
+
+
 class SimpleDirectoryReader(BaseReader):
     """Simple directory reader.
 
@@ -172,6 +256,7 @@ class SimpleDirectoryReader(BaseReader):
     """
 
     supported_suffix_fn: Callable = _try_loading_included_file_formats
+    cpu_bound_suffixes: Set[str] = DEFAULT_CPU_BOUND_SUFFIXES
 
     def __init__(
         self,
@@ -208,6 +293,8 @@ class SimpleDirectoryReader(BaseReader):
         self.raise_on_error = raise_on_error
         _Path = Path if is_default_fs(self.fs) else PurePosixPath
 
+        # `fs.info` results of input files, when listed from input_dir
+        self._file_infos: Dict[Path, Dict[str, Any]] = {}
         if input_files:
             self.input_files = []
             for path in input_files:
@@ -236,10 +323,15 @@ class SimpleDirectoryReader(BaseReader):
         )
 
     def _add_files(self, input_dir: Path) -> List[Path]:
-        """Add files."""
+        """Add files.
+
+        Files are listed with a single `fs.find` call, which also returns
+        their type and size, so no per-file calls are made to (possibly
+        remote) filesystems.
+        """
         all_files = set()
         rejected_files = set()
-        rejected_dirs = set()
+        rejected_dirs = _PathTrie()
         # Default to POSIX paths for non-default file systems (e.g. S3)
         _Path = Path if is_default_fs(self.fs) else PurePosixPath
 
@@ -251,53 +343,38 @@ class SimpleDirectoryReader(BaseReader):
                 else:
                     # Non-recursive glob
                     excluded_glob = _Path(input_dir) / excluded_pattern
-                for file in self.fs.glob(str(excluded_glob)):
-                    if self.fs.isdir(file):
-                        rejected_dirs.add(_Path(file))
+                excluded = self.fs.glob(str(excluded_glob), detail=True)
+                for file, info in excluded.items():
+                    if info.get("type") == "directory":
+                        rejected_dirs.add(_Path(file).parts)
                     else:
                         rejected_files.add(_Path(file))
 
-        file_refs: List[str] = []
-        if self.recursive:
-            file_refs = self.fs.glob(str(input_dir) + "/**/*")
-        else:
-            file_refs = self.fs.glob(str(input_dir) + "/*")
+        file_infos: Dict[str, Dict[str, Any]] = self.fs.find(
+            str(input_dir),
+            maxdepth=None if self.recursive else 1,
+            detail=True,
+        )
 
-        for ref in file_refs:
-            # Manually check if file is hidden or directory instead of
+        kept_file_infos: Dict[Path, Dict[str, Any]] = {}
+        for ref, info in file_infos.items():
+            # Manually check if file is hidden instead of
             # in glob for backwards compatibility.
             ref = _Path(ref)
-            is_dir = self.fs.isdir(ref)
-            skip_because_hidden = self.exclude_hidden and self.is_hidden(ref)
-            skip_because_bad_ext = (
-                self.required_exts is not None and ref.suffix not in self.required_exts
-            )
-            skip_because_excluded = ref in rejected_files
-            if not skip_because_excluded:
-                if is_dir:
-                    ref_parent_dir = ref
-                else:
-                    ref_parent_dir = self.fs._parent(ref)
-                for rejected_dir in rejected_dirs:
-                    if str(ref_parent_dir).startswith(str(rejected_dir)):
-                        skip_because_excluded = True
-                        logger.debug(
-                            "Skipping %s because it in parent dir %s which is in %s",
-                            ref,
-                            ref_parent_dir,
-                            rejected_dir,
-                        )
-                        break
-
-            if (
-                is_dir
-                or skip_because_hidden
-                or skip_because_bad_ext
-                or skip_because_excluded
-            ):
+            if info.get("type") == "directory":
+                continue
+            if self.exclude_hidden and self.is_hidden(ref):
+                continue
+            if self.required_exts is not None and ref.suffix not in self.required_exts:
+                continue
+            if ref in rejected_files:
+                continue
+            if rejected_dirs.has_prefix(ref.parts[:-1]):
+                logger.debug("Skipping %s because it is in an excluded dir", ref)
                 continue
-            else:
-                all_files.add(ref)
+
+            all_files.add(ref)
+            kept_file_infos[ref] = info
 
         new_input_files = sorted(all_files)
 
@@ -307,6 +384,8 @@ class SimpleDirectoryReader(BaseReader):
         if self.num_files_limit is not None and self.num_files_limit > 0:
             new_input_files = new_input_files[0 : self.num_files_limit]
 
+        self._file_infos = {f: kept_file_infos[f] for f in new_input_files}
+
         # print total number of files added
         logger.debug(
             f"> [SimpleDirectoryReader] Total files added: {len(new_input_files)}"
@@ -448,89 +527,176 @@ class SimpleDirectoryReader(BaseReader):
 
         return documents
 
-    async def aload_file(self, input_file: Path) -> List[Document]:
-        """Load file asynchronously."""
-        # TODO: make this less redundant
-        default_file_reader_cls = SimpleDirectoryReader.supported_suffix_fn()
-        default_file_reader_suffix = list(default_file_reader_cls.keys())
-        metadata: Optional[dict] = None
-        documents: List[Document] = []
+    @staticmethod
+    def _load_file_or_none(
+        input_file: Path,
+        file_metadata: Callable[[str], Dict],
+        file_extractor: Dict[str, BaseReader],
+        filename_as_id: bool = False,
+        encoding: str = "utf-8",
+        errors: str = "ignore",
+        raise_on_error: bool = False,
+        fs: Optional[fsspec.AbstractFileSystem] = None,
+    ) -> Optional[List[Document]]:
+        """Load a file like `load_file`, but return None if its reader failed.
 
-        if self.file_metadata is not None:
-            metadata = self.file_metadata(str(input_file))
+        NOTE: necessarily as a static method for parallel processing.
+        """
+        try:
+            return SimpleDirectoryReader.load_file(
+                input_file,
+                file_metadata,
+                file_extractor,
+                filename_as_id=filename_as_id,
+                encoding=encoding,
+                errors=errors,
+                raise_on_error=True,
+                fs=fs,
+            )
+        except ImportError:
+            raise
+        except Exception as e:
+            if raise_on_error or e.__cause__ is None:
+                # not an error of the reader
+                raise
+            print(
+                f"Failed to load file {input_file} with error: {e.__cause__}. "
+                "Skipping...",
+                flush=True,
+            )
+            return None
+
+    def _get_file_reader(self, file_suffix: str) -> Optional[BaseReader]:
+        """Get the reader for a file suffix, or None to read the file as text."""
+        if file_suffix not in self.file_extractor:
+            default_file_reader_cls = SimpleDirectoryReader.supported_suffix_fn()
+            if file_suffix not in default_file_reader_cls:
+                return None
+            # instantiate file reader if not already
+            self.file_extractor[file_suffix] = default_file_reader_cls[file_suffix]()
+        return self.file_extractor[file_suffix]
+
+    async def _arun_in_executor(
+        self, executor: Optional[Executor], fn: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Run a blocking function in an executor, off the event loop."""
+        loop = asyncio.get_running_loop()
+        if isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(executor, partial(fn, *args))
+        return await loop.run_in_executor(
+            executor, contextvars.copy_context().run, partial(fn, *args)
+        )
 
-        file_suffix = input_file.suffix.lower()
-        if (
-            file_suffix in default_file_reader_suffix
-            or file_suffix in self.file_extractor
-        ):
-            # use file readers
-            if file_suffix not in self.file_extractor:
-                # instantiate file reader if not already
-                reader_cls = default_file_reader_cls[file_suffix]
-                self.file_extractor[file_suffix] = reader_cls()
-            reader = self.file_extractor[file_suffix]
+    async def aload_file(
+        self, input_file: Path, executor: Optional[Executor] = None
+    ) -> List[Document]:
+        """Load file asynchronously.
 
-            # load data -- catch all errors except for ImportError
-            try:
-                kwargs = {"extra_info": metadata}
-                if self.fs and not is_default_fs(self.fs):
-                    kwargs["fs"] = self.fs
-                docs = await reader.aload_data(input_file, **kwargs)
-            except ImportError as e:
-                # ensure that ImportError is raised so user knows
-                # about missing dependencies
-                raise ImportError(str(e))
-            except Exception as e:
-                if self.raise_on_error:
-                    raise
-                # otherwise, just skip the file and report the error
-                print(
-                    f"Failed to load file {input_file} with error: {e}. Skipping...",
-                    flush=True,
+        Files whose reader has no native async implementation are loaded with
+        `load_file` in `executor` (the loop's default executor if None), and
+        files read as text are read with async fsspec when `fs` supports it,
+        so the event loop is never blocked.
+        """
+        file_suffix = input_file.suffix.lower()
+        reader = self._get_file_reader(file_suffix)
+        fs = self.fs or get_default_fs()
+
+        if reader is None and is_async_fs(fs):
+            metadata: Optional[dict] = None
+            if self.file_metadata is not None:
+                metadata = await self._arun_in_executor(
+                    None, self.file_metadata, str(input_file)
                 )
-                return []
-
-            # iterate over docs if needed
-            if self.filename_as_id:
-                for i, doc in enumerate(docs):
-                    doc.id_ = f"{input_file!s}_part_{i}"
-
-            documents.extend(docs)
-        else:
-            # do standard read
-            fs = self.fs or get_default_fs()
-            with fs.open(input_file, errors=self.errors, encoding=self.encoding) as f:
-                data = f.read().decode(self.encoding, errors=self.errors)
-
+            data = (await fs._cat_file(str(input_file))).decode(
+                self.encoding, errors=self.errors
+            )
             doc = Document(text=data, metadata=metadata or {})
             if self.filename_as_id:
                 doc.id_ = str(input_file)
+            return [doc]
+
+        if reader is None or not _has_async_load_data(reader):
+            file_extractor = self.file_extractor
+            if isinstance(executor, ProcessPoolExecutor):
+                # only send the file's reader to the process, as the readers
+                # of other suffixes may not be picklable
+                file_extractor = {file_suffix: reader} if reader is not None else {}
+            return await self._arun_in_executor(
+                executor,
+                SimpleDirectoryReader.load_file,
+                input_file,
+                self.file_metadata,
+                file_extractor,
+                self.filename_as_id,
+                self.encoding,
+                self.errors,
+                self.raise_on_error,
+                self.fs,
+            )
 
-            documents.append(doc)
+        metadata = None
+        if self.file_metadata is not None:
+            metadata = await self._arun_in_executor(
+                None, self.file_metadata, str(input_file)
+            )
 
-        return documents
+        # load data -- catch all errors except for ImportError
+        try:
+            kwargs = {"extra_info": metadata}
+            if self.fs and not is_default_fs(self.fs):
+                kwargs["fs"] = self.fs
+            docs = await reader.aload_data(input_file, **kwargs)
+        except ImportError as e:
+            # ensure that ImportError is raised so user knows
+            # about missing dependencies
+            raise ImportError(str(e))
+        except Exception as e:
+            if self.raise_on_error:
+                raise
+            # otherwise, just skip the file and report the error
+            print(
+                f"Failed to load file {input_file} with error: {e}. Skipping...",
+                flush=True,
+            )
+            return []
 
-    def load_data(
+        # iterate over docs if needed
+        if self.filename_as_id:
+            for i, doc in enumerate(docs):
+                doc.id_ = f"{input_file!s}_part_{i}"
+
+        return docs
+
+    def _get_process_suffixes(self, files: List[Path]) -> Set[str]:
+        """Get the suffixes of files to load in processes.
+
+        These are CPU bound file types whose reader has no native async
+        implementation, and whose reader and metadata function can be pickled.
+        """
+        suffixes = set()
+        for file_suffix in {f.suffix.lower() for f in files}:
+            if file_suffix not in self.cpu_bound_suffixes:
+                continue
+            reader = self._get_file_reader(file_suffix)
+            if (
+                reader is not None
+                and not _has_async_load_data(reader)
+                and _is_picklable((reader, self.file_metadata, self.fs))
+            ):
+                suffixes.add(file_suffix)
+        return suffixes
+
+    def _load_files(
         self,
+        input_files: List[Path],
         show_progress: bool = False,
         num_workers: Optional[int] = None,
         fs: Optional[fsspec.AbstractFileSystem] = None,
-    ) -> List[Document]:
-        """Load data from the input directory.
+    ) -> List[Optional[List[Document]]]:
+        """Load files, returning the documents of each file in file order.
 
-        Args:
-            show_progress (bool): Whether to show tqdm progress bars. Defaults to False.
-            num_workers  (Optional[int]): Number of workers to parallelize data-loading over.
-            fs (Optional[fsspec.AbstractFileSystem]): File system to use. If fs was specified
-                in the constructor, it will override the fs parameter here.
-
-        Returns:
-            List[Document]: A list of documents.
+        Files failing to load (if not `raise_on_error`) have None instead.
         """
-        documents = []
-
-        files_to_process = self.input_files
         fs = fs or self.fs
 
         if num_workers and num_workers > 1:
@@ -539,11 +705,18 @@ class SimpleDirectoryReader(BaseReader):
                     "Specified num_workers exceed number of CPUs in the system. "
                     "Setting `num_workers` down to the maximum CPU count."
                 )
+            # hand out the largest files first, one at a time, so that
+            # workers finish at about the same time
+            order = sorted(
+                range(len(input_files)),
+                key=lambda i: self._file_infos.get(input_files[i], {}).get("size") or 0,
+                reverse=True,
+            )
             with multiprocessing.get_context("spawn").Pool(num_workers) as p:
                 results = p.starmap(
-                    SimpleDirectoryReader.load_file,
+                    SimpleDirectoryReader._load_file_or_none,
                     zip(
-                        files_to_process,
+                        [input_files[i] for i in order],
                         repeat(self.file_metadata),
                         repeat(self.file_extractor),
                         repeat(self.filename_as_id),
@@ -552,29 +725,177 @@ class SimpleDirectoryReader(BaseReader):
                         repeat(self.raise_on_error),
                         repeat(fs),
                     ),
+                    chunksize=1,
                 )
-                documents = reduce(lambda x, y: x + y, results)
+            # keep documents in file order
+            ordered_results: List[Optional[List[Document]]] = [None for _ in order]
+            for i, result in zip(order, results):
+                ordered_results[i] = result
+            return ordered_results
 
-        else:
-            if show_progress:
-                files_to_process = tqdm(
-                    self.input_files, desc="Loading files", unit="file"
+        files_to_process: Iterable[Path] = input_files
+        if show_progress:
+            files_to_process = tqdm(input_files, desc="Loading files", unit="file")
+        return [
+            SimpleDirectoryReader._load_file_or_none(
+                input_file=input_file,
+                file_metadata=self.file_metadata,
+                file_extractor=self.file_extractor,
+                filename_as_id=self.filename_as_id,
+                encoding=self.encoding,
+                errors=self.errors,
+                raise_on_error=self.raise_on_error,
+                fs=fs,
+            )
+            for input_file in files_to_process
+        ]
+
+    def load_data(
+        self,
+        show_progress: bool = False,
+        num_workers: Optional[int] = None,
+        fs: Optional[fsspec.AbstractFileSystem] = None,
+    ) -> List[Document]:
+        """Load data from the input directory.
+
+        Args:
+            show_progress (bool): Whether to show tqdm progress bars. Defaults to False.
+            num_workers  (Optional[int]): Number of workers to parallelize data-loading over.
+            fs (Optional[fsspec.AbstractFileSystem]): File system to use. If fs was specified
+                in the constructor, it will override the fs parameter here.
+
+        Returns:
+            List[Document]: A list of documents.
+        """
+        document_lists = self._load_files(
+            self.input_files,
+            show_progress=show_progress,
+            num_workers=num_workers,
+            fs=fs,
+        )
+        documents = list(
+            chain.from_iterable(docs for docs in document_lists if docs is not None)
+        )
+        return self._exclude_metadata(documents)
+
+    def _get_file_infos(self, input_files: List[Path]) -> Dict[Path, Dict[str, Any]]:
+        """Get the `fs.info` result of each file.
+
+        Files not listed from input_dir are listed one directory at a time,
+        with a single `fs.ls` call for each.
+        """
+        file_infos = {
+            f: self._file_infos[f] for f in input_files if f in self._file_infos
+        }
+        parent_dirs: Dict[str, List[Path]] = {}
+        for input_file in input_files:
+            if input_file not in file_infos:
+                parent_dirs.setdefault(self.fs._parent(str(input_file)), []).append(
+                    input_file
                 )
-            for input_file in files_to_process:
-                documents.extend(
-                    SimpleDirectoryReader.load_file(
-                        input_file=input_file,
-                        file_metadata=self.file_metadata,
-                        file_extractor=self.file_extractor,
-                        filename_as_id=self.filename_as_id,
-                        encoding=self.encoding,
-                        errors=self.errors,
-                        raise_on_error=self.raise_on_error,
-                        fs=fs,
-                    )
+        for parent_dir, files in parent_dirs.items():
+            dir_infos = {
+                self.fs._strip_protocol(info["name"]): info
+                for info in self.fs.ls(parent_dir, detail=True)
+            }
+            for input_file in files:
+                info = dir_infos.get(self.fs._strip_protocol(str(input_file)))
+                file_infos[input_file] = info or self.fs.info(str(input_file))
+        return file_infos
+
+    def _get_file_hash(self, input_file: Path) -> str:
+        """Get the sha256 hash of the content of a file."""
+        file_hash = sha256()
+        with self.fs.open(str(input_file), "rb") as f:
+            for block in iter(partial(f.read, FILE_HASH_BLOCK_SIZE), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    def load_changed_data(
+        self,
+        manifest: FileManifest,
+        show_progress: bool = False,
+        num_workers: Optional[int] = None,
+        use_hash: bool = False,
+    ) -> FileSyncResult:
+        """Load only the files that are new or changed since the last load.
+
+        Files are compared with `manifest` by size and modification time,
+        which are listed in bulk, and, if `use_hash` is True, by the hash of
+        their content (only computed for files whose size or modification
+        time changed). `manifest` is updated in place: persist it once the
+        documents have been ingested.
+
+        Use `filename_as_id=True` for stable document ids, so that
+        `IngestionPipeline` can upsert documents of modified files, and pass
+        `deleted_doc_ids` of the result to `IngestionPipeline.run`.
+
+        Files failing to load (if not `raise_on_error`) are listed in
+        `failed_files`, and are left as they were in `manifest`, so they are
+        loaded again next time and their previous documents are kept.
+
+        Args:
+            manifest (FileManifest): State of the files at the last load.
+            show_progress (bool): Whether to show tqdm progress bars. Defaults to False.
+            num_workers  (Optional[int]): Number of workers to parallelize data-loading over.
+            use_hash (bool): Whether to compare files by content hash too.
+
+        Returns:
+            FileSyncResult: Documents of new and modified files, and deleted files.
+        """
+        result = FileSyncResult()
+        file_infos = self._get_file_infos(self.input_files)
+        changed_files: List[Path] = []
+        file_states: Dict[Path, FileState] = {}
+        for input_file in self.input_files:
+            info = file_infos[input_file]
+            state = FileState(size=info.get("size"), mtime=get_info_mtime(info))
+            old_state = manifest.files.get(str(input_file))
+            if old_state is not None:
+                state.hash = old_state.hash
+                state.doc_ids = old_state.doc_ids
+                if state.size == old_state.size and state.mtime == old_state.mtime:
+                    manifest.files[str(input_file)] = state
+                    continue
+            if use_hash:
+                file_hash = self._get_file_hash(input_file)
+                if old_state is not None and file_hash == old_state.hash:
+                    # touched, but the content did not change
+                    manifest.files[str(input_file)] = state
+                    continue
+                state.hash = file_hash
+            changed_files.append(input_file)
+            file_states[input_file] = state
+
+        document_lists = self._load_files(
+            changed_files, show_progress=show_progress, num_workers=num_workers
+        )
+        for input_file, documents in zip(changed_files, document_lists):
+            if documents is None:
+                result.failed_files.append(str(input_file))
+                continue
+            state = file_states[input_file]
+            doc_ids = [doc.id_ for doc in documents]
+            if str(input_file) in manifest.files:
+                result.modified_files.append(str(input_file))
+                new_doc_ids = set(doc_ids)
+                result.deleted_doc_ids.extend(
+                    doc_id for doc_id in state.doc_ids if doc_id not in new_doc_ids
                 )
+            else:
+                result.new_files.append(str(input_file))
+            state.doc_ids = doc_ids
+            manifest.files[str(input_file)] = state
+            result.documents.extend(documents)
 
-        return self._exclude_metadata(documents)
+        input_paths = {str(input_file) for input_file in self.input_files}
+        for path in list(manifest.files):
+            if path not in input_paths:
+                result.deleted_files.append(path)
+                result.deleted_doc_ids.extend(manifest.files.pop(path).doc_ids)
+
+        self._exclude_metadata(result.documents)
+        return result
 
     async def aload_data(
         self,
@@ -596,16 +917,45 @@ class SimpleDirectoryReader(BaseReader):
         files_to_process = self.input_files
         fs = fs or self.fs
 
-        coroutines = [self.aload_file(input_file) for input_file in files_to_process]
-        if num_workers:
-            document_lists = await run_jobs(
-                coroutines, show_progress=show_progress, workers=num_workers
-            )
-        elif show_progress:
-            _asyncio = get_asyncio_module(show_progress=show_progress)
-            document_lists = await _asyncio.gather(*coroutines)
-        else:
-            document_lists = await asyncio.gather(*coroutines)
+        # blocking readers run in a bounded thread pool, and CPU bound ones in
+        # a process pool when loading with several workers
+        thread_executor = ThreadPoolExecutor(
+            max_workers=num_workers or DEFAULT_NUM_WORKERS
+        )
+        process_executor: Optional[ProcessPoolExecutor] = None
+        process_suffixes: Set[str] = set()
+        if num_workers and num_workers > 1:
+            workers: int = num_workers
+            process_suffixes = self._get_process_suffixes(files_to_process)
+            if process_suffixes:
+                process_executor = ProcessPoolExecutor(
+                    max_workers=min(workers, multiprocessing.cpu_count()),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+
+        try:
+            coroutines = [
+                self.aload_file(
+                    input_file,
+                    executor=process_executor
+                    if input_file.suffix.lower() in process_suffixes
+                    else thread_executor,
+                )
+                for input_file in files_to_process
+            ]
+            if num_workers:
+                document_lists = await run_jobs(
+                    coroutines, show_progress=show_progress, workers=num_workers
+                )
+            elif show_progress:
+                _asyncio = get_asyncio_module(show_progress=show_progress)
+                document_lists = await _asyncio.gather(*coroutines)
+            else:
+                document_lists = await asyncio.gather(*coroutines)
+        finally:
+            thread_executor.shutdown(wait=False)
+            if process_executor is not None:
+                process_executor.shutdown(wait=False)
         documents = [doc for doc_list in document_lists for doc in doc_list]
 
         return self._exclude_metadata(documents)
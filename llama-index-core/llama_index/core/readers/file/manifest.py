@@ -0,0 +1,91 @@
+"""Manifest of loaded files, for incremental loading of a directory.
+
+See `SimpleDirectoryReader.load_changed_data`.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import fsspec
+from dataclasses_json import DataClassJsonMixin
+from llama_index.core.schema import Document
+
+DEFAULT_MANIFEST_PATH = "file_manifest.json"
+
+# keys of the modification time in `fs.info` results of common filesystems
+MTIME_INFO_KEYS = ("mtime", "LastModified", "last_modified", "updated", "created")
+
+
+def get_info_mtime(info: Dict[str, Any]) -> Optional[str]:
+    """Get the modification time of a file from its `fs.info` result."""
+    for key in MTIME_INFO_KEYS:
+        mtime = info.get(key)
+        if mtime is not None:
+            return mtime.isoformat() if isinstance(mtime, datetime) else str(mtime)
+    return None
+
+
+@dataclass
+class FileState(DataClassJsonMixin):
+    """Fingerprint of a loaded file, and the ids of its documents."""
+
+    size: Optional[int] = None
+    mtime: Optional[str] = None
+    hash: Optional[str] = None
+    doc_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileManifest(DataClassJsonMixin):
+    """Map of file paths to the state they were last loaded in."""
+
+    files: Dict[str, FileState] = field(default_factory=dict)
+
+    def persist(
+        self,
+        persist_path: str = DEFAULT_MANIFEST_PATH,
+        fs: Optional[fsspec.AbstractFileSystem] = None,
+    ) -> None:
+        """Persist the manifest to a file."""
+        fs = fs or fsspec.filesystem("file")
+        dirpath = os.path.dirname(persist_path)
+        if dirpath and not fs.exists(dirpath):
+            fs.makedirs(dirpath)
+
+        with fs.open(persist_path, "w") as f:
+            f.write(json.dumps(self.to_dict(), separators=(",", ":")))
+
+    @classmethod
+    def from_persist_path(
+        cls,
+        persist_path: str = DEFAULT_MANIFEST_PATH,
+        fs: Optional[fsspec.AbstractFileSystem] = None,
+    ) -> "FileManifest":
+        """Load a manifest from a file, or create an empty one."""
+        fs = fs or fsspec.filesystem("file")
+        if not fs.exists(persist_path):
+            return cls()
+        with fs.open(persist_path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+@dataclass
+class FileSyncResult:
+    """Changes found by `SimpleDirectoryReader.load_changed_data`.
+
+    `deleted_doc_ids` holds the ids of documents of deleted files, and of
+    documents no longer produced by modified files. Pass them to
+    `IngestionPipeline.run` to delete them from its stores. `failed_files`
+    are new or modified files that failed to load, and are not part of the
+    other fields.
+    """
+
+    documents: List[Document] = field(default_factory=list)
+    new_files: List[str] = field(default_factory=list)
+    modified_files: List[str] = field(default_factory=list)
+    deleted_files: List[str] = field(default_factory=list)
+    deleted_doc_ids: List[str] = field(default_factory=list)
+    failed_files: List[str] = field(default_factory=list)
@@ -0,0 +1,7 @@
+from llama_index.core.storage.chat_store.base import BaseChatStore
+from llama_index.core.storage.chat_store.simple_chat_store import SimpleChatStore
+from llama_index.core.storage.chat_store.simple_log_chat_store import (
+    SimpleLogChatStore,
+)
+
+__all__ = ["BaseChatStore", "SimpleChatStore", "SimpleLogChatStore"]
@@ -0,0 +1,328 @@
+"""Log-structured chat store persisted to a local file.
+
+Every change to the store is appended to a log as one line, so writes cost
+the size of the change rather than the size of the store. Each line is a small
+JSON header (operation, key and index) followed by a tab and, for new
+messages, the message as JSON:
+
+    ["add", "user1", null]<TAB>{"role": "user", "content": "hello", ...}
+
+On load only the headers are parsed, building for each key the byte offsets
+of its current messages. Messages of a key are decoded the first time the key
+is read. The log is compacted (rewritten with only the current messages) once
+it holds too many stale lines.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+from llama_index.core.llms import ChatMessage
+from llama_index.core.storage.chat_store.base import BaseChatStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERSIST_PATH = "chat_store.log"
+DEFAULT_COMPACTION_RATIO = 2.0
+DEFAULT_MIN_COMPACTION_LINES = 1000
+DEFAULT_CACHE_SIZE = 1000
+
+# (offset, length) of a message in the log
+MessageRef = Tuple[int, int]
+
+
+class SimpleLogChatStore(BaseChatStore):
+    """Chat store persisted to an append-only log on the local filesystem.
+
+    Unlike `SimpleChatStore`, changes are written to `persist_path` as they
+    happen, and there is no need to call `persist`. Decoded messages are kept
+    for the `cache_size` most recently used keys.
+
+    The store is safe to use from multiple threads, but not from multiple
+    processes.
+    """
+
+    persist_path: str = Field(
+        default=DEFAULT_PERSIST_PATH, description="Path of the log file."
+    )
+    compaction_ratio: float = Field(
+        default=DEFAULT_COMPACTION_RATIO,
+        description=(
+            "Compact the log once it has this many times more lines "
+            "than there are current messages."
+        ),
+    )
+    min_compaction_lines: int = Field(
+        default=DEFAULT_MIN_COMPACTION_LINES,
+        description="Never compact a log with fewer lines than this.",
+    )
+    cache_size: int = Field(
+        default=DEFAULT_CACHE_SIZE,
+        description="Number of keys whose decoded messages are kept in memory.",
+    )
+
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    _refs: Dict[str, List[MessageRef]] = PrivateAttr(default_factory=dict)
+    _cache: "OrderedDict[str, List[ChatMessage]]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _num_lines: int = PrivateAttr(default=0)
+    _num_messages: int = PrivateAttr(default=0)
+    _size: int = PrivateAttr(default=0)
+    _writer: Any = PrivateAttr(default=None)
+    _reader: Any = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._open()
+
+    @classmethod
+    def class_name(cls) -> str:
+        """Get class name."""
+        return "SimpleLogChatStore"
+
+    @classmethod
+    def from_persist_path(
+        cls, persist_path: str = DEFAULT_PERSIST_PATH, **kwargs: Any
+    ) -> "SimpleLogChatStore":
+        """Create a SimpleLogChatStore from a persist path."""
+        return cls(persist_path=persist_path, **kwargs)
+
+    def _open(self) -> None:
+        """Open the log, indexing the messages of every key."""
+        dirpath = os.path.dirname(self.persist_path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+
+        self._refs = {}
+        self._cache = OrderedDict()
+        self._num_lines = 0
+        self._num_messages = 0
+        offset = 0
+        if os.path.exists(self.persist_path):
+            with open(self.persist_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # partially written last line, e.g. after a crash
+                        logger.warning(
+                            f"Ignoring truncated line in {self.persist_path}."
+                        )
+                        break
+                    header, _, payload = line.partition(b"\t")
+                    op, key, idx = json.loads(header)
+                    ref = (offset + len(header) + 1, len(payload) - 1)
+                    self._apply(op, key, idx, ref)
+                    self._num_lines += 1
+                    offset += len(line)
+
+        self._writer = open(self.persist_path, "ab")
+        self._writer.truncate(offset)
+        self._size = offset
+        self._reader = open(self.persist_path, "rb")
+
+    def close(self) -> None:
+        """Close the log."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._reader.close()
+                self._writer = None
+                self._reader = None
+
+    def _apply(
+        self, op: str, key: str, idx: Optional[int], ref: Optional[MessageRef]
+    ) -> None:
+        """Apply a logged operation to the message offsets of a key."""
+        if op == "delete":
+            self._num_messages -= len(self._refs.pop(key, []))
+            return
+
+        refs = self._refs.setdefault(key, [])
+        num_refs = len(refs)
+        if op == "add":
+            assert ref is not None
+            refs.append(ref)
+        elif op == "insert":
+            assert idx is not None and ref is not None
+            refs.insert(idx, ref)
+        elif op == "remove":
+            assert idx is not None
+            del refs[idx]
+        elif op == "pop":
+            refs.pop()
+        elif op == "clear":
+            refs.clear()
+        else:
+            raise ValueError(f"Unknown chat store log operation: {op}")
+        self._num_messages += len(refs) - num_refs
+
+    def _write(
+        self, lines: List[Tuple[str, str, Optional[int], Optional[str]]]
+    ) -> None:
+        """Append operations to the log and apply them.
+
+        Must be called with the lock held.
+        """
+        if self._writer is None:
+            raise ValueError("Chat store is closed.")
+
+        buffer = bytearray()
+        refs: List[Optional[MessageRef]] = []
+        for op, key, idx, payload in lines:
+            header = json.dumps([op, key, idx]).encode()
+            data = (payload or "").encode()
+            refs.append((self._size + len(buffer) + len(header) + 1, len(data)))
+            buffer += header + b"\t" + data + b"\n"
+        self._writer.write(buffer)
+        self._writer.flush()
+        self._size += len(buffer)
+        self._num_lines += len(lines)
+
+        for (op, key, idx, _), ref in zip(lines, refs):
+            self._apply(op, key, idx, ref)
+
+    def _read(self, refs: List[MessageRef]) -> List[ChatMessage]:
+        """Decode messages from the log.
+
+        Must be called with the lock held.
+        """
+        messages = []
+        for offset, length in refs:
+            self._reader.seek(offset)
+            messages.append(ChatMessage.parse_raw(self._reader.read(length)))
+        return messages
+
+    def _get_cached(self, key: str) -> List[ChatMessage]:
+        """Get the messages of a key, decoding them if needed.
+
+        Must be called with the lock held.
+        """
+        if key not in self._refs:
+            return []
+        messages = self._cache.get(key)
+        if messages is None:
+            messages = self._read(self._refs[key])
+            self._cache[key] = messages
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return messages
+
+    def _maybe_compact(self) -> None:
+        """Compact the log if it has too many stale lines."""
+        # one "clear" line per key and one "add" line per message
+        num_live_lines = self._num_messages + len(self._refs)
+        if self._num_lines >= max(
+            self.min_compaction_lines, self.compaction_ratio * num_live_lines
+        ):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log with only the current messages of each key."""
+        with self._lock:
+            tmp_path = self.persist_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                for key, refs in self._refs.items():
+                    f.write(json.dumps(["clear", key, None]).encode() + b"\t\n")
+                    header = json.dumps(["add", key, None]).encode() + b"\t"
+                    for offset, length in refs:
+                        self._reader.seek(offset)
+                        f.write(header + self._reader.read(length) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            cache = self._cache
+            self.close()
+            os.replace(tmp_path, self.persist_path)
+            self._open()
+            self._cache = cache
+
+    def set_messages(self, key: str, messages: List[ChatMessage]) -> None:
+        """Set messages for a key."""
+        payloads = [message.json() for message in messages]
+        with self._lock:
+            self._write(
+                [("clear", key, None, None)]
+                + [("add", key, None, payload) for payload in payloads]
+            )
+            self._cache.pop(key, None)
+            self._maybe_compact()
+
+    def get_messages(self, key: str) -> List[ChatMessage]:
+        """Get messages for a key."""
+        with self._lock:
+            return list(self._get_cached(key))
+
+    def get_last_messages(self, key: str, num_messages: int) -> List[ChatMessage]:
+        """Get the last `num_messages` messages for a key.
+
+        Only the requested messages are decoded if the key is not cached.
+        """
+        if num_messages <= 0:
+            return []
+        with self._lock:
+            messages = self._cache.get(key)
+            if messages is not None:
+                return messages[-num_messages:]
+            return self._read(self._refs.get(key, [])[-num_messages:])
+
+    def add_message(
+        self, key: str, message: ChatMessage, idx: Optional[int] = None
+    ) -> None:
+        """Add a message for a key."""
+        payload = message.json()
+        with self._lock:
+            if idx is None:
+                self._write([("add", key, None, payload)])
+            else:
+                # normalize the index, as list.insert does
+                idx = max(0, min(len(self._refs.get(key, [])), idx))
+                self._write([("insert", key, idx, payload)])
+
+            messages = self._cache.get(key)
+            if messages is not None:
+                messages.insert(len(messages) if idx is None else idx, message)
+            self._maybe_compact()
+
+    def delete_messages(self, key: str) -> Optional[List[ChatMessage]]:
+        """Delete messages for a key."""
+        with self._lock:
+            if key not in self._refs:
+                return None
+            messages = self._get_cached(key)
+            self._write([("delete", key, None, None)])
+            self._cache.pop(key, None)
+            self._maybe_compact()
+            return messages
+
+    def delete_message(self, key: str, idx: int) -> Optional[ChatMessage]:
+        """Delete specific message for a key."""
+        with self._lock:
+            if key not in self._refs:
+                return None
+            if idx >= len(self._refs[key]):
+                return None
+            message = self._get_cached(key).pop(idx)
+            self._write([("remove", key, idx, None)])
+            self._maybe_compact()
+            return message
+
+    def delete_last_message(self, key: str) -> Optional[ChatMessage]:
+        """Delete last message for a key."""
+        with self._lock:
+            if key not in self._refs or not self._refs[key]:
+                return None
+            message = self._get_cached(key).pop()
+            self._write([("pop", key, None, None)])
+            self._maybe_compact()
+            return message
+
+    def get_keys(self) -> List[str]:
+        """Get all keys."""
+        with self._lock:
+            return list(self._refs.keys())
@@ -0,0 +1,230 @@
+import dataclasses
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from llama_index.core.constants import DATA_KEY, TYPE_KEY
+from llama_index.core.data_structs.data_structs import IndexStruct, TrackedDict
+from llama_index.core.storage.index_store.types import BaseIndexStore
+from llama_index.core.storage.index_store.utils import (
+    index_struct_to_json,
+    json_to_index_struct,
+)
+from llama_index.core.storage.kvstore.types import DEFAULT_BATCH_SIZE, BaseKVStore
+
+DEFAULT_NAMESPACE = "index_store"
+SHARDED_FIELDS_KEY = "__sharded_fields__"
+SHARD_VALUE_KEY = "value"
+
+
+def _encode_value(value: Any) -> Any:
+    """Encode a map value as json."""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _encode_value(v) for k, v in value.items()}
+    return value
+
+
+class KVIndexStore(BaseIndexStore):
+    """Key-Value Index store.
+
+    By default, each index struct is stored as a single value. With
+    `sharded=True`, the dict fields of an index struct (e.g. `nodes_dict` of
+    an `IndexDict` or `table` of a `KeywordTable`) are instead stored with one
+    record per entry, in a collection per field. Once an index struct was
+    added or loaded, its dict fields record the keys changed through them, and
+    adding it again only writes the entries of those keys, instead of
+    re-serializing the whole struct.
+
+    Both layouts can be read regardless of `sharded`.
+
+    Args:
+        kvstore (BaseKVStore): key-value store
+        namespace (str): namespace for the index store
+        sharded (bool): whether to store dict fields with one record per entry
+        batch_size (int): batch size for writing entries of sharded fields
+
+    """
+
+    def __init__(
+        self,
+        kvstore: BaseKVStore,
+        namespace: Optional[str] = None,
+        sharded: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Init a KVIndexStore."""
+        self._kvstore = kvstore
+        self._namespace = namespace or DEFAULT_NAMESPACE
+        self._collection = f"{self._namespace}/data"
+        self._sharded = sharded
+        self._batch_size = batch_size
+        # index_id -> field name -> (dict field last written or read, its
+        # keys changed since)
+        self._tracked_fields: Dict[str, Dict[str, Tuple[TrackedDict, Set[Any]]]] = {}
+
+    def _get_field_collection(self, struct_id: str, field_name: str) -> str:
+        return f"{self._namespace}/{struct_id}/{field_name}"
+
+    def _get_dict_fields(self, index_struct: IndexStruct) -> Dict[str, Dict]:
+        return {
+            f.name: getattr(index_struct, f.name)
+            for f in dataclasses.fields(index_struct)
+            if isinstance(getattr(index_struct, f.name), dict)
+        }
+
+    def _put_field(
+        self, struct_id: str, field_name: str, entries: Dict[Any, Any]
+    ) -> None:
+        """Write the entries of a sharded field that changed since last time."""
+        collection = self._get_field_collection(struct_id, field_name)
+        tracked = self._tracked_fields.get(struct_id, {}).get(field_name)
+        changed: List[Tuple[str, dict]]
+        if tracked is None or tracked[0] is not entries:
+            # unknown state: rewrite the field and clear stale entries
+            stale_keys = set(self._kvstore.get_all(collection=collection)) - {
+                str(key) for key in entries
+            }
+            changed = [
+                (str(key), {SHARD_VALUE_KEY: _encode_value(value)})
+                for key, value in entries.items()
+            ]
+        else:
+            tracked_entries, changed_keys = tracked
+            dirty_keys = list(changed_keys)
+            changed_keys.clear()
+            stale_keys = {str(key) for key in dirty_keys if key not in tracked_entries}
+            changed = [
+                (
+                    str(key),
+                    {SHARD_VALUE_KEY: _encode_value(dict.__getitem__(entries, key))},
+                )
+                for key in dirty_keys
+                if key in tracked_entries
+            ]
+
+        if changed:
+            self._kvstore.put_all(
+                changed, collection=collection, batch_size=self._batch_size
+            )
+        for key in stale_keys:
+            self._kvstore.delete(key, collection=collection)
+
+    def _add_sharded_index_struct(self, index_struct: IndexStruct) -> None:
+        struct_id = index_struct.index_id
+        dict_fields = self._get_dict_fields(index_struct)
+        for field_name, entries in dict_fields.items():
+            self._put_field(struct_id, field_name, entries)
+
+        empty_fields: Dict[str, Any] = {field_name: {} for field_name in dict_fields}
+        header = dataclasses.replace(index_struct, **empty_fields)
+        data = index_struct_to_json(header)
+        data[SHARDED_FIELDS_KEY] = list(dict_fields)
+        self._kvstore.put(struct_id, data, collection=self._collection)
+        self._track_fields(index_struct, list(dict_fields))
+
+    def _track_fields(self, index_struct: IndexStruct, field_names: List[str]) -> None:
+        """Make the dict fields of an index struct record their changed keys."""
+        self._untrack_fields(index_struct.index_id)
+        tracked_fields = {}
+        for field_name in field_names:
+            entries = getattr(index_struct, field_name)
+            if not isinstance(entries, TrackedDict):
+                entries = TrackedDict(entries)
+                setattr(index_struct, field_name, entries)
+            tracked_fields[field_name] = (entries, entries.add_tracker())
+        self._tracked_fields[index_struct.index_id] = tracked_fields
+
+    def _untrack_fields(self, struct_id: str) -> None:
+        """Stop recording the changed keys of the dict fields of an index struct."""
+        for entries, changed_keys in self._tracked_fields.pop(struct_id, {}).values():
+            entries.remove_tracker(changed_keys)
+
+    def _load_index_struct(self, struct_id: str, struct_dict: dict) -> IndexStruct:
+        """Load an index struct, reading the entries of its sharded fields."""
+        field_names = struct_dict.get(SHARDED_FIELDS_KEY)
+        if field_names is None:
+            self._untrack_fields(struct_id)
+            return json_to_index_struct(struct_dict)
+
+        data_dict = json.loads(struct_dict[DATA_KEY])
+        for field_name in field_names:
+            records = self._kvstore.get_all(
+                collection=self._get_field_collection(struct_id, field_name)
+            )
+            data_dict[field_name] = {
+                key: record[SHARD_VALUE_KEY] for key, record in records.items()
+            }
+        index_struct = json_to_index_struct(
+            {TYPE_KEY: struct_dict[TYPE_KEY], DATA_KEY: data_dict}
+        )
+        self._track_fields(index_struct, field_names)
+        return index_struct
+
+    def add_index_struct(self, index_struct: IndexStruct) -> None:
+        """Add an index struct.
+
+        Args:
+            index_struct (IndexStruct): index struct
+
+        """
+        if self._sharded:
+            self._add_sharded_index_struct(index_struct)
+            return
+
+        key = index_struct.index_id
+        data = index_struct_to_json(index_struct)
+        self._kvstore.put(key, data, collection=self._collection)
+
+    def delete_index_struct(self, key: str) -> None:
+        """Delete an index struct.
+
+        Args:
+            key (str): index struct key
+
+        """
+        struct_dict = self._kvstore.get(key, collection=self._collection)
+        for field_name in (struct_dict or {}).get(SHARDED_FIELDS_KEY, []):
+            collection = self._get_field_collection(key, field_name)
+            for entry_key in self._kvstore.get_all(collection=collection):
+                self._kvstore.delete(entry_key, collection=collection)
+        self._untrack_fields(key)
+        self._kvstore.delete(key, collection=self._collection)
+
+    def get_index_struct(
+        self, struct_id: Optional[str] = None
+    ) -> Optional[IndexStruct]:
+        """Get an index struct.
+
+        Args:
+            struct_id (Optional[str]): index struct id
+
+        """
+        if struct_id is None:
+            # only read the entries of sharded fields once the struct is known
+            struct_dicts = self._kvstore.get_all(collection=self._collection)
+            assert len(struct_dicts) == 1
+            struct_id, struct_dict = next(iter(struct_dicts.items()))
+            return self._load_index_struct(struct_id, struct_dict)
+        else:
+            found_struct_dict = self._kvstore.get(
+                struct_id, collection=self._collection
+            )
+            if found_struct_dict is None:
+                return None
+            return self._load_index_struct(struct_id, found_struct_dict)
+
+    def index_structs(self) -> List[IndexStruct]:
+        """Get all index structs.
+
+        Returns:
+            List[IndexStruct]: index structs
+
+        """
+        struct_dicts = self._kvstore.get_all(collection=self._collection)
+        return [
+            self._load_index_struct(struct_id, struct_dict)
+            for struct_id, struct_dict in struct_dicts.items()
+        ]
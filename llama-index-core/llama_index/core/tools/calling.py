@@ -1,7 +1,11 @@
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS
 from llama_index.core.tools.types import BaseTool, ToolOutput, adapt_to_async_tool
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Sequence
 from llama_index.core.llms.llm import ToolSelection
+import asyncio
+import contextvars
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 if TYPE_CHECKING:
     from llama_index.core.tools.types import BaseTool
@@ -52,7 +56,7 @@ async def acall_tool(tool: BaseTool, arguments: dict) -> ToolOutput:
 
 def call_tool_with_selection(
     tool_call: ToolSelection,
-    tools: List["BaseTool"],
+    tools: Sequence["BaseTool"],
     verbose: bool = False,
 ) -> ToolOutput:
     from llama_index.core.tools.calling import call_tool
@@ -75,7 +79,7 @@ def call_tool_with_selection(
 
 async def acall_tool_with_selection(
     tool_call: ToolSelection,
-    tools: List["BaseTool"],
+    tools: Sequence["BaseTool"],
     verbose: bool = False,
 ) -> ToolOutput:
     from llama_index.core.tools.calling import acall_tool
@@ -94,3 +98,59 @@ async def acall_tool_with_selection(
         print(output.content)
 
     return output
+
+
+def run_tool_calls(
+    tool_calls: Sequence[ToolSelection],
+    call_fn: Callable[[ToolSelection], ToolOutput],
+    num_workers: int = DEFAULT_NUM_WORKERS,
+) -> List[ToolOutput]:
+    """Run tool calls with `call_fn` on a thread pool.
+
+    Outputs are returned in the order of `tool_calls`. Each call runs in a
+    copy of the caller's context, so callback traces nest as if run inline.
+    """
+    if num_workers <= 1 or len(tool_calls) <= 1:
+        return [call_fn(tool_call) for tool_call in tool_calls]
+
+    with ThreadPoolExecutor(max_workers=min(num_workers, len(tool_calls))) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, call_fn, tool_call)
+            for tool_call in tool_calls
+        ]
+        return [future.result() for future in futures]
+
+
+async def arun_tool_calls(
+    tool_calls: Sequence[ToolSelection],
+    acall_fn: Callable[[ToolSelection], Awaitable[ToolOutput]],
+    num_workers: Optional[int] = DEFAULT_NUM_WORKERS,
+    timeout: Optional[float] = None,
+) -> List[ToolOutput]:
+    """Run tool calls with `acall_fn` concurrently.
+
+    At most `num_workers` calls run at once (unbounded if None), and outputs
+    are returned in the order of `tool_calls`. A call taking longer than
+    `timeout` seconds is cancelled, and returns an error output.
+    """
+    semaphore = asyncio.Semaphore(num_workers) if num_workers else None
+
+    async def _acall(tool_call: ToolSelection) -> ToolOutput:
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            return await asyncio.wait_for(acall_fn(tool_call), timeout=timeout)
+        except asyncio.TimeoutError:
+            message = f"Tool call timed out after {timeout} seconds."
+            return ToolOutput(
+                content="Encountered error: " + message,
+                tool_name=tool_call.tool_name,
+                raw_input=tool_call.tool_kwargs,
+                raw_output=message,
+                is_error=True,
+            )
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    return await asyncio.gather(*[_acall(tool_call) for tool_call in tool_calls])
@@ -1,14 +1,23 @@
 """Query plan tool."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from llama_index.core.async_utils import DEFAULT_NUM_WORKERS
 from llama_index.core.bridge.pydantic import BaseModel, Field
 from llama_index.core.response_synthesizers import (
     BaseSynthesizer,
     get_response_synthesizer,
 )
 from llama_index.core.schema import NodeWithScore, TextNode
-from llama_index.core.tools.types import BaseTool, ToolMetadata, ToolOutput
+from llama_index.core.tools.types import (
+    AsyncBaseTool,
+    BaseTool,
+    ToolMetadata,
+    ToolOutput,
+)
 from llama_index.core.utils import print_text
 
 DEFAULT_NAME = "query_plan_tool"
@@ -79,11 +88,16 @@ The tool names and descriptions are as follows:
 """
 
 
-class QueryPlanTool(BaseTool):
+class QueryPlanTool(AsyncBaseTool):
     """Query plan tool.
 
     A tool that takes in a list of tools and executes a query plan.
 
+    The plan is executed as a DAG: each query node runs once, even if several
+    nodes depend on it, and starts as soon as its dependencies are answered.
+    Independent nodes run concurrently, on up to `num_workers` threads when
+    called synchronously.
+
     """
 
     def __init__(
@@ -92,12 +106,14 @@ class QueryPlanTool(BaseTool):
         response_synthesizer: BaseSynthesizer,
         name: str,
         description_prefix: str,
+        num_workers: int = DEFAULT_NUM_WORKERS,
     ) -> None:
         """Initialize."""
         self._query_tools_dict = {t.metadata.name: t for t in query_engine_tools}
         self._response_synthesizer = response_synthesizer
         self._name = name
         self._description_prefix = description_prefix
+        self._num_workers = num_workers
 
     @classmethod
     def from_defaults(
@@ -106,6 +122,7 @@ class QueryPlanTool(BaseTool):
         response_synthesizer: Optional[BaseSynthesizer] = None,
         name: Optional[str] = None,
         description_prefix: Optional[str] = None,
+        num_workers: int = DEFAULT_NUM_WORKERS,
     ) -> "QueryPlanTool":
         """Initialize from defaults."""
         name = name or DEFAULT_NAME
@@ -117,6 +134,7 @@ class QueryPlanTool(BaseTool):
             response_synthesizer=response_synthesizer,
             name=name,
             description_prefix=description_prefix,
+            num_workers=num_workers,
         )
 
     @property
@@ -136,40 +154,43 @@ class QueryPlanTool(BaseTool):
         """
         return ToolMetadata(description, self._name, fn_schema=QueryPlan)
 
-    def _execute_node(
-        self, node: QueryNode, nodes_dict: Dict[int, QueryNode]
+    def _get_child_nodes(
+        self,
+        node: QueryNode,
+        nodes_dict: Dict[int, QueryNode],
+        outputs: Dict[int, ToolOutput],
+    ) -> List[NodeWithScore]:
+        """Get the answers of a node's dependencies as nodes to synthesize."""
+        print_text(f"Executing {len(node.dependencies)} child nodes\n", color="pink")
+        child_nodes = []
+        for dep in node.dependencies:
+            node_text = (
+                f"Query: {nodes_dict[dep].query_str}\n" f"Response: {outputs[dep]!s}\n"
+            )
+            child_nodes.append(NodeWithScore(node=TextNode(text=node_text), score=1.0))
+        return child_nodes
+
+    def _print_response(self, node: QueryNode, response: ToolOutput) -> None:
+        print_text(
+            "Executed query, got response.\n"
+            f"Query: {node.query_str}\n"
+            f"Response: {response!s}\n",
+            color="blue",
+        )
+
+    def _run_node(
+        self,
+        node: QueryNode,
+        nodes_dict: Dict[int, QueryNode],
+        outputs: Dict[int, ToolOutput],
     ) -> ToolOutput:
-        """Execute node."""
+        """Run a node, whose dependencies have outputs."""
         print_text(f"Executing node {node.json()}\n", color="blue")
         if len(node.dependencies) > 0:
-            print_text(
-                f"Executing {len(node.dependencies)} child nodes\n", color="pink"
-            )
-            child_query_nodes: List[QueryNode] = [
-                nodes_dict[dep] for dep in node.dependencies
-            ]
-            # execute the child nodes first
-            child_responses: List[ToolOutput] = [
-                self._execute_node(child, nodes_dict) for child in child_query_nodes
-            ]
-            # form the child Node/NodeWithScore objects
-            child_nodes = []
-            for child_query_node, child_response in zip(
-                child_query_nodes, child_responses
-            ):
-                node_text = (
-                    f"Query: {child_query_node.query_str}\n"
-                    f"Response: {child_response!s}\n"
-                )
-                child_node = TextNode(text=node_text)
-                child_nodes.append(child_node)
             # use response synthesizer to combine results
-            child_nodes_with_scores = [
-                NodeWithScore(node=n, score=1.0) for n in child_nodes
-            ]
             response_obj = self._response_synthesizer.synthesize(
                 query=node.query_str,
-                nodes=child_nodes_with_scores,
+                nodes=self._get_child_nodes(node, nodes_dict, outputs),
             )
             response = ToolOutput(
                 content=str(response_obj),
@@ -177,20 +198,151 @@ class QueryPlanTool(BaseTool):
                 raw_input={"query": node.query_str},
                 raw_output=response_obj,
             )
-
         else:
             # this is a leaf request, execute the query string using the specified tool
             tool = self._query_tools_dict[node.tool_name]
             print_text(f"Selected Tool: {tool.metadata}\n", color="pink")
             response = tool(node.query_str)
-        print_text(
-            "Executed query, got response.\n"
-            f"Query: {node.query_str}\n"
-            f"Response: {response!s}\n",
-            color="blue",
-        )
+        self._print_response(node, response)
+        return response
+
+    async def _arun_node(
+        self,
+        node: QueryNode,
+        nodes_dict: Dict[int, QueryNode],
+        outputs: Dict[int, ToolOutput],
+    ) -> ToolOutput:
+        """Run a node, whose dependencies have outputs (async)."""
+        print_text(f"Executing node {node.json()}\n", color="blue")
+        if len(node.dependencies) > 0:
+            response_obj = await self._response_synthesizer.asynthesize(
+                query=node.query_str,
+                nodes=self._get_child_nodes(node, nodes_dict, outputs),
+            )
+            response = ToolOutput(
+                content=str(response_obj),
+                tool_name=node.query_str,
+                raw_input={"query": node.query_str},
+                raw_output=response_obj,
+            )
+        else:
+            tool = self._query_tools_dict[node.tool_name]
+            print_text(f"Selected Tool: {tool.metadata}\n", color="pink")
+            if isinstance(tool, AsyncBaseTool):
+                response = await tool.acall(node.query_str)
+            else:
+                # sync tools run on the default executor, not the event loop
+                response = await asyncio.get_running_loop().run_in_executor(
+                    None, contextvars.copy_context().run, tool, node.query_str
+                )
+        self._print_response(node, response)
         return response
 
+    def _get_plan_graph(
+        self, root_node: QueryNode, nodes_dict: Dict[int, QueryNode]
+    ) -> Tuple[Dict[int, Set[int]], Dict[int, List[int]]]:
+        """Get the unmet dependencies and dependents of nodes below the root."""
+        pending_deps: Dict[int, Set[int]] = {}
+        dependents: Dict[int, List[int]] = {}
+        stack = [root_node.id]
+        while stack:
+            node_id = stack.pop()
+            if node_id in pending_deps:
+                continue
+            deps = set(nodes_dict[node_id].dependencies)
+            pending_deps[node_id] = deps
+            dependents.setdefault(node_id, [])
+            for dep in deps:
+                dependents.setdefault(dep, []).append(node_id)
+                stack.append(dep)
+        return pending_deps, dependents
+
+    def _get_ready_dependents(
+        self,
+        node_id: int,
+        pending_deps: Dict[int, Set[int]],
+        dependents: Dict[int, List[int]],
+    ) -> List[int]:
+        """Mark a node as answered, and get the nodes it made ready."""
+        ready = []
+        for dependent in dependents[node_id]:
+            pending_deps[dependent].discard(node_id)
+            if not pending_deps[dependent]:
+                ready.append(dependent)
+        return ready
+
+    def _execute_node(
+        self, node: QueryNode, nodes_dict: Dict[int, QueryNode]
+    ) -> ToolOutput:
+        """Execute node, after the nodes it depends on."""
+        pending_deps, dependents = self._get_plan_graph(node, nodes_dict)
+        outputs: Dict[int, ToolOutput] = {}
+
+        with ThreadPoolExecutor(max_workers=max(self._num_workers, 1)) as pool:
+            futures: Dict[Future, int] = {}
+
+            def _submit(node_id: int) -> None:
+                future = pool.submit(
+                    contextvars.copy_context().run,
+                    self._run_node,
+                    nodes_dict[node_id],
+                    nodes_dict,
+                    outputs,
+                )
+                futures[future] = node_id
+
+            for node_id, deps in pending_deps.items():
+                if not deps:
+                    _submit(node_id)
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = futures.pop(future)
+                    outputs[node_id] = future.result()
+                    for ready_id in self._get_ready_dependents(
+                        node_id, pending_deps, dependents
+                    ):
+                        _submit(ready_id)
+
+        if node.id not in outputs:
+            raise ValueError("Query plan dependencies should not have cycles.")
+        return outputs[node.id]
+
+    async def _aexecute_node(
+        self, node: QueryNode, nodes_dict: Dict[int, QueryNode]
+    ) -> ToolOutput:
+        """Execute node, after the nodes it depends on (async)."""
+        pending_deps, dependents = self._get_plan_graph(node, nodes_dict)
+        outputs: Dict[int, ToolOutput] = {}
+        tasks: Dict["asyncio.Future[ToolOutput]", int] = {}
+
+        def _submit(node_id: int) -> None:
+            task = asyncio.ensure_future(
+                self._arun_node(nodes_dict[node_id], nodes_dict, outputs)
+            )
+            tasks[task] = node_id
+
+        for node_id, deps in pending_deps.items():
+            if not deps:
+                _submit(node_id)
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = tasks.pop(task)
+                    outputs[node_id] = task.result()
+                    for ready_id in self._get_ready_dependents(
+                        node_id, pending_deps, dependents
+                    ):
+                        _submit(ready_id)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if node.id not in outputs:
+            raise ValueError("Query plan dependencies should not have cycles.")
+        return outputs[node.id]
+
     def _find_root_nodes(self, nodes_dict: Dict[int, QueryNode]) -> List[QueryNode]:
         """Find root node."""
         # the root node is the one that isn't a dependency of any other node
@@ -203,15 +355,23 @@ class QueryPlanTool(BaseTool):
         ]
         return [nodes_dict[node_id] for node_id in root_node_ids]
 
-    def __call__(self, *args: Any, **kwargs: Any) -> ToolOutput:
-        """Call."""
+    def _get_root_node(self, **kwargs: Any) -> Tuple[QueryNode, Dict[int, QueryNode]]:
         # the kwargs represented as a JSON object
         # should be a QueryPlan object
         query_plan = QueryPlan(**kwargs)
 
         nodes_dict = {node.id: node for node in query_plan.nodes}
         root_nodes = self._find_root_nodes(nodes_dict)
-        if len(root_nodes) > 1:
+        if len(root_nodes) != 1:
             raise ValueError("Query plan should have exactly one root node.")
+        return root_nodes[0], nodes_dict
+
+    def call(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        """Call."""
+        root_node, nodes_dict = self._get_root_node(**kwargs)
+        return self._execute_node(root_node, nodes_dict)
 
-        return self._execute_node(root_nodes[0], nodes_dict)
+    async def acall(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        """Call (async)."""
+        root_node, nodes_dict = self._get_root_node(**kwargs)
+        return await self._aexecute_node(root_node, nodes_dict)
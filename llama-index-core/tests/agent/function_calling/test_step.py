@@ -0,0 +1,96 @@
+"""Test function calling agent worker."""
+
+import asyncio
+import time
+from typing import Any, List, Optional, Union
+
+from llama_index.core.agent.function_calling.step import FunctionCallingAgentWorker
+from llama_index.core.agent.runner.base import AgentRunner
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    LLMMetadata,
+    MessageRole,
+)
+from llama_index.core.llms.function_calling import FunctionCallingLLM
+from llama_index.core.llms.llm import ToolSelection
+from llama_index.core.llms.mock import MockLLM
+from llama_index.core.tools import BaseTool, FunctionTool
+
+
+class MockFunctionCallingLLM(MockLLM, FunctionCallingLLM):
+    """Calls the `wait` tool three times, then answers with the tool outputs."""
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(is_function_calling_model=True)
+
+    def chat_with_tools(
+        self,
+        tools: List["BaseTool"],
+        user_msg: Optional[Union[str, ChatMessage]] = None,
+        chat_history: Optional[List[ChatMessage]] = None,
+        verbose: bool = False,
+        allow_parallel_tool_calls: bool = False,
+        **kwargs: Any,
+    ) -> ChatResponse:
+        tool_messages = [m for m in chat_history or [] if m.role == MessageRole.TOOL]
+        if tool_messages:
+            content = ",".join(str(m.content) for m in tool_messages)
+            return ChatResponse(
+                message=ChatMessage(role=MessageRole.ASSISTANT, content=content)
+            )
+        tool_calls = [
+            ToolSelection(tool_id=str(i), tool_name="wait", tool_kwargs={"i": i})
+            for i in range(3)
+        ]
+        return ChatResponse(
+            message=ChatMessage(
+                role=MessageRole.ASSISTANT,
+                content="",
+                additional_kwargs={"tool_calls": tool_calls},
+            )
+        )
+
+    async def achat_with_tools(self, *args: Any, **kwargs: Any) -> ChatResponse:
+        return self.chat_with_tools(*args, **kwargs)
+
+    def get_tool_calls_from_response(
+        self, response: Any, error_on_no_tool_call: bool = True, **kwargs: Any
+    ) -> List[ToolSelection]:
+        return response.message.additional_kwargs.get("tool_calls", [])
+
+
+def wait(i: int) -> str:
+    """Wait, and return i."""
+    # later calls finish first
+    time.sleep(0.1 * (3 - i))
+    return str(i)
+
+
+async def await_(i: int) -> str:
+    """Wait, and return i."""
+    await asyncio.sleep(0.1 * (3 - i))
+    return str(i)
+
+
+def test_run_tool_calls_in_parallel() -> None:
+    tool = FunctionTool.from_defaults(fn=wait, async_fn=await_)
+    agent = AgentRunner(
+        FunctionCallingAgentWorker.from_tools(
+            [tool], llm=MockFunctionCallingLLM(), num_workers=3
+        )
+    )
+
+    start = time.perf_counter()
+    response = agent.chat("hello")
+    assert time.perf_counter() - start < 0.5
+    # tool outputs are in memory in call order
+    assert str(response) == "assistant: 0,1,2"
+    assert [source.content for source in response.sources] == ["0", "1", "2"]
+
+    agent.reset()
+    start = time.perf_counter()
+    response = asyncio.run(agent.achat("hello"))
+    assert time.perf_counter() - start < 0.5
+    assert [source.content for source in response.sources] == ["0", "1", "2"]
@@ -0,0 +1,168 @@
+"""Test parallel agent runner."""
+
+import asyncio
+import uuid
+from typing import Any, Dict, List
+
+import llama_index.core.instrumentation as instrument
+from llama_index.core.agent.function_calling.step import FunctionCallingAgentWorker
+from llama_index.core.agent.runner.parallel import ParallelAgentRunner
+from llama_index.core.agent.types import (
+    BaseAgentWorker,
+    Task,
+    TaskStep,
+    TaskStepOutput,
+)
+from llama_index.core.chat_engine.types import AgentChatResponse
+from llama_index.core.instrumentation.event_handlers import MetricsEventHandler
+from llama_index.core.tools import FunctionTool
+from tests.agent.function_calling.test_step import (
+    MockFunctionCallingLLM,
+    await_,
+    wait,
+)
+
+dispatcher = instrument.get_dispatcher("llama_index.core.agent.runner.parallel")
+
+
+class MockDAGWorker(BaseAgentWorker):
+    """Mock agent worker running steps described by `plan`.
+
+    `plan` maps a step name to its sleep time, tool, next step names and
+    whether it is last.
+    """
+
+    def __init__(self, plan: Dict[str, Dict[str, Any]]) -> None:
+        self.plan = plan
+        self.started: List[str] = []
+        self.cancelled: List[str] = []
+        self.num_active = 0
+        self.max_active = 0
+
+    def _new_step(self, task_id: str, name: str) -> TaskStep:
+        return TaskStep(
+            task_id=task_id,
+            step_id=str(uuid.uuid4()),
+            step_state={"name": name, "tool_name": self.plan[name].get("tool")},
+        )
+
+    def initialize_step(self, task: Task, **kwargs: Any) -> TaskStep:
+        return self._new_step(task.task_id, "root")
+
+    def run_step(self, step: TaskStep, task: Task, **kwargs: Any) -> TaskStepOutput:
+        raise NotImplementedError
+
+    async def arun_step(
+        self, step: TaskStep, task: Task, **kwargs: Any
+    ) -> TaskStepOutput:
+        name = step.step_state["name"]
+        spec = self.plan[name]
+        self.started.append(name)
+        self.num_active += 1
+        self.max_active = max(self.max_active, self.num_active)
+        try:
+            await asyncio.sleep(spec.get("sleep", 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        finally:
+            self.num_active -= 1
+        return TaskStepOutput(
+            output=AgentChatResponse(response=name),
+            task_step=step,
+            is_last=spec.get("is_last", False),
+            next_steps=[
+                self._new_step(task.task_id, next_name)
+                for next_name in spec.get("next", [])
+            ],
+        )
+
+    def stream_step(self, step: TaskStep, task: Task, **kwargs: Any) -> TaskStepOutput:
+        raise NotImplementedError
+
+    async def astream_step(
+        self, step: TaskStep, task: Task, **kwargs: Any
+    ) -> TaskStepOutput:
+        raise NotImplementedError
+
+    def finalize_task(self, task: Task, **kwargs: Any) -> None:
+        """Finalize task."""
+
+
+def test_ready_steps_run_without_waiting_for_siblings() -> None:
+    worker = MockDAGWorker(
+        {
+            "root": {"next": ["slow", "fast"]},
+            "slow": {"sleep": 10, "is_last": True},
+            "fast": {"sleep": 0.01, "next": ["fast2"]},
+            "fast2": {"sleep": 0.01, "is_last": True},
+        }
+    )
+    agent_runner = ParallelAgentRunner(agent_worker=worker)
+
+    response = agent_runner.chat("hello world")
+
+    assert str(response) == "fast2"
+    assert worker.started == ["root", "slow", "fast", "fast2"]
+    assert worker.cancelled == ["slow"]
+
+
+def test_tool_concurrency_limits_and_metrics() -> None:
+    worker = MockDAGWorker(
+        {
+            "root": {"next": ["a", "b", "c", "d"]},
+            "a": {"sleep": 0.01, "tool": "search"},
+            "b": {"sleep": 0.01, "tool": "search"},
+            "c": {"sleep": 0.01, "tool": "search"},
+            "d": {"sleep": 0.05, "tool": "search", "next": ["done"]},
+            "done": {"is_last": True},
+        }
+    )
+    agent_runner = ParallelAgentRunner(
+        agent_worker=worker, tool_concurrency_limits={"search": 2}
+    )
+    event_handler = MetricsEventHandler()
+    dispatcher.event_handlers = [event_handler]
+    try:
+        response = asyncio.run(agent_runner.achat("hello world"))
+    finally:
+        dispatcher.event_handlers = []
+
+    assert str(response) == "done"
+    assert worker.max_active == 2
+
+    snapshot = event_handler.registry.snapshot()
+    (queue_depth,) = snapshot["histograms"]["llama_index_agent_step_queue_depth"]
+    assert queue_depth["max"] == 4
+    durations = {
+        h["labels"]["tool"]: h["count"]
+        for h in snapshot["histograms"]["llama_index_agent_step_duration_seconds"]
+    }
+    assert durations == {"": 2, "search": 4}
+
+
+def test_step_metrics_with_function_calling_worker() -> None:
+    """Test steps of a worker calling tools within steps are not labelled."""
+    tool = FunctionTool.from_defaults(fn=wait, async_fn=await_)
+    agent_runner = ParallelAgentRunner(
+        agent_worker=FunctionCallingAgentWorker.from_tools(
+            [tool], llm=MockFunctionCallingLLM()
+        ),
+        tool_concurrency_limits={"wait": 1},
+    )
+    event_handler = MetricsEventHandler()
+    dispatcher.event_handlers = [event_handler]
+    try:
+        response = asyncio.run(agent_runner.achat("hello"))
+    finally:
+        dispatcher.event_handlers = []
+
+    assert str(response) == "assistant: 0,1,2"
+    snapshot = event_handler.registry.snapshot()
+    durations = {
+        h["labels"]["tool"]: h["count"]
+        for h in snapshot["histograms"]["llama_index_agent_step_duration_seconds"]
+    }
+    # the sources of the task are shared with concurrent steps, so the tool
+    # the first step called is not credited to it
+    assert durations == {"": 2}
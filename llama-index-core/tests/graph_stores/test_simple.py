@@ -0,0 +1,150 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from llama_index.core.graph_stores.simple import SimpleGraphStore, SimpleGraphStoreData
+from llama_index.core.graph_stores.types import GraphStore, upsert_triplets
+
+
+def test_upsert_and_delete() -> None:
+    graph_store = SimpleGraphStore()
+    graph_store.upsert_triplet("a", "knows", "b")
+    graph_store.upsert_triplet("a", "knows", "b")
+    graph_store.upsert_triplets([("a", "likes", "b"), ("c", "knows", "b")])
+
+    assert graph_store.get("a") == [["knows", "b"], ["likes", "b"]]
+    assert graph_store._data.get_subjects("b") == ["a", "c"]
+
+    graph_store.delete("a", "knows", "b")
+    assert graph_store.get("a") == [["likes", "b"]]
+    assert graph_store._data.get_subjects("b") == ["a", "c"]
+
+    graph_store.delete("a", "likes", "b")
+    graph_store.delete("a", "likes", "b")
+    assert graph_store.get("a") == []
+    assert graph_store._data.get_subjects("b") == ["c"]
+    assert graph_store.to_dict() == {"graph_dict": {"c": [["knows", "b"]]}}
+
+
+def test_graph_dict_updated_on_write() -> None:
+    data = SimpleGraphStoreData(graph_dict={"a": [["knows", "b"], ["knows", "b"]]})
+    assert data.graph_dict == {"a": [["knows", "b"]]}
+
+    data.add("a", "likes", "c")
+    data.add("c", "knows", "b")
+    assert data.graph_dict == {
+        "a": [["knows", "b"], ["likes", "c"]],
+        "c": [["knows", "b"]],
+    }
+    assert data == SimpleGraphStoreData.from_dict(data.to_dict())
+
+    data.remove("c", "knows", "b")
+    assert data.graph_dict == {"a": [["knows", "b"], ["likes", "c"]]}
+
+    # the last edge takes the place of a removed one
+    data.add("a", "hates", "d")
+    data.remove("a", "knows", "b")
+    assert data.graph_dict == {"a": [["hates", "d"], ["likes", "c"]]}
+    data.remove("a", "hates", "d")
+    assert data.get("a") == [["likes", "c"]]
+    assert data != SimpleGraphStoreData()
+
+
+def test_get_rel_map_cycles_and_limit() -> None:
+    graph_store = SimpleGraphStore()
+    graph_store.upsert_triplets(
+        [
+            ("a", "r1", "b"),
+            ("a", "r2", "c"),
+            ("b", "r3", "a"),
+            ("b", "r4", "d"),
+            ("c", "r5", "d"),
+            ("d", "r6", "e"),
+        ]
+    )
+
+    # breadth-first, each entity expanded once
+    assert graph_store.get_rel_map(["a"], depth=10) == {
+        "a": [
+            ["a", "r1", "b"],
+            ["a", "r2", "c"],
+            ["b", "r3", "a"],
+            ["b", "r4", "d"],
+            ["c", "r5", "d"],
+            ["d", "r6", "e"],
+        ]
+    }
+    assert graph_store.get_rel_map(["a"], depth=1) == {
+        "a": [["a", "r1", "b"], ["a", "r2", "c"]]
+    }
+    # the limit applies to all subjects together
+    assert graph_store.get_rel_map(["d", "a"], depth=2, limit=3) == {
+        "d": [["d", "r6", "e"]],
+        "a": [["a", "r1", "b"], ["a", "r2", "c"]],
+    }
+
+
+def test_get_rel_map_hub_does_not_crowd_out_subjects() -> None:
+    graph_store = SimpleGraphStore()
+    graph_store.upsert_triplets([("A", "r", f"x{i}") for i in range(100)])
+    graph_store.upsert_triplets([("B", "r", f"y{i}") for i in range(5)])
+
+    rel_map = graph_store.get_rel_map(["A", "B"], depth=2, limit=60)
+    assert list(rel_map) == ["A", "B"]
+    assert len(rel_map["A"]) == 55
+    assert rel_map["B"] == [["B", "r", f"y{i}"] for i in range(5)]
+
+
+def test_persist_and_load(tmp_path) -> None:
+    graph_store = SimpleGraphStore()
+    graph_store.upsert_triplets([("a", "r1", "b"), ("b", "r2", "c")])
+    persist_path = str(tmp_path / "graph_store.json")
+    graph_store.persist(persist_path)
+
+    with open(persist_path) as f:
+        assert json.load(f) == {"graph_dict": {"a": [["r1", "b"]], "b": [["r2", "c"]]}}
+
+    loaded = SimpleGraphStore.from_persist_path(persist_path)
+    assert loaded.get_rel_map(["a"]) == graph_store.get_rel_map(["a"])
+    assert loaded._data.get_subjects("c") == ["b"]
+
+
+def test_upsert_triplets_without_bulk_writes() -> None:
+    class _DuckGraphStore:
+        """Graph store defining only the protocol members."""
+
+        schema = ""
+
+        def __init__(self) -> None:
+            self.triplets: List[Tuple[str, str, str]] = []
+
+        @property
+        def client(self) -> Any:
+            return None
+
+        def get(self, subj: str) -> List[List[str]]:
+            return []
+
+        def get_rel_map(
+            self, subjs: Optional[List[str]] = None, depth: int = 2, limit: int = 30
+        ) -> Dict[str, List[List[str]]]:
+            return {}
+
+        def upsert_triplet(self, subj: str, rel: str, obj: str) -> None:
+            self.triplets.append((subj, rel, obj))
+
+        def delete(self, subj: str, rel: str, obj: str) -> None:
+            pass
+
+        def persist(self, persist_path: str, fs: Any = None) -> None:
+            pass
+
+        def get_schema(self, refresh: bool = False) -> str:
+            return ""
+
+        def query(self, query: str, param_map: Optional[Dict[str, Any]] = {}) -> Any:
+            return None
+
+    graph_store = _DuckGraphStore()
+    assert isinstance(graph_store, GraphStore)
+    upsert_triplets(graph_store, [("a", "likes", "b"), ("c", "knows", "b")])
+    assert graph_store.triplets == [("a", "likes", "b"), ("c", "knows", "b")]
@@ -1,13 +1,15 @@
 """Test keyword table index."""
 
-from typing import Any, List
+import asyncio
+from typing import Any, List, Set
 from unittest.mock import patch
 
 import pytest
 from llama_index.core.indices.keyword_table.simple_base import (
     SimpleKeywordTableIndex,
 )
-from llama_index.core.schema import Document
+from llama_index.core.indices.keyword_table.utils import simple_extract_keywords
+from llama_index.core.schema import Document, TextNode
 from llama_index.core.service_context import ServiceContext
 from tests.mock_utils.mock_utils import mock_extract_keywords
 
@@ -198,3 +200,62 @@ def test_delete(
     nodes = table.docstore.get_nodes(list(table.index_struct.node_ids))
     node_texts = {n.get_content() for n in nodes}
     assert node_texts == {"Hello world.", "This is a test.", "This is a test v2."}
+
+
+class CountingKeywordTableIndex(SimpleKeywordTableIndex):
+    """Keyword table index that counts extractions and concurrent async calls."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.num_calls = 0
+        self.num_running = 0
+        self.max_running = 0
+        super().__init__(*args, **kwargs)
+
+    def _extract_keywords(self, text: str) -> Set[str]:
+        self.num_calls += 1
+        return simple_extract_keywords(text, self.max_keywords_per_chunk)
+
+    async def _async_extract_keywords(self, text: str) -> Set[str]:
+        self.num_running += 1
+        self.max_running = max(self.max_running, self.num_running)
+        await asyncio.sleep(0.01)
+        self.num_running -= 1
+        return self._extract_keywords(text)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_build_table_concurrent_extraction(
+    use_async: bool, mock_service_context: ServiceContext
+) -> None:
+    """Test keyword extraction is concurrent and cached per text."""
+    texts = [f"text number {i}" for i in range(8)]
+    nodes = [TextNode(text=text) for text in texts + texts]
+    table = CountingKeywordTableIndex(
+        nodes,
+        use_async=use_async,
+        num_workers=3,
+        service_context=mock_service_context,
+    )
+    # duplicate texts are only extracted once
+    assert table.num_calls == 8
+    if use_async:
+        assert table.max_running == 3
+    assert len(table.index_struct.table["number"]) == 16
+    assert table.index_struct.table["5"] == {nodes[5].node_id, nodes[13].node_id}
+
+    # inserting a known text hits the cache
+    table.insert_nodes([TextNode(text=texts[0])])
+    assert table.num_calls == 8
+    assert len(table.index_struct.table["0"]) == 3
+
+
+def test_keyword_cache_is_bounded(mock_service_context: ServiceContext) -> None:
+    """Test the keyword cache is cleared once full."""
+    with patch("llama_index.core.indices.keyword_table.base.KEYWORD_CACHE_SIZE", 4):
+        table = CountingKeywordTableIndex(
+            [TextNode(text=f"text number {i}") for i in range(10)],
+            num_workers=1,
+            service_context=mock_service_context,
+        )
+    assert len(table._keyword_cache) == 2
+    assert len(table.index_struct.table["number"]) == 10
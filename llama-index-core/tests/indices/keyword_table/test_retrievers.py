@@ -1,10 +1,11 @@
 from typing import List
 from unittest.mock import patch
 
+from llama_index.core.data_structs.data_structs import KeywordTable
 from llama_index.core.indices.keyword_table.simple_base import (
     SimpleKeywordTableIndex,
 )
-from llama_index.core.schema import Document, QueryBundle
+from llama_index.core.schema import Document, QueryBundle, TextNode
 from llama_index.core.service_context import ServiceContext
 from tests.mock_utils.mock_utils import mock_extract_keywords
 
@@ -32,3 +33,56 @@ def test_retrieve(
     nodes = retriever.retrieve(QueryBundle("Hello"))
     assert len(nodes) == 1
     assert nodes[0].node.get_content() == "Hello world."
+
+
+def test_keyword_table_postings() -> None:
+    """Test top node counting over the posting lists of a keyword table."""
+    table = KeywordTable()
+    table.add_node(["a", "b", "c"], TextNode(text="", id_="n1"))
+    table.add_node(["a", "b"], TextNode(text="", id_="n2"))
+    table.add_node(["a"], TextNode(text="", id_="n3"))
+    table.add_node(["b", "c"], TextNode(text="", id_="n0"))
+
+    postings = table.get_postings()
+    assert postings.get_postings("a").tolist() == [1, 2, 3]
+    assert postings.top_nodes(["a", "b", "c"], 3) == [("n1", 3), ("n0", 2), ("n2", 2)]
+    assert postings.top_nodes(["a", "b", "c"], 1) == [("n1", 3)]
+    assert postings.top_nodes(["a", "a"], 10) == [("n1", 2), ("n2", 2), ("n3", 2)]
+    assert postings.top_nodes(["missing"], 10) == []
+
+    # postings are rebuilt after the table changes
+    table.delete_node("n1")
+    assert table.get_postings().top_nodes(["c"], 10) == [("n0", 1)]
+    assert table.node_ids == {"n0", "n2", "n3"}
+    assert "a" in table.keywords
+
+
+def test_keyword_table_changes_without_rebuild() -> None:
+    """Test matching keywords changed since the posting lists were built."""
+    table = KeywordTable()
+    table.add_node(["a", "b"], TextNode(text="", id_="n1"))
+    table.add_node(["a"], TextNode(text="", id_="n2"))
+    postings = table.get_postings()
+
+    table.add_node(["b", "c"], TextNode(text="", id_="n0"))
+    table.delete_node("n2")
+    # direct writes to the table are matched too
+    table.table["d"] = {"n1", "n3"}
+    assert table.top_nodes(["a", "b", "c", "d"], 10) == [
+        ("n1", 3),
+        ("n0", 2),
+        ("n3", 1),
+    ]
+    assert table.top_nodes(["a", "b", "c", "d"], 2) == [("n1", 3), ("n0", 2)]
+    assert table.top_nodes(["c", "c"], 1) == [("n0", 2)]
+    # pending changes are only merged when getting the posting lists
+    assert table._postings is postings
+    assert table.get_postings() is not postings
+
+    postings = table.get_postings()
+    assert table.top_nodes(["a"], 10) == [("n1", 1)]
+    assert table.get_postings() is postings
+
+    # replacing the table drops the posting lists
+    table.table = {"a": {"n4"}}
+    assert table.top_nodes(["a", "b"], 10) == [("n4", 1)]
@@ -1,10 +1,13 @@
 """Test knowledge graph index."""
 
+import asyncio
+import threading
 from typing import Any, Dict, List, Tuple
 from unittest.mock import patch
 
 import pytest
 from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.graph_stores.simple import SimpleGraphStore
 from llama_index.core.indices.knowledge_graph.base import KnowledgeGraphIndex
 from llama_index.core.schema import Document, TextNode
 from llama_index.core.service_context import ServiceContext
@@ -235,3 +238,77 @@ def test__parse_triplet_response(
     assert ("Foo", "Is", "Bar") in parsed_triplets[0]
     assert ("Hello", "Is not", "World") in parsed_triplets[0]
     assert ("Jane", "Is mother of", "Bob") in parsed_triplets[0]
+
+
+def test_build_kg_async_batched_embeddings(
+    mock_service_context: ServiceContext,
+) -> None:
+    """Test async triplet extraction with deduplicated, batched embeddings."""
+    running = 0
+    max_running = 0
+
+    async def _allm_extract_triplets(
+        self: Any, text: str
+    ) -> List[Tuple[str, str, str]]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return mock_extract_triplets(text)
+
+    embed_model = MockEmbedding()
+    nodes = [
+        TextNode(text="(foo, is, bar)\n(hello, is not, world)"),
+        TextNode(text="(foo, is, bar)"),
+        TextNode(text="(Jane, is mother of, Bob)"),
+    ]
+    with patch.object(
+        KnowledgeGraphIndex, "_allm_extract_triplets", _allm_extract_triplets
+    ), patch.object(
+        MockEmbedding,
+        "_get_text_embeddings",
+        side_effect=lambda texts: [embed_model._get_text_embedding(t) for t in texts],
+    ) as mock_get_text_embeddings, patch.object(
+        SimpleGraphStore, "upsert_triplets", autospec=True
+    ) as mock_upsert_triplets:
+        index = KnowledgeGraphIndex(
+            nodes,
+            service_context=mock_service_context,
+            embed_model=embed_model,
+            include_embeddings=True,
+            use_async=True,
+            num_workers=2,
+        )
+
+    assert max_running == 2
+    assert index.index_struct.table["foo"] == {nodes[0].node_id, nodes[1].node_id}
+    # one bulk upsert and one embedding batch, without duplicate triplets
+    mock_upsert_triplets.assert_called_once()
+    assert mock_upsert_triplets.call_args.args[1] == [
+        ("foo", "is", "bar"),
+        ("hello", "is not", "world"),
+        ("Jane", "is mother of", "Bob"),
+    ]
+    mock_get_text_embeddings.assert_called_once()
+    assert len(index.index_struct.embedding_dict) == 3
+    assert index.index_struct.embedding_dict["('foo', 'is', 'bar')"] == [1, 0, 0, 0]
+
+
+def test_build_kg_async_extract_fn(mock_service_context: ServiceContext) -> None:
+    """Test a sync triplet extraction function runs off the event loop thread."""
+    thread_ids: List[int] = []
+
+    def _extract_triplets(text: str) -> List[Tuple[str, str, str]]:
+        thread_ids.append(threading.get_ident())
+        return mock_extract_triplets(text)
+
+    index = KnowledgeGraphIndex(
+        [TextNode(text="(foo, is, bar)"), TextNode(text="(Jane, is mother of, Bob)")],
+        service_context=mock_service_context,
+        kg_triplet_extract_fn=_extract_triplets,
+        use_async=True,
+    )
+    assert index.index_struct.table["foo"]
+    assert len(thread_ids) == 2
+    assert threading.get_ident() not in thread_ids
@@ -1,10 +1,16 @@
 from typing import Any, List, Tuple
 from unittest.mock import patch
 
+import pytest
+from llama_index.core.data_structs.data_structs import KG
+
 from llama_index.core.graph_stores import SimpleGraphStore
 from llama_index.core.embeddings import BaseEmbedding
 from llama_index.core.indices.knowledge_graph.base import KnowledgeGraphIndex
-from llama_index.core.indices.knowledge_graph.retrievers import KGTableRetriever
+from llama_index.core.indices.knowledge_graph.retrievers import (
+    KGTableRetriever,
+    _remove_substrings,
+)
 from llama_index.core.schema import Document, QueryBundle
 from llama_index.core.service_context import ServiceContext
 from llama_index.core.storage.storage_context import StorageContext
@@ -195,3 +201,38 @@ def test_retrieve_similarity(
         " object_next_hop ...`"
         "\n['foo', 'is', 'bar']"
     )
+
+
+def test_remove_substrings() -> None:
+    rel_texts = [
+        "('foo', 'is', 'bar')",
+        "'foo', 'is'",
+        "('foo', 'is', 'bar')",
+        "('hello', 'is not', 'world')",
+        "hello",
+        "",
+    ]
+    assert _remove_substrings(rel_texts) == [
+        "('hello', 'is not', 'world')",
+        "('foo', 'is', 'bar')",
+    ]
+
+
+def test_kg_get_top_k_embeddings() -> None:
+    index_struct = KG()
+    index_struct.add_to_embedding_dict("a", [1.0, 0.0])
+    index_struct.add_to_embedding_dict("b", [0.0, 2.0])
+    index_struct.add_to_embedding_dict("c", [1.0, 1.0])
+
+    similarities, ids = index_struct.get_top_k_embeddings([0.0, 1.0], 2)
+    assert ids == ["b", "c"]
+    assert similarities == pytest.approx([1.0, 2**-0.5])
+
+    # the cached matrix is refreshed after adding embeddings
+    index_struct.add_to_embedding_dict("d", [-1.0, 3.0])
+    assert index_struct.get_top_k_embeddings([-1.0, 0.0], 10)[1] == [
+        "d",
+        "b",
+        "c",
+        "a",
+    ]
@@ -61,7 +61,7 @@ def test_recursive_query_list_tree(
     query_engine = graph.as_query_engine()
     response = query_engine.query(query_str)
     assert str(response) == (
-        "What is?:What is?:This is a test v2.:This is another test."
+        "What is?:What is?:This is a test v2.\n\nThis is another test."
     )
 
 
@@ -104,7 +104,7 @@ def test_recursive_query_tree_list(
     query_engine = graph.as_query_engine()
     response = query_engine.query(query_str)
     assert str(response) == (
-        "What is?:What is?:This is a test.:What is?:This is a test v2."
+        "What is?:What is?:This is a test.\n\nWhat is?:This is a test v2."
     )
 
 
@@ -140,11 +140,11 @@ def test_recursive_query_table_list(
     query_str = "World?"
     query_engine = graph.as_query_engine()
     response = query_engine.query(query_str)
-    assert str(response) == ("World?:World?:Hello world.:Empty Response")
+    assert str(response) == ("World?:World?:Hello world.\n\nEmpty Response")
 
     query_str = "Test?"
     response = query_engine.query(query_str)
-    assert str(response) == ("Test?:Test?:This is a test.:Test?:This is a test.")
+    assert str(response) == ("Test?:Test?:This is a test.\n\nTest?:This is a test.")
 
 
 def test_recursive_query_list_table(
@@ -188,10 +188,10 @@ def test_recursive_query_list_table(
     query_str = "Foo?"
     query_engine = graph.as_query_engine()
     response = query_engine.query(query_str)
-    assert str(response) == ("Foo?:Foo?:This is a test v2.:This is another test.")
+    assert str(response) == ("Foo?:Foo?:This is a test v2.\n\nThis is another test.")
     query_str = "Orange?"
     response = query_engine.query(query_str)
-    assert str(response) == ("Orange?:Orange?:This is a test.:Hello world.")
+    assert str(response) == ("Orange?:Orange?:This is a test.\n\nHello world.")
     query_str = "Cat?"
     response = query_engine.query(query_str)
-    assert str(response) == ("Cat?:Cat?:This is another test.:This is a test v2.")
+    assert str(response) == ("Cat?:Cat?:This is another test.\n\nThis is a test v2.")
@@ -202,10 +202,10 @@ def test_recursive_query_vector_table_query_configs(
 
     query_engine = graph.as_query_engine(custom_query_engines=custom_query_engines)
     response = query_engine.query("Foo?")  # type: ignore
-    assert str(response) == ("Foo?:Foo?:This is another test.:This is a test v2.")
+    assert str(response) == ("Foo?:Foo?:This is another test.\n\nThis is a test v2.")
 
     response = query_engine.query("Orange?")  # type: ignore
-    assert str(response) == ("Orange?:Orange?:This is a test.:Hello world.")
+    assert str(response) == ("Orange?:Orange?:This is a test.\n\nHello world.")
 
 
 def test_recursive_query_vector_table_async(
@@ -46,11 +46,12 @@ def test_give_response(
     response = builder.get_response(
         text_chunks=[documents[0].get_content()], query_str=query_str
     )
+    # the document fits in the context window, so it is not split
     expected_answer = (
         "What is?:"
-        "Hello world.:"
-        "This is a test.:"
-        "This is another test.:"
+        "Hello world.\n"
+        "This is a test.\n"
+        "This is another test.\n"
         "This is a test v2."
     )
     assert str(response) == expected_answer
@@ -70,10 +71,10 @@ def test_compact_response(mock_service_context: ServiceContext) -> None:
         mock_qa_prompt_tmpl, prompt_type=PromptType.QUESTION_ANSWER
     )
 
-    # max input size is 11, prompt is two tokens (the query) --> 9 tokens
-    # --> padding is 1 --> 8 tokens
+    # max input size is 16, prompt is two tokens (the query) --> 14 tokens
+    # --> padding is 1 --> 13 tokens, leaving room to refine the first answer
     prompt_helper = PromptHelper(
-        context_window=11,
+        context_window=16,
         num_output=0,
         chunk_overlap_ratio=0,
         tokenizer=mock_tokenizer,
@@ -88,7 +89,7 @@ def test_compact_response(mock_service_context: ServiceContext) -> None:
     # outside of compact, assert that chunk size is 4
     assert cur_chunk_size == 4
 
-    # within compact, make sure that chunk size is 8
+    # within compact, each text fills a chunk
     query_str = "What is?"
     texts = [
         "This\n\nis\n\na\n\nbar",
@@ -102,7 +103,7 @@ def test_compact_response(mock_service_context: ServiceContext) -> None:
     )
 
     response = builder.get_response(text_chunks=texts, query_str=query_str)
-    assert str(response) == "What is?:This:is:a:bar:This:is:a:test"
+    assert str(response) == "What is?:This\n\nis\n\na\n\nbar:This\n\nis\n\na\n\ntest"
 
 
 def test_accumulate_response(
@@ -149,17 +150,9 @@ def test_accumulate_response(
 
     response = builder.get_response(text_chunks=texts, query_str=query_str)
     expected = (
-        "Response 1: What is?:This\n"
-        "---------------------\n"
-        "Response 2: What is?:is\n"
-        "---------------------\n"
-        "Response 3: What is?:bar\n"
-        "---------------------\n"
-        "Response 4: What is?:This\n"
-        "---------------------\n"
-        "Response 5: What is?:is\n"
+        "Response 1: What is?:This\nis\nbar\n"
         "---------------------\n"
-        "Response 6: What is?:foo"
+        "Response 2: What is?:This\nis\nfoo"
     )
     assert str(response) == expected
 
@@ -209,17 +202,9 @@ def test_accumulate_response_async(
 
     response = builder.get_response(text_chunks=texts, query_str=query_str)
     expected = (
-        "Response 1: What is?:This\n"
+        "Response 1: What is?:This\nis\nbar\n"
         "---------------------\n"
-        "Response 2: What is?:is\n"
-        "---------------------\n"
-        "Response 3: What is?:bar\n"
-        "---------------------\n"
-        "Response 4: What is?:This\n"
-        "---------------------\n"
-        "Response 5: What is?:is\n"
-        "---------------------\n"
-        "Response 6: What is?:foo"
+        "Response 2: What is?:This\nis\nfoo"
     )
     assert str(response) == expected
 
@@ -274,17 +259,9 @@ def test_accumulate_response_aget(
         )
     )
     expected = (
-        "Response 1: What is?:This\n"
-        "WHATEVER~~~~~~\n"
-        "Response 2: What is?:is\n"
-        "WHATEVER~~~~~~\n"
-        "Response 3: What is?:bar\n"
-        "WHATEVER~~~~~~\n"
-        "Response 4: What is?:This\n"
-        "WHATEVER~~~~~~\n"
-        "Response 5: What is?:is\n"
+        "Response 1: What is?:This\nis\nbar\n"
         "WHATEVER~~~~~~\n"
-        "Response 6: What is?:foo"
+        "Response 2: What is?:This\nis\nfoo"
     )
     assert str(response) == expected
 
@@ -339,7 +339,8 @@ def test_sql_index_with_index_context(
     )
     print(context_response)
     assert (
-        context_response == "Context query?:table_name: test_table:test_table_context"
+        context_response
+        == "Context query?:table_name: test_table\n\ntest_table_context"
     )
     assert sql_context_container.context_str == context_response
 
@@ -186,6 +186,24 @@ def test_repack() -> None:
     assert compacted_chunks == ["Hello\n\nworld\n\nfoo", "Hello\n\nworld\n\nbar"]
 
 
+def test_repack_oversized_chunk() -> None:
+    """Test repack splits only chunks that do not fit on their own."""
+    test_prompt = PromptTemplate("This is the prompt{text}")
+    prompt_helper = PromptHelper(
+        context_window=13,
+        num_output=1,
+        chunk_overlap_ratio=0,
+        tokenizer=mock_tokenizer,
+        separator="\n\n",
+    )
+    text_chunks = ["Hello", "  ", "a\nb\nc\nd\ne", "world"]
+    compacted_chunks = prompt_helper.repack(test_prompt, text_chunks)
+    # chunk size is 3: the oversized chunk is split, the others are kept whole
+    assert compacted_chunks == ["Hello", "a\nb\nc", "d\ne\n\nworld"]
+    assert prompt_helper._token_counts["Hello"] == 1
+    assert prompt_helper.repack(test_prompt, [" "]) == [""]
+
+
 def test_get_biggest_prompt() -> None:
     """Test get_biggest_prompt from PromptHelper."""
     prompt1 = PromptTemplate("This is the prompt{text}")
@@ -1,13 +1,17 @@
 """Test tree index."""
 
 from typing import Any, Dict, List, Optional
-from unittest.mock import patch
 
+import pytest
 from llama_index.core.data_structs.data_structs import IndexGraph
+from llama_index.core.embeddings.mock_embed_model import MockEmbedding
+from llama_index.core.indices.common_tree.base import GPTTreeIndexBuilder
 from llama_index.core.indices.tree.base import TreeIndex
-from llama_index.core.schema import BaseNode, Document
+from llama_index.core.schema import BaseNode, Document, TextNode
 from llama_index.core.service_context import ServiceContext
-from llama_index.core.storage.docstore import BaseDocumentStore
+from llama_index.core.llms.mock import MockLLM
+from llama_index.core.storage.docstore import BaseDocumentStore, SimpleDocumentStore
+from tests.mock_utils.mock_prompts import MOCK_SUMMARY_PROMPT
 
 
 def _get_left_or_right_node(
@@ -82,18 +86,7 @@ def test_build_tree_with_embed(
     assert all_nodes[5].get_content() == ("This is another test.\nThis is a test v2.")
 
 
-OUTPUTS = [
-    ("Hello world.\nThis is a test.", ""),
-    ("This is another test.\nThis is a test v2.", ""),
-]
-
-
-@patch(
-    "llama_index.core.indices.common_tree.base.run_async_tasks",
-    side_effect=[OUTPUTS],
-)
 def test_build_tree_async(
-    _mock_run_async_tasks: Any,
     documents: List[Document],
     mock_service_context: ServiceContext,
     struct_kwargs: Dict,
@@ -215,3 +208,161 @@ def test_twice_insert_empty(
 def _mock_tokenizer(text: str) -> int:
     """Mock tokenizer that splits by spaces."""
     return len(text.split(" "))
+
+
+def test_index_graph_reverse_map() -> None:
+    """Test the node id to index map is kept in sync with all_nodes."""
+    index_graph = IndexGraph()
+    nodes = [TextNode(text=str(i)) for i in range(4)]
+    for node in nodes[:3]:
+        index_graph.insert(node)
+    index_graph.insert_under_parent(nodes[3], nodes[0])
+    assert [index_graph.get_index(node) for node in nodes] == [0, 1, 2, 3]
+    assert index_graph.get_children(nodes[0]) == {3: nodes[3].node_id}
+
+    # overwriting an index drops the previous node id
+    new_node = TextNode(text="new")
+    index_graph.insert(new_node, index=2)
+    assert index_graph.get_index(new_node) == 2
+    assert nodes[2].node_id not in index_graph.node_id_to_index
+
+    # direct changes to all_nodes are picked up
+    index_graph.all_nodes[10] = "other"
+    assert index_graph.node_id_to_index["other"] == 10
+
+    # the reverse map is rebuilt when loading
+    loaded = IndexGraph.from_dict(index_graph.to_dict())
+    assert loaded.node_id_to_index == index_graph.node_id_to_index
+
+
+def _build_tree_with_builder(
+    nodes: List[TextNode], docstore: SimpleDocumentStore, **kwargs: Any
+) -> IndexGraph:
+    builder = GPTTreeIndexBuilder(
+        num_children=2,
+        summary_prompt=MOCK_SUMMARY_PROMPT,
+        llm=MockLLM(),
+        docstore=docstore,
+        **kwargs,
+    )
+    return builder.build_from_nodes(nodes)
+
+
+def test_build_tree_retry_and_embed(
+    monkeypatch: pytest.MonkeyPatch, mock_service_context: ServiceContext
+) -> None:
+    """Test summaries are retried and embedded."""
+    calls: List[str] = []
+
+    def _flaky_predict(self: Any, prompt: Any, **prompt_args: Any) -> str:
+        calls.append(prompt_args["context_str"])
+        if len(calls) == 1:
+            raise ValueError("rate limited")
+        return prompt_args["context_str"]
+
+    monkeypatch.setattr(MockLLM, "predict", _flaky_predict)
+    nodes = [TextNode(text=f"leaf {i}") for i in range(4)]
+    docstore = SimpleDocumentStore()
+    docstore.add_documents(nodes)
+    index_graph = _build_tree_with_builder(
+        nodes, docstore, embed_model=MockEmbedding(embed_dim=3), num_workers=1
+    )
+
+    assert len(calls) == 3
+    assert len(index_graph.root_nodes) == 2
+    for node_id in index_graph.root_nodes.values():
+        assert docstore.get_node(node_id).embedding == [0.5, 0.5, 0.5]
+
+
+def test_build_tree_resume_from_checkpoint(
+    monkeypatch: pytest.MonkeyPatch, mock_service_context: ServiceContext
+) -> None:
+    """Test a failed build resumes from the last completed level."""
+    calls: List[str] = []
+
+    def _predict(self: Any, prompt: Any, **prompt_args: Any) -> str:
+        calls.append(prompt_args["context_str"])
+        # fail when summarizing the second level
+        if len(calls) > 4:
+            raise ValueError("failed")
+        return prompt_args["context_str"]
+
+    monkeypatch.setattr(MockLLM, "predict", _predict)
+    docstore = SimpleDocumentStore()
+    nodes = [TextNode(text=f"leaf {i}") for i in range(8)]
+    docstore.add_documents(nodes)
+    with pytest.raises(ValueError):
+        _build_tree_with_builder(
+            nodes, docstore, checkpoint_id="checkpoint", max_retries=0, num_workers=1
+        )
+    assert len(calls) == 5
+    assert docstore.document_exists("checkpoint")
+
+    # resume with new leaf node ids, only the second level is summarized
+    monkeypatch.setattr(
+        MockLLM,
+        "predict",
+        lambda self, prompt, **prompt_args: calls.append(prompt_args["context_str"])
+        or prompt_args["context_str"],
+    )
+    calls.clear()
+    new_nodes = [TextNode(text=f"leaf {i}") for i in range(8)]
+    docstore.add_documents(new_nodes)
+    index_graph = _build_tree_with_builder(
+        new_nodes, docstore, checkpoint_id="checkpoint"
+    )
+    assert len(calls) == 2
+    assert len(index_graph.all_nodes) == 14
+    assert index_graph.get_index(new_nodes[3]) == 3
+    assert not docstore.document_exists("checkpoint")
+    root_texts = sorted(
+        docstore.get_node(node_id).get_content()
+        for node_id in index_graph.root_nodes.values()
+    )
+    # NOTE: the mock text splitter truncates each child to its first line
+    assert root_texts == ["leaf 0\nleaf 2", "leaf 4\nleaf 6"]
+
+
+def test_build_tree_resume_within_level(
+    monkeypatch: pytest.MonkeyPatch, mock_service_context: ServiceContext
+) -> None:
+    """Test a failed build resumes from the last completed batch of a level."""
+    calls: List[str] = []
+
+    def _predict(self: Any, prompt: Any, **prompt_args: Any) -> str:
+        calls.append(prompt_args["context_str"])
+        # fail once, on the third summary of the first level
+        if len(calls) == 3 and not failed:
+            failed.append(True)
+            raise ValueError("failed")
+        return prompt_args["context_str"]
+
+    failed: List[bool] = []
+    monkeypatch.setattr(MockLLM, "predict", _predict)
+    docstore = SimpleDocumentStore()
+    nodes = [TextNode(text=f"leaf {i}") for i in range(8)]
+    docstore.add_documents(nodes)
+    builder_kwargs: Dict[str, Any] = {
+        "checkpoint_id": "checkpoint",
+        "checkpoint_batch_size": 1,
+        "embed_model": MockEmbedding(embed_dim=3),
+        "max_retries": 0,
+        "num_workers": 1,
+    }
+    with pytest.raises(ValueError):
+        _build_tree_with_builder(nodes, docstore, **builder_kwargs)
+
+    # the two summaries done are kept, the rest of the tree is built
+    calls.clear()
+    index_graph = _build_tree_with_builder(nodes, docstore, **builder_kwargs)
+    assert calls == [
+        "leaf 4\nleaf 5",
+        "leaf 6\nleaf 7",
+        "leaf 0\nleaf 2",
+        "leaf 4\nleaf 6",
+    ]
+    assert len(index_graph.all_nodes) == 14
+    assert not [doc_id for doc_id in docstore.docs if doc_id.startswith("checkpoint")]
+    for node_id, children_ids in index_graph.node_id_to_children_ids.items():
+        if children_ids:
+            assert docstore.get_node(node_id).embedding == [0.5, 0.5, 0.5]
@@ -1,13 +1,19 @@
 from multiprocessing import cpu_count
+from typing import Any, List
 
 from llama_index.core.embeddings.mock_embed_model import MockEmbedding
 from llama_index.core.extractors import KeywordExtractor
-from llama_index.core.ingestion.pipeline import IngestionPipeline
+from llama_index.core.ingestion.pipeline import DocstoreStrategy, IngestionPipeline
 from llama_index.core.llms.mock import MockLLM
 from llama_index.core.node_parser import SentenceSplitter
 from llama_index.core.readers import ReaderConfig, StringIterableReader
-from llama_index.core.schema import Document
+from llama_index.core.schema import BaseNode, Document
 from llama_index.core.storage.docstore import SimpleDocumentStore
+from llama_index.core.vector_stores.types import (
+    BasePydanticVectorStore,
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+)
 
 
 # clean up folders after tests
@@ -128,6 +134,55 @@ def test_pipeline_update() -> None:
     assert next(iter(pipeline.docstore.docs.values())).text == "test"  # type: ignore
 
 
+class MockVectorStore(BasePydanticVectorStore):
+    stores_text: bool = False
+    deleted_ref_doc_ids: List[str] = []
+
+    @property
+    def client(self) -> Any:
+        return None
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        return [node.node_id for node in nodes]
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        self.deleted_ref_doc_ids.append(ref_doc_id)
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        return VectorStoreQueryResult()
+
+
+def test_pipeline_upserts_and_delete_given_ids() -> None:
+    pipeline = IngestionPipeline(
+        transformations=[
+            SentenceSplitter(chunk_size=25, chunk_overlap=0),
+            MockEmbedding(embed_dim=1),
+        ],
+        docstore=SimpleDocumentStore(),
+        vector_store=MockVectorStore(),
+        docstore_strategy=DocstoreStrategy.UPSERTS_AND_DELETE,
+    )
+    pipeline.run(
+        documents=[
+            Document(text="a", doc_id="a"),
+            Document(text="b", doc_id="b"),
+            Document(text="c", doc_id="c"),
+        ]
+    )
+
+    # only pass the changed document, and the deleted one
+    nodes = pipeline.run(
+        documents=[Document(text="b2", doc_id="b")], deleted_doc_ids=["a"]
+    )
+
+    assert len(nodes) == 1
+    assert pipeline.docstore is not None
+    assert set(pipeline.docstore.docs) == {"b", "c"}
+    assert pipeline.docstore.get_document("b").text == "b2"  # type: ignore
+    assert pipeline.vector_store is not None
+    assert sorted(pipeline.vector_store.deleted_ref_doc_ids) == ["a", "b"]  # type: ignore
+
+
 def test_pipeline_dedup_duplicates_only() -> None:
     documents = [
         Document(text="one", doc_id="1"),
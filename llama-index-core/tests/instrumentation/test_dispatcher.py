@@ -8,6 +8,7 @@ import llama_index.core.instrumentation as instrument
 from llama_index.core.instrumentation.dispatcher import Dispatcher
 from llama_index.core.instrumentation.events import BaseEvent
 from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.span_handlers import SimpleSpanHandler
 from unittest.mock import patch, MagicMock
 
 dispatcher = instrument.get_dispatcher("test")
@@ -39,6 +40,15 @@ class _TestEventHandler(BaseEventHandler):
         self.events.append(e)
 
 
+@pytest.fixture(autouse=True)
+def span_handler():
+    # spans are only dispatched when a non-null handler is attached
+    span_handler = SimpleSpanHandler()
+    dispatcher.add_span_handler(span_handler)
+    yield span_handler
+    dispatcher.span_handlers.remove(span_handler)
+
+
 @dispatcher.span
 def func(a, b=3, **kwargs):
     return a + b
@@ -544,3 +554,54 @@ async def test_dispatcher_async_fire_event_with_instance(
 
     # span_exit
     mock_span_exit.call_count == 2
+
+
+@patch.object(Dispatcher, "span_exit")
+@patch.object(Dispatcher, "span_enter")
+@patch("llama_index.core.instrumentation.dispatcher.uuid")
+def test_dispatcher_span_without_handlers(
+    mock_uuid: MagicMock,
+    mock_span_enter: MagicMock,
+    mock_span_exit: MagicMock,
+):
+    # arrange
+    no_handler_dispatcher = instrument.get_dispatcher("test_no_handlers")
+
+    @no_handler_dispatcher.span
+    def no_handler_func(a, b=3):
+        return a + b
+
+    # act
+    result = no_handler_func(3)
+
+    # assert
+    assert result == 6
+    mock_uuid.uuid4.assert_not_called()
+    mock_span_enter.assert_not_called()
+    mock_span_exit.assert_not_called()
+
+
+@pytest.mark.asyncio()
+@patch.object(Dispatcher, "span_exit")
+@patch.object(Dispatcher, "span_enter")
+@patch("llama_index.core.instrumentation.dispatcher.uuid")
+async def test_dispatcher_async_span_without_handlers(
+    mock_uuid: MagicMock,
+    mock_span_enter: MagicMock,
+    mock_span_exit: MagicMock,
+):
+    # arrange
+    no_handler_dispatcher = instrument.get_dispatcher("test_no_handlers")
+
+    @no_handler_dispatcher.span
+    async def no_handler_async_func(a, b=3):
+        return a + b
+
+    # act
+    result = await no_handler_async_func(3)
+
+    # assert
+    assert result == 6
+    mock_uuid.uuid4.assert_not_called()
+    mock_span_enter.assert_not_called()
+    mock_span_exit.assert_not_called()
@@ -0,0 +1,177 @@
+import random
+from datetime import timedelta
+
+import pytest
+import llama_index.core.instrumentation as instrument
+from llama_index.core.base.llms.types import ChatMessage, ChatResponse
+from llama_index.core.instrumentation.event_handlers import MetricsEventHandler
+from llama_index.core.instrumentation.events.embedding import EmbeddingEndEvent
+from llama_index.core.instrumentation.events.llm import (
+    LLMChatEndEvent,
+    LLMChatStartEvent,
+)
+from llama_index.core.instrumentation.metrics import (
+    MetricsRegistry,
+    StreamingHistogram,
+)
+from llama_index.core.instrumentation.span_handlers import MetricsSpanHandler
+from llama_index.core.llms import MockLLM
+from llama_index.core.instrumentation.span_handlers.metrics import get_span_name
+
+dispatcher = instrument.get_dispatcher("test_metrics")
+
+
+@dispatcher.span
+def spanned(fail: bool = False) -> None:
+    if fail:
+        raise ValueError("failed")
+
+
+def test_streaming_histogram_quantiles() -> None:
+    random.seed(42)
+    values = [random.uniform(0.001, 2.0) for _ in range(10000)]
+    histogram = StreamingHistogram(sub_buckets=32)
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert histogram.quantile(q) == pytest.approx(exact, rel=1 / 16)
+    assert histogram.count == len(values)
+    assert histogram.quantile(1.0) == values[-1]
+    # memory does not depend on the number of values recorded
+    assert len(histogram.counts) == len(StreamingHistogram(sub_buckets=32).counts)
+
+
+def test_streaming_histogram_out_of_range() -> None:
+    histogram = StreamingHistogram(lowest_value=1.0, highest_value=10.0)
+    histogram.record(0.0)
+    histogram.record(1000.0)
+    # clamped into the first bucket
+    assert histogram.quantile(0.0) == pytest.approx(1.0, rel=1 / 16)
+    assert histogram.quantile(1.0) == 1000.0
+    assert StreamingHistogram().quantile(0.5) is None
+
+
+def test_registry_render_prometheus() -> None:
+    registry = MetricsRegistry(quantiles=(0.5,))
+    registry.describe("requests_total", "Number of requests.")
+    registry.increment("requests_total", labels={"path": 'a"b'})
+    registry.increment("requests_total", 2, labels={"path": 'a"b'})
+    registry.observe("latency_seconds", 0.5)
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"]["requests_total"][0]["value"] == 3
+    assert snapshot["histograms"]["latency_seconds"][0]["count"] == 1
+
+    assert registry.render_prometheus() == (
+        "# HELP requests_total Number of requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="a\\"b"} 3.0\n'
+        "# TYPE latency_seconds summary\n"
+        'latency_seconds{quantile="0.5"} 0.5\n'
+        "latency_seconds_sum 0.5\n"
+        "latency_seconds_count 1\n"
+    )
+
+
+def test_get_span_name() -> None:
+    assert (
+        get_span_name("BaseRetriever.retrieve-0f8a4b6e-3c9d-4e2a-9b1f-6a7c8d9e0f1a")
+        == "BaseRetriever.retrieve"
+    )
+    assert get_span_name("no-uuid") == "no-uuid"
+
+
+def test_metrics_span_handler() -> None:
+    span_handler = MetricsSpanHandler()
+    dispatcher.span_handlers = [span_handler]
+    try:
+        spanned()
+        spanned()
+        with pytest.raises(ValueError):
+            spanned(fail=True)
+    finally:
+        dispatcher.span_handlers = []
+
+    snapshot = span_handler.registry.snapshot()
+    (durations,) = snapshot["histograms"]["llama_index_span_duration_seconds"]
+    assert durations["labels"] == {"span": spanned.__qualname__}
+    assert durations["count"] == 3
+    counts = {
+        c["labels"]["status"]: c["value"]
+        for c in snapshot["counters"]["llama_index_spans_total"]
+    }
+    assert counts == {"completed": 2, "dropped": 1}
+    assert not span_handler.open_spans
+
+
+def test_metrics_event_handler() -> None:
+    registry = MetricsRegistry()
+    event_handler = MetricsEventHandler(registry=registry)
+    messages = [ChatMessage(content="hi")]
+
+    start = LLMChatStartEvent(
+        messages=messages,
+        additional_kwargs={},
+        model_dict={"model": "mock-model"},
+        span_id="span",
+    )
+    end = LLMChatEndEvent(
+        messages=messages,
+        response=ChatResponse(
+            message=ChatMessage(content="hello"),
+            raw={"usage": {"completion_tokens": 20}},
+        ),
+        span_id="span",
+        timestamp=start.timestamp + timedelta(seconds=2),
+    )
+    event_handler.handle(start)
+    event_handler.handle(end)
+    event_handler.handle(
+        EmbeddingEndEvent(chunks=["a", "b", "c"], embeddings=[[0.0]] * 3)
+    )
+
+    snapshot = registry.snapshot()
+    (tokens_per_second,) = snapshot["histograms"][
+        "llama_index_llm_output_tokens_per_second"
+    ]
+    assert tokens_per_second["labels"] == {"model": "mock-model"}
+    assert tokens_per_second["max"] == 10.0
+    (batch_size,) = snapshot["histograms"]["llama_index_embedding_batch_size"]
+    assert batch_size["sum"] == 3
+    events = {
+        c["labels"]["event"]: c["value"]
+        for c in snapshot["counters"]["llama_index_events_total"]
+    }
+    assert events == {
+        "LLMChatStartEvent": 1,
+        "LLMChatEndEvent": 1,
+        "EmbeddingEndEvent": 1,
+    }
+    assert "llama_index_llm_output_tokens_total" in registry.render_prometheus()
+
+
+def test_metrics_event_handler_streaming() -> None:
+    registry = MetricsRegistry()
+    event_handler = MetricsEventHandler(registry=registry, tokenizer=str.split)
+    root_dispatcher = instrument.get_dispatcher()
+    root_dispatcher.add_event_handler(event_handler)
+    try:
+        chunks = list(MockLLM(max_tokens=3).stream_complete("hi"))
+    finally:
+        root_dispatcher.event_handlers.remove(event_handler)
+
+    snapshot = registry.snapshot()
+    # the call is recorded once, with the text of the last chunk
+    (duration,) = snapshot["histograms"]["llama_index_llm_duration_seconds"]
+    assert duration["count"] == 1
+    (tokens,) = snapshot["counters"]["llama_index_llm_output_tokens_total"]
+    assert tokens["value"] == len(chunks[-1].text.split())
+    events = {
+        c["labels"]["event"]: c["value"]
+        for c in snapshot["counters"]["llama_index_events_total"]
+    }
+    assert events["LLMCompletionInProgressEvent"] == 3
+    assert events["LLMCompletionEndEvent"] == 1
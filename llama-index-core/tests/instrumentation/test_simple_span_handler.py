@@ -0,0 +1,118 @@
+from typing import List
+
+import pytest
+import llama_index.core.instrumentation as instrument
+from llama_index.core.instrumentation.span.simple import SimpleSpan
+from llama_index.core.instrumentation.span_handlers import SimpleSpanHandler
+
+dispatcher = instrument.get_dispatcher("test_simple_span_handler")
+
+
+@dispatcher.span
+def child(fail: bool = False) -> None:
+    if fail:
+        raise ValueError("child failed")
+
+
+@dispatcher.span
+def parent(num_children: int = 2, fail: bool = False) -> None:
+    for _ in range(num_children):
+        child()
+    if fail:
+        try:
+            child(fail=True)
+        except ValueError:
+            pass
+
+
+@pytest.fixture()
+def attach_handler():
+    def _attach(handler: SimpleSpanHandler) -> SimpleSpanHandler:
+        dispatcher.span_handlers = [handler]
+        return handler
+
+    yield _attach
+    dispatcher.span_handlers = []
+
+
+def test_records_traces(attach_handler) -> None:
+    handler = attach_handler(SimpleSpanHandler())
+
+    parent(fail=True)
+
+    assert len(handler.completed_spans) == 3
+    assert len(handler.dropped_spans) == 1
+    assert handler.dropped_spans[0].metadata == {"error": "child failed"}
+    assert not handler.open_spans
+    root = handler._get_parents()[0]
+    assert root.id_.startswith(parent.__qualname__)
+    assert all(
+        s.parent_id == root.id_
+        for s in list(handler.completed_spans) + list(handler.dropped_spans)
+        if s is not root
+    )
+
+
+def test_capacity(attach_handler) -> None:
+    handler = attach_handler(SimpleSpanHandler(capacity=4))
+
+    for _ in range(5):
+        parent()
+
+    assert len(handler.completed_spans) == 4
+
+
+def test_head_sampling(attach_handler) -> None:
+    handler = attach_handler(SimpleSpanHandler(sample_rate=0.0))
+
+    parent()
+
+    assert len(handler.completed_spans) == 0
+    assert not handler.open_spans
+    assert not handler._traces
+    assert not handler._trace_ids
+
+
+def test_tail_sampling(attach_handler) -> None:
+    def _keep_failed(spans: List[SimpleSpan]) -> bool:
+        return any(s.metadata for s in spans)
+
+    handler = attach_handler(SimpleSpanHandler(tail_sampler=_keep_failed))
+
+    parent()
+    parent(num_children=1, fail=True)
+
+    assert len(handler.completed_spans) == 2
+    assert len(handler.dropped_spans) == 1
+
+
+def test_exporter(attach_handler) -> None:
+    batches: List[List[List[SimpleSpan]]] = []
+    handler = attach_handler(
+        SimpleSpanHandler(exporter=batches.append, export_batch_size=2)
+    )
+
+    for _ in range(3):
+        parent(num_children=1)
+
+    assert len(batches) == 1
+    assert [len(trace) for trace in batches[0]] == [2, 2]
+
+    handler.flush()
+    assert len(batches) == 2
+    assert len(batches[1]) == 1
+
+
+def test_trace_trees(attach_handler) -> None:
+    pytest.importorskip("treelib")
+    handler = attach_handler(SimpleSpanHandler())
+
+    parent()
+    parent(num_children=3)
+    # span whose parent was evicted or never recorded
+    handler.completed_spans.append(SimpleSpan(id_="orphan", parent_id="gone"))
+
+    with pytest.warns(UserWarning):
+        trees = handler._get_trace_trees()
+
+    assert sorted(tree.size() for tree in trees) == [2, 3, 4]
@@ -0,0 +1,252 @@
+import asyncio
+from typing import Any, List, Sequence
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    CompletionResponse,
+    CompletionResponseGen,
+    LLMMetadata,
+    MessageRole,
+)
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.instrumentation import get_dispatcher
+from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.events import BaseEvent
+from llama_index.core.llms import LLMCache
+from llama_index.core.llms.callbacks import (
+    llm_chat_callback,
+    llm_completion_callback,
+)
+from llama_index.core.llms.custom import CustomLLM
+from llama_index.core.llms.llm import ToolSelection
+
+
+class CountingLLM(CustomLLM):
+    """LLM echoing prompts, counting the calls it actually serves."""
+
+    _num_calls: int = PrivateAttr(default=0)
+
+    @property
+    def num_calls(self) -> int:
+        return self._num_calls
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata()
+
+    @llm_completion_callback()
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        self._num_calls += 1
+        return CompletionResponse(text=f"echo: {prompt}")
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        self._num_calls += 1
+
+        def gen() -> CompletionResponseGen:
+            text = ""
+            for delta in ["echo", ": ", prompt]:
+                text += delta
+                yield CompletionResponse(text=text, delta=delta)
+
+        return gen()
+
+
+class ToolCallingLLM(CountingLLM):
+    """LLM calling a tool, or answering with plain JSON `additional_kwargs`."""
+
+    @llm_chat_callback()
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        self._num_calls += 1
+        if messages[-1].content == "search":
+            tool_calls: List[Any] = [
+                ToolSelection(tool_id="1", tool_name="search", tool_kwargs={})
+            ]
+        else:
+            tool_calls = [{"id": "1", "name": "search"}]
+        return ChatResponse(
+            message=ChatMessage(
+                role=MessageRole.ASSISTANT,
+                content="",
+                additional_kwargs={"tool_calls": tool_calls},
+            )
+        )
+
+
+class KeywordEmbedding(BaseEmbedding):
+    """Embed texts by the animals and instructions they mention."""
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "KeywordEmbedding"
+
+    def _embed(self, text: str) -> List[float]:
+        return [float(word in text) for word in ("cat", "dog", "Answer")] + [0.1]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class _CacheEventHandler(BaseEventHandler):
+    events: List[str] = []
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "_CacheEventHandler"
+
+    def handle(self, event: BaseEvent, **kwargs: Any) -> None:
+        if event.class_name().startswith("LLMCache"):
+            self.events.append(event.class_name())
+
+
+def test_exact_match() -> None:
+    llm = CountingLLM()
+    llm.cache = LLMCache()
+    message = ChatMessage(role="user", content="hello")
+
+    assert llm.complete("hello").text == "echo: hello"
+    assert llm.complete("hello").text == "echo: hello"
+    assert llm.num_calls == 1
+
+    # other arguments and models are cached separately
+    llm.complete("hello", tools=[{"name": "search"}])
+    llm.complete("world")
+    assert llm.num_calls == 3
+    other_llm = CountingLLM(system_prompt="Be brief.")
+    other_llm.cache = llm.cache
+    other_llm.complete("hello")
+    assert other_llm.num_calls == 1
+
+    response = llm.chat([message])
+    assert llm.chat([message]) == response
+    assert llm.num_calls == 4
+
+
+def test_stream_replay() -> None:
+    llm = CountingLLM()
+    llm.cache = LLMCache()
+
+    deltas = [response.delta for response in llm.stream_complete("hello")]
+    assert deltas == ["echo", ": ", "hello"]
+    replayed = list(llm.stream_complete("hello"))
+    assert [response.delta for response in replayed] == deltas
+    assert [response.text for response in replayed] == [
+        "echo",
+        "echo: ",
+        "echo: hello",
+    ]
+    # responses of streams are also used without streaming, and conversely
+    assert llm.complete("hello").text == "echo: hello"
+    llm.complete("world")
+    assert [response.delta for response in llm.stream_complete("world")] == [
+        "echo: world"
+    ]
+    assert llm.num_calls == 2
+
+    # streams are only cached once fully consumed
+    next(iter(llm.stream_complete("partial")))
+    list(llm.stream_complete("partial"))
+    assert llm.num_calls == 4
+
+
+def test_async() -> None:
+    llm = CountingLLM()
+    llm.cache = LLMCache()
+    message = ChatMessage(role="user", content="hello")
+
+    async def run() -> None:
+        assert (await llm.acomplete("hello")).text == "echo: hello"
+        assert (await llm.acomplete("hello")).text == "echo: hello"
+        response = await llm.achat([message])
+        assert (await llm.achat([message])) == response
+
+        gen = await llm.astream_complete("stream")
+        deltas = [response.delta async for response in gen]
+        gen = await llm.astream_complete("stream")
+        assert [response.delta async for response in gen] == deltas
+
+    asyncio.run(run())
+    assert llm.num_calls == 3
+
+
+def test_ttl_and_max_entries(monkeypatch: Any) -> None:
+    llm = CountingLLM()
+    llm.cache = LLMCache(ttl=60, max_entries=2)
+
+    now = 1000.0
+    monkeypatch.setattr("llama_index.core.llms.cache.time.time", lambda: now)
+    llm.complete("a")
+    llm.complete("b")
+    now = 1030.0
+    llm.complete("a")
+    assert llm.num_calls == 2
+
+    # "b" is the least recently used
+    llm.complete("c")
+    assert len(llm.cache.kvstore.get_all(llm.cache.collection)) == 2
+    llm.complete("b")
+    assert llm.num_calls == 4
+
+    # "a" expired
+    now = 1070.0
+    llm.complete("a")
+    assert llm.num_calls == 5
+
+
+def test_semantic_match() -> None:
+    llm = CountingLLM()
+    llm.cache = LLMCache(embed_model=KeywordEmbedding(), similarity_threshold=0.9)
+    history = [ChatMessage(role="system", content="Answer questions.")]
+
+    response = llm.chat([*history, ChatMessage(content="what is a cat?")])
+    assert llm.chat([*history, ChatMessage(content="what's a cat")]) == response
+    assert llm.num_calls == 1
+
+    llm.chat([*history, ChatMessage(content="what is a dog?")])
+    # the rest of the conversation must match exactly
+    llm.chat([ChatMessage(content="what is a cat?")])
+    assert llm.num_calls == 3
+
+
+def test_events() -> None:
+    handler = _CacheEventHandler()
+    root = get_dispatcher()
+    root.add_event_handler(handler)
+    try:
+        llm = CountingLLM()
+        llm.cache = LLMCache()
+        llm.complete("hello")
+        llm.complete("hello")
+    finally:
+        root.event_handlers.remove(handler)
+
+    assert handler.events == ["LLMCacheMissEvent", "LLMCacheHitEvent"]
+
+
+def test_responses_with_client_objects_not_cached() -> None:
+    llm = ToolCallingLLM()
+    llm.cache = LLMCache()
+    message = ChatMessage(role="user", content="search")
+
+    for _ in range(2):
+        (tool_call,) = llm.chat([message]).message.additional_kwargs["tool_calls"]
+        assert isinstance(tool_call, ToolSelection)
+    assert llm.num_calls == 2
+
+    # plain JSON additional_kwargs are cached
+    message = ChatMessage(role="user", content="other")
+    response = llm.chat([message])
+    assert llm.chat([message]) == response
+    assert llm.num_calls == 3
@@ -160,6 +160,33 @@ def test_get_when_space_for_all_but_first_message_removes_first_message_and_answ
     assert history[1] == SECOND_ASSISTANT_CHAT_MESSAGE
 
 
+def test_get_when_trimmed_removes_leading_tool_messages() -> None:
+    # Given a tool call in the middle of the history
+    tool_call = ChatMessage(role=MessageRole.ASSISTANT, content="call")
+    tool_output = ChatMessage(role=MessageRole.TOOL, content="output")
+    chat_history = [
+        USER_CHAT_MESSAGE,
+        tool_call,
+        tool_output,
+        tool_output,
+        ASSISTANT_CHAT_MESSAGE,
+        SECOND_USER_CHAT_MESSAGE,
+    ]
+    # Given room for everything but the first message and the tool call
+    token_limit = sum(len(tokenizer(str(m.content))) for m in chat_history[2:])
+    memory = ChatMemoryBuffer.from_defaults(
+        token_limit=token_limit, chat_history=chat_history
+    )
+
+    # When I get the chat history from the memory
+    history = memory.get()
+
+    # Then the history should start at the next user message
+    assert history == [SECOND_USER_CHAT_MESSAGE]
+    # and each distinct message was tokenized once
+    assert len(memory._token_counts) == 5
+
+
 def test_set() -> None:
     memory = ChatMemoryBuffer.from_defaults(chat_history=[USER_CHAT_MESSAGE])
 
@@ -2,7 +2,7 @@
 
 from importlib.util import find_spec
 from pathlib import Path
-from typing import Dict, cast
+from typing import Any, Dict, List, Tuple, cast
 
 import pytest
 from llama_index.core.postprocessor.node import (
@@ -144,6 +144,68 @@ def test_forward_back_processor(tmp_path: Path) -> None:
         PrevNextNodePostprocessor(docstore=docstore, num_nodes=4, mode="asdfasdf")
 
 
+def _build_chained_docstore(
+    num_nodes: int,
+) -> Tuple[List[NodeWithScore], SimpleDocumentStore]:
+    """Build a docstore holding a single prev/next chain of nodes."""
+    nodes = [TextNode(text=f"Node {i}.", id_=str(i)) for i in range(num_nodes)]
+    for i, node in enumerate(nodes):
+        if i > 0:
+            node.relationships[NodeRelationship.PREVIOUS] = RelatedNodeInfo(
+                node_id=nodes[i - 1].node_id
+            )
+        if i < len(nodes) - 1:
+            node.relationships[NodeRelationship.NEXT] = RelatedNodeInfo(
+                node_id=nodes[i + 1].node_id
+            )
+    docstore = SimpleDocumentStore()
+    docstore.add_documents(nodes)
+    return [NodeWithScore(node=node, score=1.0) for node in nodes], docstore
+
+
+def test_forward_back_processor_batches_docstore_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that neighbors are fetched level by level and deduplicated."""
+    nodes_with_scores, docstore = _build_chained_docstore(10)
+    get_nodes_calls: List[List[str]] = []
+    get_nodes = docstore.get_nodes
+
+    def _get_nodes(node_ids: List[str], raise_error: bool = True) -> Any:
+        get_nodes_calls.append(list(node_ids))
+        return get_nodes(node_ids, raise_error=raise_error)
+
+    monkeypatch.setattr(docstore, "get_nodes", _get_nodes)
+
+    node_postprocessor = PrevNextNodePostprocessor(
+        docstore=docstore, num_nodes=3, mode="both"
+    )
+    processed_nodes = node_postprocessor.postprocess_nodes(
+        [nodes_with_scores[4], nodes_with_scores[5]]
+    )
+    assert [n.node.node_id for n in processed_nodes] == [str(i) for i in range(1, 9)]
+    # retrieved nodes keep their score, even when they neighbor each other
+    assert processed_nodes[3].score == 1.0
+    assert processed_nodes[4].score == 1.0
+    # one docstore call per level, and no node is fetched twice
+    assert len(get_nodes_calls) == 3
+    fetched_ids = [node_id for call in get_nodes_calls for node_id in call]
+    assert sorted(fetched_ids) == ["1", "2", "3", "6", "7", "8"]
+
+
+@pytest.mark.asyncio()
+async def test_forward_back_processor_async() -> None:
+    """Test async forward-back processor."""
+    nodes_with_scores, docstore = _build_chained_docstore(5)
+    node_postprocessor = PrevNextNodePostprocessor(
+        docstore=docstore, num_nodes=1, mode="both"
+    )
+    processed_nodes = await node_postprocessor.apostprocess_nodes(
+        [nodes_with_scores[0], nodes_with_scores[4]]
+    )
+    assert [n.node.node_id for n in processed_nodes] == ["0", "1", "3", "4"]
+
+
 def test_fixed_recency_postprocessor(
     mock_service_context: ServiceContext,
 ) -> None:
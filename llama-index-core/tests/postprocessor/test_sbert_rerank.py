@@ -0,0 +1,104 @@
+"""Sentence transformer rerank tests."""
+
+import sys
+import threading
+import types
+from typing import Any, List, Tuple
+
+import pytest
+from llama_index.core.postprocessor.sbert_rerank import SentenceTransformerRerank
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+
+class MockCrossEncoder:
+    """Cross-encoder scoring a pair by the length of its passage."""
+
+    def __init__(self, model: str, max_length: int, device: str) -> None:
+        self.max_length = max_length
+        self.batches: List[List[Tuple[str, str]]] = []
+
+    def predict(self, pairs: List[Tuple[str, str]], batch_size: int = 32) -> Any:
+        self.batches.append(list(pairs))
+        return [float(len(passage)) for _, passage in pairs]
+
+
+@pytest.fixture()
+def mock_cross_encoder(monkeypatch: pytest.MonkeyPatch) -> None:
+    module = types.ModuleType("sentence_transformers")
+    module.CrossEncoder = MockCrossEncoder  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+
+
+def _nodes(*texts: str) -> List[NodeWithScore]:
+    return [NodeWithScore(node=TextNode(text=text)) for text in texts]
+
+
+@pytest.mark.usefixtures("mock_cross_encoder")
+def test_sbert_rerank() -> None:
+    reranker = SentenceTransformerRerank(top_n=2, device="cpu")
+    nodes = reranker.postprocess_nodes(
+        _nodes("a", "abc", "ab"), query_bundle=QueryBundle("query")
+    )
+    assert [n.node.get_content() for n in nodes] == ["abc", "ab"]
+    assert nodes[0].score == 3.0
+
+
+@pytest.mark.usefixtures("mock_cross_encoder")
+def test_sbert_rerank_cache() -> None:
+    reranker = SentenceTransformerRerank(top_n=3, device="cpu", cache_size=3)
+    model = reranker._model
+
+    reranker.postprocess_nodes(_nodes("a", "ab"), query_bundle=QueryBundle("q"))
+    reranker.postprocess_nodes(_nodes("a", "ab", "abc"), query_bundle=QueryBundle("q"))
+    # only the new node is scored the second time
+    assert [len(batch) for batch in model.batches] == [2, 1]
+
+    # scores are cached per query
+    reranker.postprocess_nodes(_nodes("a"), query_bundle=QueryBundle("other q"))
+    assert [len(batch) for batch in model.batches] == [2, 1, 1]
+    # least recently used entry ("q", "a") was evicted
+    reranker.postprocess_nodes(_nodes("a"), query_bundle=QueryBundle("q"))
+    assert [len(batch) for batch in model.batches] == [2, 1, 1, 1]
+
+
+@pytest.mark.usefixtures("mock_cross_encoder")
+def test_sbert_rerank_truncate_text() -> None:
+    reranker = SentenceTransformerRerank(top_n=1, device="cpu", truncate_text=True)
+    reranker._model.max_length = 2
+    nodes = reranker.postprocess_nodes(_nodes("x" * 100), query_bundle=QueryBundle("q"))
+    assert nodes[0].score == 16.0
+
+
+@pytest.mark.usefixtures("mock_cross_encoder")
+def test_sbert_rerank_service_mode() -> None:
+    reranker = SentenceTransformerRerank(
+        top_n=1, device="cpu", service_mode=True, max_batch_wait_ms=200
+    )
+    model = reranker._model
+    results: List[List[NodeWithScore]] = []
+    barrier = threading.Barrier(4)
+
+    def _rerank(text: str) -> None:
+        barrier.wait()
+        results.append(
+            reranker.postprocess_nodes(
+                _nodes(text, text * 2), query_bundle=QueryBundle(text)
+            )
+        )
+
+    threads = [threading.Thread(target=_rerank, args=(t,)) for t in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # pairs from concurrent queries are scored together
+    assert len(model.batches) < 4
+    assert sum(len(batch) for batch in model.batches) == 8
+    assert sorted(r[0].node.get_content() for r in results) == [
+        "aa",
+        "bb",
+        "cc",
+        "dd",
+    ]
+    assert all(r[0].score == 2.0 for r in results)
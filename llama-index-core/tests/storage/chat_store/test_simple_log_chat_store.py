@@ -0,0 +1,104 @@
+import threading
+from pathlib import Path
+
+from llama_index.core.llms import ChatMessage
+from llama_index.core.memory import ChatMemoryBuffer
+from llama_index.core.storage.chat_store import SimpleLogChatStore
+
+
+def _message(content: str) -> ChatMessage:
+    return ChatMessage(role="user", content=content)
+
+
+def test_persists_every_change(tmp_path: Path) -> None:
+    """Test that changes are read back from the log."""
+    persist_path = str(tmp_path / "chat_store.log")
+    chat_store = SimpleLogChatStore(persist_path=persist_path)
+
+    chat_store.set_messages("user1", [_message("a"), _message("b")])
+    chat_store.add_message("user1", _message("c"))
+    chat_store.add_message("user1", _message("first"), idx=0)
+    chat_store.delete_message("user1", 1)
+    chat_store.delete_last_message("user1")
+    chat_store.add_message("user2", _message("hello"))
+    chat_store.set_messages("user3", [])
+    chat_store.add_message("user4", _message("gone"))
+    chat_store.delete_messages("user4")
+    chat_store.close()
+
+    loaded = SimpleLogChatStore.from_persist_path(persist_path)
+    assert loaded.get_keys() == ["user1", "user2", "user3"]
+    assert loaded.get_messages("user1") == [_message("first"), _message("b")]
+    assert loaded.get_last_messages("user1", 1) == [_message("b")]
+    assert loaded.get_messages("user2") == [_message("hello")]
+    assert loaded.get_messages("user3") == []
+    assert loaded.get_messages("user4") == []
+
+
+def test_compaction(tmp_path: Path) -> None:
+    """Test that the log is compacted once most of it is stale."""
+    persist_path = tmp_path / "chat_store.log"
+    chat_store = SimpleLogChatStore(
+        persist_path=str(persist_path), min_compaction_lines=10
+    )
+
+    for i in range(20):
+        chat_store.set_messages("user1", [_message(str(i))])
+    # one "clear" and one "add" line
+    assert len(persist_path.read_bytes().splitlines()) < 10
+
+    chat_store.add_message("user1", _message("last"))
+    loaded = SimpleLogChatStore(persist_path=str(persist_path))
+    assert loaded.get_messages("user1") == [_message("19"), _message("last")]
+
+
+def test_ignores_truncated_line(tmp_path: Path) -> None:
+    """Test that a partially written line is dropped on load."""
+    persist_path = tmp_path / "chat_store.log"
+    chat_store = SimpleLogChatStore(persist_path=str(persist_path))
+    chat_store.add_message("user1", _message("hello"))
+    chat_store.close()
+    with open(persist_path, "ab") as f:
+        f.write(b'["add", "user1", null]\t{"role": "us')
+
+    loaded = SimpleLogChatStore(persist_path=str(persist_path))
+    loaded.add_message("user1", _message("world"))
+    loaded.close()
+
+    loaded = SimpleLogChatStore(persist_path=str(persist_path))
+    assert loaded.get_messages("user1") == [_message("hello"), _message("world")]
+
+
+def test_concurrent_writes(tmp_path: Path) -> None:
+    """Test that threads can write to different keys."""
+    persist_path = str(tmp_path / "chat_store.log")
+    chat_store = SimpleLogChatStore(
+        persist_path=persist_path, min_compaction_lines=50, cache_size=2
+    )
+
+    def _write(key: str) -> None:
+        for i in range(50):
+            chat_store.add_message(key, _message(str(i)))
+
+    threads = [threading.Thread(target=_write, args=(f"user{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = [_message(str(i)) for i in range(50)]
+    loaded = SimpleLogChatStore(persist_path=persist_path)
+    for i in range(4):
+        assert chat_store.get_messages(f"user{i}") == expected
+        assert loaded.get_messages(f"user{i}") == expected
+
+
+def test_memory_round_trip(tmp_path: Path) -> None:
+    """Test that a memory using the store can be saved and loaded."""
+    chat_store = SimpleLogChatStore(persist_path=str(tmp_path / "chat_store.log"))
+    memory = ChatMemoryBuffer.from_defaults(chat_store=chat_store)
+    memory.put(_message("hello"))
+
+    loaded = ChatMemoryBuffer.from_dict(memory.to_dict())
+    assert isinstance(loaded.chat_store, SimpleLogChatStore)
+    assert loaded.get_all() == [_message("hello")]
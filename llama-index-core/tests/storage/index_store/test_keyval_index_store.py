@@ -0,0 +1,102 @@
+import pickle
+from typing import List, Tuple
+
+from llama_index.core.data_structs.data_structs import IndexDict, KeywordTable
+from llama_index.core.schema import TextNode
+from llama_index.core.storage.index_store.keyval_index_store import KVIndexStore
+from llama_index.core.storage.index_store.simple_index_store import (
+    SimpleIndexStore,
+)
+from llama_index.core.storage.kvstore.simple_kvstore import SimpleKVStore
+
+
+class RecordingKVStore(SimpleKVStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.puts: List[Tuple[str, str]] = []
+
+    def put(self, key: str, val: dict, collection: str = "data") -> None:
+        self.puts.append((collection, key))
+        super().put(key, val, collection=collection)
+
+
+def test_sharded_index_store_writes_changed_entries() -> None:
+    kvstore = RecordingKVStore()
+    index_store = KVIndexStore(kvstore, sharded=True)
+    index_struct = IndexDict()
+    for i in range(100):
+        index_struct.nodes_dict[f"node_{i}"] = f"node_{i}"
+    index_store.add_index_struct(index_struct)
+    assert len(kvstore.puts) == 101
+
+    kvstore.puts = []
+    index_struct.nodes_dict["node_100"] = "node_100"
+    del index_struct.nodes_dict["node_0"]
+    index_store.add_index_struct(index_struct)
+    # the new entry and the struct header
+    assert {key for _, key in kvstore.puts} == {index_struct.index_id, "node_100"}
+
+    loaded = KVIndexStore(kvstore).get_index_struct(index_struct.index_id)
+    assert loaded == index_struct
+
+
+def test_sharded_index_store_detects_in_place_changes() -> None:
+    kvstore = RecordingKVStore()
+    index_store = KVIndexStore(kvstore, sharded=True)
+    index_struct = KeywordTable(table={"a": {"node_1"}, "b": {"node_1"}})
+    index_store.add_index_struct(index_struct)
+
+    # a fresh store only writes changed entries of the structs it loaded
+    index_store = KVIndexStore(kvstore, sharded=True)
+    loaded = index_store.get_index_struct()
+    assert isinstance(loaded, KeywordTable)
+    assert loaded == index_struct
+
+    kvstore.puts = []
+    loaded.table["a"].add("node_2")
+    index_store.add_index_struct(loaded)
+    assert {key for _, key in kvstore.puts} == {"a", loaded.index_id}
+    assert index_store.get_index_struct(loaded.index_id) == loaded
+
+
+def test_sharded_index_store_persist_and_delete(tmp_path) -> None:
+    index_store = SimpleIndexStore()
+    sharded_store = KVIndexStore(index_store._kvstore, sharded=True)
+    index_struct = IndexDict(nodes_dict={"node_1": "node_1"})
+    sharded_store.add_index_struct(index_struct)
+
+    persist_path = str(tmp_path / "index_store.json")
+    index_store.persist(persist_path)
+    loaded_store = SimpleIndexStore.from_persist_path(persist_path)
+    assert loaded_store.index_structs() == [index_struct]
+
+    loaded_store.delete_index_struct(index_struct.index_id)
+    assert loaded_store.index_structs() == []
+    assert not any(loaded_store.to_dict().values())
+
+
+def test_sharded_index_store_only_writes_tracked_changes() -> None:
+    kvstore = RecordingKVStore()
+    index_struct = KeywordTable(table={"a": {"node_1"}, "b": {"node_1"}})
+    KVIndexStore(kvstore, sharded=True).add_index_struct(index_struct)
+
+    # two stores load the same struct, and change different entries
+    store_1 = KVIndexStore(kvstore, sharded=True)
+    store_2 = KVIndexStore(kvstore, sharded=True)
+    loaded_1 = store_1.get_index_struct()
+    loaded_2 = store_2.get_index_struct()
+    assert isinstance(loaded_1, KeywordTable)
+    assert isinstance(loaded_2, KeywordTable)
+    loaded_1.add_node(["c"], TextNode(id_="node_2"))
+    store_1.add_index_struct(loaded_1)
+    loaded_2.delete_node("node_1")
+    kvstore.puts = []
+    store_2.add_index_struct(loaded_2)
+    assert {key for _, key in kvstore.puts} == {loaded_2.index_id}
+
+    assert KVIndexStore(kvstore).get_index_struct() == KeywordTable(
+        index_id=index_struct.index_id, table={"c": {"node_2"}}
+    )
+
+    # tracked fields survive pickling
+    assert pickle.loads(pickle.dumps(loaded_1)) == loaded_1
@@ -0,0 +1,64 @@
+"""Test tool calling."""
+
+import asyncio
+import time
+
+from llama_index.core.llms.llm import ToolSelection
+from llama_index.core.tools import ToolOutput
+from llama_index.core.tools.calling import arun_tool_calls, run_tool_calls
+
+TOOL_CALLS = [
+    ToolSelection(tool_id=str(i), tool_name="tool", tool_kwargs={"i": i})
+    for i in range(3)
+]
+
+
+def _output(tool_call: ToolSelection) -> ToolOutput:
+    return ToolOutput(
+        content=str(tool_call.tool_kwargs["i"]),
+        tool_name=tool_call.tool_name,
+        raw_input=tool_call.tool_kwargs,
+        raw_output=tool_call.tool_kwargs["i"],
+    )
+
+
+def test_run_tool_calls() -> None:
+    def call_fn(tool_call: ToolSelection) -> ToolOutput:
+        # later calls finish first
+        time.sleep(0.1 * (3 - tool_call.tool_kwargs["i"]))
+        return _output(tool_call)
+
+    start = time.perf_counter()
+    outputs = run_tool_calls(TOOL_CALLS, call_fn, num_workers=3)
+    assert time.perf_counter() - start < 0.5
+    assert [output.content for output in outputs] == ["0", "1", "2"]
+
+    assert [o.content for o in run_tool_calls(TOOL_CALLS, _output, 1)] == [
+        "0",
+        "1",
+        "2",
+    ]
+
+
+def test_arun_tool_calls() -> None:
+    num_active = 0
+    max_active = 0
+
+    async def acall_fn(tool_call: ToolSelection) -> ToolOutput:
+        nonlocal num_active, max_active
+        num_active += 1
+        max_active = max(max_active, num_active)
+        try:
+            await asyncio.sleep(0.05 if tool_call.tool_kwargs["i"] < 2 else 10)
+        finally:
+            num_active -= 1
+        return _output(tool_call)
+
+    outputs = asyncio.run(
+        arun_tool_calls(TOOL_CALLS, acall_fn, num_workers=2, timeout=0.5)
+    )
+
+    assert max_active == 2
+    assert [output.content for output in outputs[:2]] == ["0", "1"]
+    assert outputs[2].is_error
+    assert outputs[2].content.startswith("Encountered error: Tool call timed out")
@@ -0,0 +1,94 @@
+"""Test query plan tool."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from llama_index.core.base.response.schema import Response
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.tools import FunctionTool, QueryPlanTool
+
+
+class MockSynthesizer:
+    """Joins the responses of child nodes."""
+
+    def synthesize(self, query: str, nodes: List[NodeWithScore]) -> Response:
+        responses = [n.node.get_content().split("Response: ")[1].strip() for n in nodes]
+        return Response(response=f"{query}({','.join(responses)})")
+
+    async def asynthesize(self, query: str, nodes: List[NodeWithScore]) -> Response:
+        return self.synthesize(query, nodes)
+
+
+# "c" depends on the shared leaf "a" twice over, through itself and "b"
+QUERY_PLAN: Dict[str, Any] = {
+    "nodes": [
+        {"id": 1, "query_str": "a", "tool_name": "search"},
+        {"id": 2, "query_str": "x", "tool_name": "search"},
+        {"id": 3, "query_str": "b", "dependencies": [1, 2]},
+        {"id": 4, "query_str": "c", "dependencies": [3, 1]},
+    ]
+}
+
+
+def _get_tool() -> Tuple[QueryPlanTool, List[str]]:
+    calls: List[str] = []
+    lock = threading.Lock()
+
+    def search(input: str) -> str:
+        """Search."""
+        with lock:
+            calls.append(input)
+        time.sleep(0.2)
+        return input.upper()
+
+    async def asearch(input: str) -> str:
+        """Search."""
+        calls.append(input)
+        await asyncio.sleep(0.2)
+        return input.upper()
+
+    tool = FunctionTool.from_defaults(fn=search, async_fn=asearch, name="search")
+    query_plan_tool = QueryPlanTool.from_defaults(
+        query_engine_tools=[tool],
+        response_synthesizer=MockSynthesizer(),  # type: ignore
+    )
+    return query_plan_tool, calls
+
+
+def test_query_plan_tool() -> None:
+    tool, calls = _get_tool()
+
+    start = time.perf_counter()
+    output = tool(**QUERY_PLAN)
+
+    # leaves run once each, at the same time
+    assert time.perf_counter() - start < 0.35
+    assert sorted(calls) == ["a", "x"]
+    assert str(output) == "c(b(A,X),A)"
+
+
+def test_query_plan_tool_async() -> None:
+    tool, calls = _get_tool()
+
+    start = time.perf_counter()
+    output = asyncio.run(tool.acall(**QUERY_PLAN))
+
+    assert time.perf_counter() - start < 0.35
+    assert sorted(calls) == ["a", "x"]
+    assert str(output) == "c(b(A,X),A)"
+
+
+def test_query_plan_tool_cycle() -> None:
+    tool, calls = _get_tool()
+    query_plan = {
+        "nodes": [
+            {"id": 1, "query_str": "a", "dependencies": [2]},
+            {"id": 2, "query_str": "b", "dependencies": [3]},
+            {"id": 3, "query_str": "c", "dependencies": [2]},
+        ]
+    }
+    with pytest.raises(ValueError, match="cycles"):
+        tool(**query_plan)
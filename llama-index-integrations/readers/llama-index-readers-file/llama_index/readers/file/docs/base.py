@@ -4,37 +4,219 @@ Contains parsers for docx, pdf files.
 
 """
 
+import hashlib
+import multiprocessing
 import struct
 import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
 from fsspec import AbstractFileSystem
 import logging
 import io
 
 from llama_index.core.readers.base import BaseReader
+from llama_index.core.storage.kvstore.types import BaseKVStore
 from llama_index.core.readers.file.base import get_default_fs, is_default_fs
 from llama_index.core.schema import Document
 
 logger = logging.getLogger(__name__)
 
 
-class PDFReader(BaseReader):
-    """PDF parser."""
+# pages extracted by each worker, at least, in parallel mode
+MIN_PAGES_PER_WORKER = 8
+PDF_PAGE_CACHE_COLLECTION = "pdf_pages"
+
+
+def _get_object_hash(obj: Any, object_hashes: Dict[Tuple[int, int], bytes]) -> bytes:
+    """Hash a PDF object with the objects it references, e.g. page resources.
+
+    `object_hashes` caches the hashes of indirect objects (e.g. fonts shared
+    by pages) of one PDF.
+    """
+    from pypdf.generic import (
+        ArrayObject,
+        DictionaryObject,
+        IndirectObject,
+        StreamObject,
+    )
+
+    if isinstance(obj, IndirectObject):
+        key = (obj.idnum, obj.generation)
+        if key not in object_hashes:
+            # placeholder for reference cycles
+            object_hashes[key] = b""
+            object_hashes[key] = _get_object_hash(obj.get_object(), object_hashes)
+        return object_hashes[key]
+
+    digest = hashlib.sha256()
+    if isinstance(obj, DictionaryObject):
+        digest.update(b"dict")
+        for name in sorted(obj):
+            if name == "/Parent":
+                continue
+            digest.update(name.encode())
+            digest.update(_get_object_hash(obj.raw_get(name), object_hashes))
+        if isinstance(obj, StreamObject):
+            digest.update(b"stream")
+            digest.update(obj.get_data())
+    elif isinstance(obj, ArrayObject):
+        digest.update(b"array")
+        for item in obj:
+            digest.update(_get_object_hash(item, object_hashes))
+    else:
+        digest.update(repr(obj).encode())
+    return digest.digest()
+
+
+def _get_page_hash(page: Any, object_hashes: Dict[Tuple[int, int], bytes]) -> str:
+    """Hash the content stream of a PDF page and the resources it uses.
+
+    Resources (fonts with their encodings and ToUnicode maps, form XObjects,
+    ...) are hashed by content, as pages of different PDFs, or drawing
+    different form XObjects, can have the same content stream.
+    """
+    contents = page.get_contents()
+    digest = hashlib.sha256(contents.get_data() if contents is not None else b"")
+    if "/Resources" in page:
+        digest.update(_get_object_hash(page.raw_get("/Resources"), object_hashes))
+    return digest.hexdigest()
+
+
+def _extract_pages(source: Union[str, bytes], page_numbers: List[int]) -> List[str]:
+    """Extract the text of some pages of a PDF, given its path or content.
+
+    NOTE: module-level function so it can run in a process pool.
+    """
+    import pypdf
+
+    pdf = pypdf.PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+    return [pdf.pages[i].extract_text() for i in page_numbers]
+
 
-    def __init__(self, return_full_document: Optional[bool] = False) -> None:
+class PDFReader(BaseReader):
+    """PDF parser.
+
+    Args:
+        return_full_document (Optional[bool]): Whether to return the whole PDF
+            as a single Document, instead of one Document per page.
+        num_workers (Optional[int]): Number of processes to extract the text
+            of the pages of a PDF with in `load_data`, each taking a range of
+            pages. Pages are extracted in the calling process if None.
+        page_cache (Optional[BaseKVStore]): Store of page texts by hash of the
+            page content and resources. Pages whose content did not change
+            since a previous run are not parsed again.
+    """
+
+    def __init__(
+        self,
+        return_full_document: Optional[bool] = False,
+        num_workers: Optional[int] = None,
+        page_cache: Optional[BaseKVStore] = None,
+    ) -> None:
         """
         Initialize PDFReader.
         """
         self.return_full_document = return_full_document
+        self.num_workers = num_workers
+        self.page_cache = page_cache
+
+    def _get_cached_text(self, page_hash: str) -> Optional[str]:
+        if self.page_cache is None:
+            return None
+        cached = self.page_cache.get(page_hash, collection=PDF_PAGE_CACHE_COLLECTION)
+        return cached["text"] if cached is not None else None
+
+    def _cache_text(self, page_hash: str, text: str) -> None:
+        if self.page_cache is not None:
+            self.page_cache.put(
+                page_hash, {"text": text}, collection=PDF_PAGE_CACHE_COLLECTION
+            )
 
-    def load_data(
+    def _iter_page_texts(self, pdf: Any) -> Iterator[str]:
+        """Extract the text of each page, one page at a time."""
+        object_hashes: Dict[Tuple[int, int], bytes] = {}
+        for page in pdf.pages:
+            page_hash = (
+                _get_page_hash(page, object_hashes)
+                if self.page_cache is not None
+                else ""
+            )
+            text = self._get_cached_text(page_hash)
+            if text is None:
+                text = page.extract_text()
+                self._cache_text(page_hash, text)
+            yield text
+
+    def _get_page_texts(self, pdf: Any, source: Union[str, bytes]) -> List[str]:
+        """Extract the text of all pages, splitting them across processes."""
+        texts: List[Optional[str]] = []
+        page_hashes: List[str] = []
+        object_hashes: Dict[Tuple[int, int], bytes] = {}
+        for page in pdf.pages:
+            page_hash = (
+                _get_page_hash(page, object_hashes)
+                if self.page_cache is not None
+                else ""
+            )
+            page_hashes.append(page_hash)
+            texts.append(self._get_cached_text(page_hash))
+        missing = [i for i, text in enumerate(texts) if text is None]
+
+        num_workers = min(self.num_workers or 1, len(missing) // MIN_PAGES_PER_WORKER)
+        if num_workers <= 1:
+            for i in missing:
+                texts[i] = pdf.pages[i].extract_text()
+        else:
+            # contiguous page ranges, so each worker parses few shared objects
+            range_size = -(-len(missing) // num_workers)
+            ranges = [
+                missing[j : j + range_size] for j in range(0, len(missing), range_size)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                results = executor.map(_extract_pages, repeat(source), ranges)
+                for page_numbers, page_texts in zip(ranges, results):
+                    for i, text in zip(page_numbers, page_texts):
+                        texts[i] = text
+
+        for i in missing:
+            self._cache_text(page_hashes[i], cast(str, texts[i]))
+        return cast(List[str], texts)
+
+    def _get_documents(
+        self,
+        pdf: Any,
+        page_texts: Iterable[str],
+        file: Path,
+        extra_info: Optional[Dict],
+    ) -> Iterator[Document]:
+        # This block returns a whole PDF as a single Document
+        if self.return_full_document:
+            metadata = {"file_name": file.name}
+            yield Document(text="".join(page_texts), metadata=metadata)
+            return
+
+        # This block returns each page of a PDF as its own Document
+        for page, page_text in enumerate(page_texts):
+            page_label = pdf.page_labels[page]
+
+            metadata = {"page_label": page_label, "file_name": file.name}
+            if extra_info is not None:
+                metadata.update(extra_info)
+
+            yield Document(text=page_text, metadata=metadata)
+
+    def lazy_load_data(
         self,
         file: Path,
         extra_info: Optional[Dict] = None,
         fs: Optional[AbstractFileSystem] = None,
-    ) -> List[Document]:
-        """Parse file."""
+    ) -> Iterable[Document]:
+        """Parse file, one page at a time."""
         if not isinstance(file, Path):
             file = Path(file)
 
@@ -52,40 +234,42 @@ class PDFReader(BaseReader):
 
             # Create a PDF object
             pdf = pypdf.PdfReader(stream)
+            yield from self._get_documents(
+                pdf, self._iter_page_texts(pdf), file, extra_info
+            )
 
-            # Get the number of pages in the PDF document
-            num_pages = len(pdf.pages)
-
-            docs = []
-
-            # This block returns a whole PDF as a single Document
-            if self.return_full_document:
-                text = ""
-                metadata = {"file_name": file.name}
-
-                for page in range(num_pages):
-                    # Extract the text from the page
-                    page_text = pdf.pages[page].extract_text()
-                    text += page_text
+    def load_data(
+        self,
+        file: Path,
+        extra_info: Optional[Dict] = None,
+        fs: Optional[AbstractFileSystem] = None,
+    ) -> List[Document]:
+        """Parse file."""
+        if not self.num_workers or self.num_workers <= 1:
+            return list(self.lazy_load_data(file, extra_info=extra_info, fs=fs))
 
-                docs.append(Document(text=text, metadata=metadata))
+        if not isinstance(file, Path):
+            file = Path(file)
 
-            # This block returns each page of a PDF as its own Document
+        try:
+            import pypdf
+        except ImportError:
+            raise ImportError(
+                "pypdf is required to read PDF files: `pip install pypdf`"
+            )
+        fs = fs or get_default_fs()
+        with fs.open(file, "rb") as fp:
+            # workers open the file themselves if it is local, or get its content
+            if is_default_fs(fs):
+                source: Union[str, bytes] = str(file)
+                stream: Any = fp
             else:
-                # Iterate over every page
-
-                for page in range(num_pages):
-                    # Extract the text from the page
-                    page_text = pdf.pages[page].extract_text()
-                    page_label = pdf.page_labels[page]
-
-                    metadata = {"page_label": page_label, "file_name": file.name}
-                    if extra_info is not None:
-                        metadata.update(extra_info)
+                source = fp.read()
+                stream = io.BytesIO(source)
 
-                    docs.append(Document(text=page_text, metadata=metadata))
-
-            return docs
+            pdf = pypdf.PdfReader(stream)
+            page_texts = self._get_page_texts(pdf, source)
+            return list(self._get_documents(pdf, page_texts, file, extra_info))
 
 
 class DocxReader(BaseReader):
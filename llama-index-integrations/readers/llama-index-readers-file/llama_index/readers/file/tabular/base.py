@@ -5,13 +5,40 @@ Contains parsers for tabular data files.
 """
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from fsspec import AbstractFileSystem
 
 import pandas as pd
 from llama_index.core.readers.base import BaseReader
 from llama_index.core.schema import Document
 
+# number of rows read at a time by PandasCSVReader.lazy_load_data
+DEFAULT_CHUNKSIZE = 10000
+
+
+def _window_rows(
+    row_batches: Iterable[List[str]], rows_per_document: Optional[int]
+) -> Iterator[List[str]]:
+    """Regroup batches of row texts into windows of `rows_per_document` rows.
+
+    All rows go in a single window if `rows_per_document` is None.
+    """
+    window: List[str] = []
+    for rows in row_batches:
+        if rows_per_document is None:
+            window.extend(rows)
+            continue
+        start = 0
+        while start < len(rows):
+            end = start + rows_per_document - len(window)
+            window.extend(rows[start:end])
+            start = end
+            if len(window) == rows_per_document:
+                yield window
+                window = []
+    if window or rows_per_document is None:
+        yield window
+
 
 class CSVReader(BaseReader):
     """CSV parser.
@@ -20,41 +47,57 @@ class CSVReader(BaseReader):
         concat_rows (bool): whether to concatenate all rows into one document.
             If set to False, a Document will be created for each row.
             True by default.
+        rows_per_document (Optional[int]): Number of rows to put in each
+            Document, overriding `concat_rows` if set.
 
     """
 
-    def __init__(self, *args: Any, concat_rows: bool = True, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        concat_rows: bool = True,
+        rows_per_document: Optional[int] = None,
+        **kwargs: Any
+    ) -> None:
         """Init params."""
         super().__init__(*args, **kwargs)
+        if rows_per_document is not None and rows_per_document < 1:
+            raise ValueError("rows_per_document must be at least 1.")
         self._concat_rows = concat_rows
+        self._rows_per_document = rows_per_document
 
-    def load_data(
+    def lazy_load_data(
         self, file: Path, extra_info: Optional[Dict] = None
-    ) -> List[Document]:
-        """Parse file.
-
-        Returns:
-            Union[str, List[str]]: a string or a List of strings.
-
-        """
+    ) -> Iterable[Document]:
+        """Parse file, streaming its rows."""
         try:
             import csv
         except ImportError:
             raise ImportError("csv module is required to read CSV files.")
-        text_list = []
-        with open(file) as fp:
-            csv_reader = csv.reader(fp)
-            for row in csv_reader:
-                text_list.append(", ".join(row))
 
         metadata = {"filename": file.name, "extension": file.suffix}
         if extra_info:
             metadata = {**metadata, **extra_info}
 
-        if self._concat_rows:
-            return [Document(text="\n".join(text_list), metadata=metadata)]
-        else:
-            return [Document(text=text, metadata=metadata) for text in text_list]
+        rows_per_document = self._rows_per_document
+        if rows_per_document is None and not self._concat_rows:
+            rows_per_document = 1
+
+        with open(file) as fp:
+            row_batches = ([", ".join(row)] for row in csv.reader(fp))
+            for rows in _window_rows(row_batches, rows_per_document):
+                yield Document(text="\n".join(rows), metadata=metadata)
+
+    def load_data(
+        self, file: Path, extra_info: Optional[Dict] = None
+    ) -> List[Document]:
+        """Parse file.
+
+        Returns:
+            Union[str, List[str]]: a string or a List of strings.
+
+        """
+        return list(self.lazy_load_data(file, extra_info=extra_info))
 
 
 class PandasCSVReader(BaseReader):
@@ -72,7 +115,7 @@ class PandasCSVReader(BaseReader):
             Set to ", " by default.
 
         row_joiner (str): Separator to use for joining each row.
-            Only used when `concat_rows=True`.
+            Only used when several rows go in a Document.
             Set to "\n" by default.
 
         pandas_config (dict): Options for the `pandas.read_csv` function call.
@@ -81,6 +124,12 @@ class PandasCSVReader(BaseReader):
             Set to empty dict by default, this means pandas will try to figure
             out the separators, table head, etc. on its own.
 
+        rows_per_document (Optional[int]): Number of rows to put in each
+            Document, overriding `concat_rows` if set.
+
+        chunksize (int): Number of rows read at a time by `lazy_load_data`.
+            Set to 10000 by default.
+
     """
 
     def __init__(
@@ -90,39 +139,63 @@ class PandasCSVReader(BaseReader):
         col_joiner: str = ", ",
         row_joiner: str = "\n",
         pandas_config: dict = {},
+        rows_per_document: Optional[int] = None,
+        chunksize: int = DEFAULT_CHUNKSIZE,
         **kwargs: Any
     ) -> None:
         """Init params."""
         super().__init__(*args, **kwargs)
+        if rows_per_document is not None and rows_per_document < 1:
+            raise ValueError("rows_per_document must be at least 1.")
         self._concat_rows = concat_rows
         self._col_joiner = col_joiner
         self._row_joiner = row_joiner
         self._pandas_config = pandas_config
+        self._rows_per_document = rows_per_document
+        self._chunksize = chunksize
+
+    def _join_columns(self, df: pd.DataFrame) -> List[str]:
+        """Join the columns of each row, one column at a time."""
+        if len(df.columns) == 0:
+            return [""] * len(df)
+        # newer pandas keep missing values as such in string columns
+        columns = [df[col].astype(str).fillna("nan") for col in df.columns]
+        text = columns[0]
+        for column in columns[1:]:
+            text = text + self._col_joiner + column
+        return text.tolist()
+
+    def _lazy_load_data(self, f: Any, extra_info: Optional[Dict]) -> Iterator[Document]:
+        pandas_config = {"chunksize": self._chunksize, **self._pandas_config}
+        rows_per_document = self._rows_per_document
+        if rows_per_document is None and not self._concat_rows:
+            rows_per_document = 1
+
+        with pd.read_csv(f, **pandas_config) as chunks:
+            row_batches = (self._join_columns(chunk) for chunk in chunks)
+            for rows in _window_rows(row_batches, rows_per_document):
+                yield Document(
+                    text=(self._row_joiner).join(rows), metadata=extra_info or {}
+                )
 
-    def load_data(
+    def lazy_load_data(
         self,
         file: Path,
         extra_info: Optional[Dict] = None,
         fs: Optional[AbstractFileSystem] = None,
-    ) -> List[Document]:
-        """Parse file."""
+    ) -> Iterable[Document]:
+        """Parse file, reading `chunksize` rows at a time."""
         if fs:
             with fs.open(file) as f:
-                df = pd.read_csv(f, **self._pandas_config)
+                yield from self._lazy_load_data(f, extra_info)
         else:
-            df = pd.read_csv(file, **self._pandas_config)
-
-        text_list = df.apply(
-            lambda row: (self._col_joiner).join(row.astype(str).tolist()), axis=1
-        ).tolist()
+            yield from self._lazy_load_data(file, extra_info)
 
-        if self._concat_rows:
-            return [
-                Document(
-                    text=(self._row_joiner).join(text_list), metadata=extra_info or {}
-                )
-            ]
-        else:
-            return [
-                Document(text=text, metadata=extra_info or {}) for text in text_list
-            ]
+    def load_data(
+        self,
+        file: Path,
+        extra_info: Optional[Dict] = None,
+        fs: Optional[AbstractFileSystem] = None,
+    ) -> List[Document]:
+        """Parse file."""
+        return list(self.lazy_load_data(file, extra_info=extra_info, fs=fs))
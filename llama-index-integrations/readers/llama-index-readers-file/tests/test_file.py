@@ -1,11 +1,17 @@
 """Test file reader."""
 
+import asyncio
+import os
+import threading
 from multiprocessing import cpu_count
 from tempfile import TemporaryDirectory
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import pytest
+from llama_index.core.readers import FileManifest, FileSyncResult
+from llama_index.core.readers.base import BaseReader
 from llama_index.core.readers.file.base import SimpleDirectoryReader
+from llama_index.core.schema import Document
 
 try:
     from llama_index.readers.file import PDFReader
@@ -295,6 +301,21 @@ def test_excluded_files() -> None:
                     }
 
 
+@pytest.mark.skipif(PDFReader is None, reason="llama-index-readers-file not installed")
+def test_excluded_dirs() -> None:
+    """Tests if files in excluded dirs (and only those) are excluded."""
+    with TemporaryDirectory() as tmp_dir:
+        for sub_dir in ["sub", "sub/nested", "sub2"]:
+            os.makedirs(f"{tmp_dir}/{sub_dir}", exist_ok=True)
+            with open(f"{tmp_dir}/{sub_dir}/test.txt", "w") as f:
+                f.write(sub_dir)
+
+        reader = SimpleDirectoryReader(tmp_dir, recursive=True, exclude=["sub"])
+        assert [str(f.relative_to(tmp_dir)) for f in reader.input_files] == [
+            os.path.join("sub2", "test.txt")
+        ]
+
+
 @pytest.mark.skipif(PDFReader is None, reason="llama-index-readers-file not installed")
 def test_exclude_hidden() -> None:
     """Test if exclude_hidden flag excludes hidden files and files in hidden directories."""
@@ -472,3 +493,163 @@ def test_parallel_load() -> None:
         # check paths. Split handles path_part_X doc_ids from md and json files
         for doc in documents:
             assert str(doc.node_id).split("_part")[0] in doc_paths
+        # documents are in file order, whatever the order they were loaded in
+        assert [doc.text.strip() for doc in documents] == [
+            "test1",
+            "test2",
+            "test3",
+            "test4",
+            "test5",
+        ]
+
+
+class ThreadNameReader(BaseReader):
+    """Reader returning the name of the thread it ran in."""
+
+    def load_data(self, file: Any, extra_info: Optional[Dict] = None) -> List[Document]:
+        return [Document(text=threading.current_thread().name)]
+
+
+@pytest.mark.skipif(PDFReader is None, reason="llama-index-readers-file not installed")
+def test_async_load_offloads_blocking_readers() -> None:
+    """Test that aload_data runs sync readers off the event loop thread."""
+    with TemporaryDirectory() as tmp_dir:
+        with open(f"{tmp_dir}/test1.foo", "w") as f:
+            f.write("test1")
+        with open(f"{tmp_dir}/test2.txt", "w") as f:
+            f.write("test2")
+
+        reader = SimpleDirectoryReader(
+            tmp_dir, file_extractor={".foo": ThreadNameReader()}
+        )
+        documents = asyncio.run(reader.aload_data(num_workers=2))
+
+    assert len(documents) == 2
+    assert documents[0].text != threading.current_thread().name
+    assert documents[1].text == "test2"
+
+
+@pytest.mark.skipif(PDFReader is None, reason="llama-index-readers-file not installed")
+def test_load_changed_data() -> None:
+    """Test that only new and modified files are loaded."""
+    with TemporaryDirectory() as tmp_dir:
+        for name in ["test1", "test2", "test3"]:
+            with open(f"{tmp_dir}/{name}.txt", "w") as f:
+                f.write(name)
+        manifest_path = f"{tmp_dir}/manifest/manifest.json"
+        manifest = FileManifest.from_persist_path(manifest_path)
+
+        reader = SimpleDirectoryReader(tmp_dir, filename_as_id=True)
+        result = reader.load_changed_data(manifest, use_hash=True)
+        assert len(result.new_files) == 3
+        assert [doc.text for doc in result.documents] == ["test1", "test2", "test3"]
+        manifest.persist(manifest_path)
+
+        # modify one file, touch another without changing it, delete the last
+        with open(f"{tmp_dir}/test1.txt", "w") as f:
+            f.write("test1 modified")
+        mtime = os.stat(f"{tmp_dir}/test2.txt").st_mtime
+        os.utime(f"{tmp_dir}/test2.txt", (mtime + 10, mtime + 10))
+        os.remove(f"{tmp_dir}/test3.txt")
+
+        manifest = FileManifest.from_persist_path(manifest_path)
+        reader = SimpleDirectoryReader(
+            tmp_dir, filename_as_id=True, exclude=["manifest"]
+        )
+        result = reader.load_changed_data(manifest, use_hash=True)
+        assert result.new_files == []
+        assert result.modified_files == [f"{tmp_dir}/test1.txt"]
+        assert [doc.text for doc in result.documents] == ["test1 modified"]
+        assert result.deleted_files == [f"{tmp_dir}/test3.txt"]
+        assert result.deleted_doc_ids == [f"{tmp_dir}/test3.txt"]
+        assert sorted(manifest.files) == [
+            f"{tmp_dir}/test1.txt",
+            f"{tmp_dir}/test2.txt",
+        ]
+
+        # nothing changed since
+        result = reader.load_changed_data(manifest)
+        assert result.documents == []
+        assert result.deleted_files == []
+
+
+class LockingReader(BaseReader):
+    """Reader holding a lock, which can't be pickled."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def load_data(self, file: Any, extra_info: Optional[Dict] = None) -> List[Document]:
+        with self._lock:
+            return [Document(text="locked")]
+
+
+@pytest.mark.skipif(PDFReader is None, reason="llama-index-readers-file not installed")
+def test_async_load_in_processes_with_unpicklable_reader() -> None:
+    """Test that readers of other suffixes are not sent to processes."""
+    from llama_index.readers.file import FlatReader
+
+    with TemporaryDirectory() as tmp_dir:
+        with open(f"{tmp_dir}/test1.foo", "w") as f:
+            f.write("test1")
+        with open(f"{tmp_dir}/test2.bar", "w") as f:
+            f.write("test2")
+
+        reader = SimpleDirectoryReader(
+            tmp_dir, file_extractor={".foo": LockingReader(), ".bar": FlatReader()}
+        )
+        reader.cpu_bound_suffixes = {".bar"}
+        assert reader._get_process_suffixes(reader.input_files) == {".bar"}
+        documents = asyncio.run(reader.aload_data(num_workers=2))
+
+    assert sorted(doc.text for doc in documents) == ["locked", "test2"]
+
+
+class FailingReader(BaseReader):
+    """Reader failing on files containing "bad"."""
+
+    def load_data(self, file: Any, extra_info: Optional[Dict] = None) -> List[Document]:
+        with open(file) as f:
+            text = f.read()
+        if "bad" in text:
+            raise ValueError("bad file")
+        return [Document(text=text)]
+
+
+@pytest.mark.skipif(PDFReader is None, reason="llama-index-readers-file not installed")
+def test_load_changed_data_with_failed_files() -> None:
+    """Test that files failing to load are kept as they were in the manifest."""
+    with TemporaryDirectory() as tmp_dir:
+        for name in ["test1", "test2"]:
+            with open(f"{tmp_dir}/{name}.foo", "w") as f:
+                f.write(f"{name} bad" if name == "test2" else name)
+        manifest = FileManifest()
+
+        def load_changed_data() -> FileSyncResult:
+            reader = SimpleDirectoryReader(
+                tmp_dir, filename_as_id=True, file_extractor={".foo": FailingReader()}
+            )
+            return reader.load_changed_data(manifest)
+
+        # a new file failing to load is not added to the manifest
+        result = load_changed_data()
+        assert result.new_files == [f"{tmp_dir}/test1.foo"]
+        assert result.failed_files == [f"{tmp_dir}/test2.foo"]
+        assert sorted(manifest.files) == [f"{tmp_dir}/test1.foo"]
+        old_state = manifest.files[f"{tmp_dir}/test1.foo"]
+
+        # a modified file failing to load keeps its state and documents
+        with open(f"{tmp_dir}/test1.foo", "w") as f:
+            f.write("test1 bad")
+        result = load_changed_data()
+        assert result.failed_files == [f"{tmp_dir}/test1.foo", f"{tmp_dir}/test2.foo"]
+        assert result.modified_files == []
+        assert result.deleted_doc_ids == []
+        assert manifest.files[f"{tmp_dir}/test1.foo"] == old_state
+
+        # failed files are loaded again once fixed
+        with open(f"{tmp_dir}/test1.foo", "w") as f:
+            f.write("test1 fixed")
+        result = load_changed_data()
+        assert result.modified_files == [f"{tmp_dir}/test1.foo"]
+        assert [doc.text for doc in result.documents] == ["test1 fixed"]
@@ -0,0 +1,167 @@
+import pytest
+from fsspec.implementations.memory import MemoryFileSystem
+
+from llama_index.core.storage.kvstore import SimpleKVStore
+from llama_index.readers.file import PDFReader
+
+pypdf = pytest.importorskip("pypdf")
+
+NUM_PAGES = 20
+
+
+def _write_pdf(path, texts):
+    from pypdf.generic import (
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+    )
+
+    writer = pypdf.PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    font_ref = writer._add_object(font)
+    for text in texts:
+        page = writer.add_blank_page(width=200, height=200)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font_ref})}
+        )
+        contents = DecodedStreamObject()
+        contents.set_data(f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(contents)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+@pytest.fixture()
+def pdf_file(tmp_path):
+    file = tmp_path / "test.pdf"
+    _write_pdf(file, [f"page {i}" for i in range(NUM_PAGES)])
+    return file
+
+
+def test_load_data(pdf_file):
+    documents = PDFReader().load_data(pdf_file, extra_info={"source": "test"})
+    assert [doc.text for doc in documents] == [f"page {i}" for i in range(NUM_PAGES)]
+    assert documents[1].metadata == {
+        "page_label": "2",
+        "file_name": "test.pdf",
+        "source": "test",
+    }
+
+    documents = PDFReader(return_full_document=True).load_data(pdf_file)
+    assert len(documents) == 1
+    assert documents[0].text == "".join(f"page {i}" for i in range(NUM_PAGES))
+
+
+def test_lazy_load_data(pdf_file):
+    documents = PDFReader().lazy_load_data(pdf_file)
+    assert next(iter(documents)).text == "page 0"
+
+
+def test_parallel_load_data(pdf_file):
+    expected = PDFReader().load_data(pdf_file)
+
+    documents = PDFReader(num_workers=2).load_data(pdf_file)
+    assert [doc.text for doc in documents] == [doc.text for doc in expected]
+    assert [doc.metadata for doc in documents] == [doc.metadata for doc in expected]
+
+    fs = MemoryFileSystem()
+    fs.pipe("/test.pdf", pdf_file.read_bytes())
+    documents = PDFReader(num_workers=2).load_data("/test.pdf", fs=fs)
+    assert [doc.text for doc in documents] == [doc.text for doc in expected]
+
+
+def test_page_cache(pdf_file, monkeypatch):
+    page_cache = SimpleKVStore()
+    reader = PDFReader(page_cache=page_cache)
+    expected = [doc.text for doc in reader.load_data(pdf_file)]
+
+    # only the changed page is parsed again
+    _write_pdf(pdf_file, ["changed"] + [f"page {i}" for i in range(1, NUM_PAGES)])
+    extracted = []
+    extract_text = pypdf.PageObject.extract_text
+
+    def _extract_text(self, *args, **kwargs):
+        extracted.append(self.page_number)
+        return extract_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(pypdf.PageObject, "extract_text", _extract_text)
+    for documents in (
+        reader.load_data(pdf_file),
+        PDFReader(page_cache=page_cache, num_workers=2).load_data(pdf_file),
+    ):
+        assert [doc.text for doc in documents] == ["changed", *expected[1:]]
+    assert extracted == [0]
+
+
+def _write_form_pdf(path, texts):
+    """Write a PDF whose pages draw form XObjects with the same content stream."""
+    from pypdf.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+        NumberObject,
+    )
+
+    writer = pypdf.PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    font_ref = writer._add_object(font)
+    for text in texts:
+        form = DecodedStreamObject()
+        form.set_data(f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET".encode())
+        form.update(
+            {
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Form"),
+                NameObject("/BBox"): ArrayObject(
+                    [NumberObject(n) for n in (0, 0, 200, 200)]
+                ),
+                NameObject("/Resources"): DictionaryObject(
+                    {
+                        NameObject("/Font"): DictionaryObject(
+                            {NameObject("/F1"): font_ref}
+                        )
+                    }
+                ),
+            }
+        )
+        page = writer.add_blank_page(width=200, height=200)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {
+                NameObject("/XObject"): DictionaryObject(
+                    {NameObject("/Fm0"): writer._add_object(form)}
+                )
+            }
+        )
+        contents = DecodedStreamObject()
+        contents.set_data(b"q /Fm0 Do Q")
+        page[NameObject("/Contents")] = writer._add_object(contents)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_page_cache_hashes_resources(tmp_path):
+    page_cache = SimpleKVStore()
+    reader = PDFReader(page_cache=page_cache)
+
+    # pages with the same content stream drawing different forms
+    _write_form_pdf(tmp_path / "forms.pdf", ["form a", "form b"])
+    documents = reader.load_data(tmp_path / "forms.pdf")
+    assert [doc.text.strip() for doc in documents] == ["form a", "form b"]
+
+    # and in another PDF, sharing the cache
+    _write_form_pdf(tmp_path / "other.pdf", ["form c"])
+    documents = reader.load_data(tmp_path / "other.pdf")
+    assert [doc.text.strip() for doc in documents] == ["form c"]
@@ -0,0 +1,66 @@
+import pytest
+from fsspec.implementations.local import LocalFileSystem
+
+from llama_index.readers.file.tabular import CSVReader, PandasCSVReader
+
+SAMPLE_CSV = """name,count,price
+apple,1,1.5
+banana,2,0.5
+cherry,3,
+date,4,2.0
+eggplant,5,1.0
+"""
+
+
+@pytest.fixture()
+def csv_file(tmp_path):
+    file = tmp_path / "test.csv"
+    with open(file, "w") as f:
+        f.write(SAMPLE_CSV)
+    return file
+
+
+def test_csv_reader(csv_file):
+    documents = CSVReader().load_data(csv_file)
+    assert len(documents) == 1
+    assert documents[0].text.splitlines()[1] == "apple, 1, 1.5"
+    assert documents[0].metadata == {"filename": "test.csv", "extension": ".csv"}
+
+    documents = CSVReader(concat_rows=False).load_data(csv_file)
+    assert [doc.text for doc in documents][:2] == [
+        "name, count, price",
+        "apple, 1, 1.5",
+    ]
+
+
+def test_csv_reader_rows_per_document(csv_file):
+    documents = list(CSVReader(rows_per_document=4).lazy_load_data(csv_file))
+    assert [len(doc.text.splitlines()) for doc in documents] == [4, 2]
+
+
+def test_pandas_csv_reader(csv_file):
+    documents = PandasCSVReader().load_data(csv_file, extra_info={"a": 1})
+    assert documents[0].text == (
+        "apple, 1, 1.5\n"
+        "banana, 2, 0.5\n"
+        "cherry, 3, nan\n"
+        "date, 4, 2.0\n"
+        "eggplant, 5, 1.0"
+    )
+    assert documents[0].metadata == {"a": 1}
+
+    documents = PandasCSVReader(concat_rows=False).load_data(
+        csv_file, fs=LocalFileSystem()
+    )
+    assert len(documents) == 5
+    assert documents[2].text == "cherry, 3, nan"
+
+
+def test_pandas_csv_reader_streams_chunks(csv_file):
+    """Test that row windows span the chunks read by pandas."""
+    reader = PandasCSVReader(rows_per_document=3, chunksize=2, row_joiner=" | ")
+    documents = list(reader.lazy_load_data(csv_file))
+    assert [doc.text for doc in documents] == [
+        "apple, 1, 1.5 | banana, 2, 0.5 | cherry, 3, nan",
+        "date, 4, 2.0 | eggplant, 5, 1.0",
+    ]
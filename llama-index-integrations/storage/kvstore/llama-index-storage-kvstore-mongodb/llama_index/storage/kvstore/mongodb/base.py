@@ -209,6 +209,25 @@ class MongoDBKVStore(BaseKVStore):
             return result
         return None
 
+    def get_many(
+        self, keys: List[str], collection: str = DEFAULT_COLLECTION
+    ) -> List[Optional[dict]]:
+        """Get values for several keys from the store in one query.
+
+        Args:
+            keys (List[str]): keys
+            collection (str): collection name
+
+        """
+        if not keys:
+            return []
+        results = self._db[collection].find({"_id": {"$in": keys}})
+        found = {}
+        for result in results:
+            key = result.pop("_id")
+            found[key] = result
+        return [found.get(key) for key in keys]
+
     async def aget(
         self, key: str, collection: str = DEFAULT_COLLECTION
     ) -> Optional[dict]:
@@ -227,6 +246,27 @@ class MongoDBKVStore(BaseKVStore):
             return result
         return None
 
+    async def aget_many(
+        self, keys: List[str], collection: str = DEFAULT_COLLECTION
+    ) -> List[Optional[dict]]:
+        """Get values for several keys from the store in one query.
+
+        Args:
+            keys (List[str]): keys
+            collection (str): collection name
+
+        """
+        self._check_async_client()
+
+        if not keys:
+            return []
+        results = self._adb[collection].find({"_id": {"$in": keys}})
+        found = {}
+        for result in await results.to_list(length=None):
+            key = result.pop("_id")
+            found[key] = result
+        return [found.get(key) for key in keys]
+
     def get_all(self, collection: str = DEFAULT_COLLECTION) -> Dict[str, dict]:
         """Get all values from the store.
 
@@ -110,6 +110,23 @@ class RedisKVStore(BaseKVStore):
             return None
         return json.loads(val_str)
 
+    def get_many(
+        self, keys: List[str], collection: str = DEFAULT_COLLECTION
+    ) -> List[Optional[dict]]:
+        """Get values for several keys from the store in one round trip.
+
+        Args:
+            keys (List[str]): keys
+            collection (str): collection name
+
+        """
+        if not keys:
+            return []
+        val_strs = self._redis_client.hmget(collection, keys)
+        return [
+            json.loads(val_str) if val_str is not None else None for val_str in val_strs
+        ]
+
     async def aget(
         self, key: str, collection: str = DEFAULT_COLLECTION
     ) -> Optional[dict]: